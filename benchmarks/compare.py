@@ -0,0 +1,61 @@
+"""Compares two benchmark json files written by
+
+    python -m pytest benchmarks --bench-json <file>
+
+e.g. of two releases:
+
+    python benchmarks/compare.py before.json after.json --threshold 1.2
+
+Exits with status 1 if any benchmark got slower (or used more peak memory)
+by more than the threshold factor.
+"""
+
+import sys
+import json
+import argparse
+
+
+def load_benchmarks(filename):
+    with open(filename) as f:
+        return {result["name"]: result for result in json.load(f)["benchmarks"]}
+
+
+def compare(
+    before: dict, after: dict, threshold: float = 1.2, min_seconds: float = 0.01
+):
+    """returns a list of (name, time_ratio, memory_ratio, regressed) tuples for
+    all benchmarks in both before and after. Slowdowns of less than min_seconds
+    do not count as a regression, as these are mostly timing noise."""
+    rows = []
+    for name in sorted(set(before) & set(after)):
+        time_ratio = after[name]["min"] / max(before[name]["min"], 1e-9)
+        memory_ratio = after[name]["peak_memory"] / max(before[name]["peak_memory"], 1)
+        slower = after[name]["min"] - before[name]["min"] > min_seconds
+        regressed = (time_ratio > threshold and slower) or memory_ratio > threshold
+        rows.append((name, time_ratio, memory_ratio, regressed))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("before")
+    parser.add_argument("after")
+    parser.add_argument("--threshold", type=float, default=1.2)
+    parser.add_argument("--min-seconds", type=float, default=0.01)
+    args = parser.parse_args(argv)
+
+    before, after = load_benchmarks(args.before), load_benchmarks(args.after)
+    rows = compare(before, after, args.threshold, args.min_seconds)
+    print(f"{'benchmark':<70} {'time':>8} {'memory':>8}")
+    for name, time_ratio, memory_ratio, regressed in rows:
+        print(
+            f"{name:<70} {time_ratio:>7.2f}x {memory_ratio:>7.2f}x"
+            + ("  <== regression" if regressed else "")
+        )
+    for name in sorted(set(before) ^ set(after)):
+        print(f"{name:<70} only in {args.before if name in before else args.after}")
+    return 1 if any(regressed for *_, regressed in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
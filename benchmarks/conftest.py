@@ -0,0 +1,265 @@
+"""Benchmark suite for explainers and dashboard components.
+
+Run with e.g.:
+
+    python -m pytest benchmarks --bench-sizes 10000x10,100000x50 --bench-json bench.json
+
+Every benchmark gets parametrized over the --bench-tasks, --bench-models and
+--bench-sizes, and records the wall time of each round and the peak memory
+(as traced by tracemalloc) of the benchmarked operation. Compare two
+--bench-json files with benchmarks/compare.py.
+"""
+
+import os
+import gc
+import sys
+import json
+import time
+import platform
+import tracemalloc
+from functools import lru_cache
+
+import pytest
+
+import numpy as np
+import pandas as pd
+
+from sklearn.datasets import make_classification, make_regression
+from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+from sklearn.linear_model import LinearRegression, LogisticRegression
+
+import explainerdashboard
+from explainerdashboard import ClassifierExplainer, RegressionExplainer
+
+TASKS = ["regression", "binary", "multiclass"]
+MODELS = ["rf", "gbm", "linear"]
+
+# models get fitted on at most this many rows, the explainers get the full dataset:
+MAX_TRAIN_ROWS = 20_000
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("explainerdashboard benchmarks")
+    group.addoption(
+        "--bench-sizes",
+        default="10000x10",
+        help="comma separated dataset sizes as <rows>x<features>, "
+        "e.g. 10000x10,100000x50,1000000x500",
+    )
+    group.addoption(
+        "--bench-tasks", default=",".join(TASKS), help="comma separated tasks"
+    )
+    group.addoption(
+        "--bench-models", default=",".join(MODELS), help="comma separated models"
+    )
+    group.addoption(
+        "--bench-rounds", type=int, default=1, help="timed rounds per benchmark"
+    )
+    group.addoption(
+        "--bench-json", default=None, help="write the results to this json file"
+    )
+
+
+def parse_size(size: str):
+    n_rows, n_features = size.lower().split("x")
+    return int(float(n_rows)), int(n_features)
+
+
+def pytest_generate_tests(metafunc):
+    options = metafunc.config.option
+    for fixture, values in [
+        ("task", options.bench_tasks),
+        ("model_type", options.bench_models),
+        ("size", options.bench_sizes),
+    ]:
+        if fixture in metafunc.fixturenames:
+            metafunc.parametrize(fixture, values.split(","), scope="session")
+
+
+@lru_cache(maxsize=1)
+def make_dataset(task: str, size: str):
+    """returns a synthetic X, y for task ('regression', 'binary' or 'multiclass')
+    of size '<rows>x<features>'. Only the last dataset gets kept in memory."""
+    n_rows, n_features = parse_size(size)
+    n_informative = max(2, n_features // 2)
+    if task == "regression":
+        X, y = make_regression(
+            n_rows, n_features, n_informative=n_informative, noise=1.0, random_state=0
+        )
+    elif task in ["binary", "multiclass"]:
+        n_classes = 2 if task == "binary" else 3
+        X, y = make_classification(
+            n_rows,
+            n_features,
+            n_informative=n_informative,
+            n_redundant=0,
+            n_classes=n_classes,
+            # make_classification needs n_classes * n_clusters_per_class
+            # <= 2**n_informative, so use a single cluster for few features:
+            n_clusters_per_class=2 if 2 * n_classes <= 2**n_informative else 1,
+            random_state=0,
+        )
+    else:
+        raise ValueError(f"Unknown task {task}, should be one of {TASKS}")
+    X = pd.DataFrame(
+        X.astype(np.float32), columns=[f"feature_{i}" for i in range(n_features)]
+    )
+    return X, pd.Series(y, name="target")
+
+
+def make_model(task: str, model_type: str):
+    if model_type == "rf":
+        kwargs = dict(n_estimators=50, max_depth=8, n_jobs=-1, random_state=0)
+        if task == "regression":
+            return RandomForestRegressor(**kwargs)
+        return RandomForestClassifier(**kwargs)
+    if model_type == "gbm":
+        lightgbm = pytest.importorskip("lightgbm")
+        kwargs = dict(n_estimators=100, num_leaves=31, verbose=-1, random_state=0)
+        if task == "regression":
+            return lightgbm.LGBMRegressor(**kwargs)
+        return lightgbm.LGBMClassifier(**kwargs)
+    if model_type == "linear":
+        if task == "regression":
+            return LinearRegression()
+        return LogisticRegression(max_iter=200)
+    raise ValueError(f"Unknown model_type {model_type}, should be one of {MODELS}")
+
+
+@lru_cache(maxsize=1)
+def fit_model(task: str, model_type: str, size: str):
+    X, y = make_dataset(task, size)
+    return make_model(task, model_type).fit(
+        X.iloc[:MAX_TRAIN_ROWS], y.iloc[:MAX_TRAIN_ROWS]
+    )
+
+
+@pytest.fixture
+def dataset(task, size):
+    return make_dataset(task, size)
+
+
+@pytest.fixture
+def model(task, model_type, size):
+    return fit_model(task, model_type, size)
+
+
+@pytest.fixture
+def make_explainer(task, model_type, dataset, model):
+    """returns a function that constructs a fresh explainer (so that no
+    properties have been calculated yet), and calculates the properties
+    passed as strings (e.g. 'preds', 'get_shap_values_df')"""
+
+    def make(*precalculate):
+        X, y = dataset
+        kwargs = dict(shap="linear") if model_type == "linear" else {}
+        if task == "regression":
+            explainer = RegressionExplainer(model, X, y, **kwargs)
+        else:
+            explainer = ClassifierExplainer(model, X, y, **kwargs)
+        for prop in precalculate:
+            attr = getattr(explainer, prop)
+            _ = attr() if callable(attr) else attr
+        return explainer
+
+    return make
+
+
+class Benchmark:
+    """Times a function over a number of rounds, and measures its peak
+    memory with tracemalloc in one additional (untimed) round."""
+
+    def __init__(self, rounds: int = 1):
+        self.rounds = rounds
+        self.record = None
+
+    def __call__(self, func, *args, setup=None, **kwargs):
+        """Runs func(*args, **kwargs). If a setup function is passed it gets
+        called before every round, and should return the args for func. Setup
+        is not included in the timings. Returns the result of the last round."""
+        times = []
+        for _ in range(self.rounds + 1):
+            if setup is not None:
+                args = setup()
+                args = args if isinstance(args, tuple) else (args,)
+            gc.collect()
+            if len(times) < self.rounds:
+                start = time.perf_counter()
+                result = func(*args, **kwargs)
+                times.append(time.perf_counter() - start)
+            else:
+                tracemalloc.start()
+                try:
+                    result = func(*args, **kwargs)
+                    peak_memory = tracemalloc.get_traced_memory()[1]
+                finally:
+                    tracemalloc.stop()
+        self.record = dict(
+            rounds=self.rounds,
+            times=times,
+            min=min(times),
+            mean=sum(times) / len(times),
+            peak_memory=peak_memory,
+        )
+        return result
+
+
+@pytest.fixture
+def benchmark(request):
+    bench = Benchmark(rounds=request.config.option.bench_rounds)
+    yield bench
+    if bench.record is not None:
+        params = getattr(request.node, "callspec", None)
+        params = dict(params.params) if params is not None else {}
+        if "size" in params:
+            params["n_rows"], params["n_features"] = parse_size(params["size"])
+        request.config._bench_results.append(
+            dict(
+                name=request.node.name,
+                operation=request.node.originalname.replace("test_", "", 1),
+                **params,
+                **bench.record,
+            )
+        )
+
+
+def pytest_configure(config):
+    config._bench_results = []
+
+
+def pytest_sessionfinish(session):
+    config = session.config
+    if config.option.bench_json is not None and config._bench_results:
+        import sklearn
+
+        report = dict(
+            machine=dict(
+                python=sys.version.split()[0],
+                platform=platform.platform(),
+                processor=platform.processor(),
+                cpu_count=os.cpu_count(),
+            ),
+            versions=dict(
+                explainerdashboard=explainerdashboard.___version__,
+                numpy=np.__version__,
+                pandas=pd.__version__,
+                sklearn=sklearn.__version__,
+            ),
+            benchmarks=config._bench_results,
+        )
+        with open(config.option.bench_json, "w") as f:
+            json.dump(report, f, indent=2, default=str)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if not config._bench_results:
+        return
+    terminalreporter.section("explainerdashboard benchmarks")
+    terminalreporter.write_line(
+        f"{'benchmark':<70} {'min (s)':>10} {'mean (s)':>10} {'peak (MB)':>10}"
+    )
+    for result in config._bench_results:
+        terminalreporter.write_line(
+            f"{result['name']:<70} {result['min']:>10.3f} {result['mean']:>10.3f} "
+            f"{result['peak_memory'] / 1e6:>10.1f}"
+        )
@@ -0,0 +1,91 @@
+import pytest
+
+import dash
+
+from explainerdashboard import custom
+
+COMPONENTS = [
+    "ImportancesComponent",
+    "PdpComponent",
+    "ShapSummaryComponent",
+    "ShapDependenceComponent",
+    "ShapContributionsGraphComponent",
+    "ShapContributionsTableComponent",
+]
+REGRESSION_COMPONENTS = ["PredictedVsActualComponent", "ResidualsComponent"]
+CLASSIFIER_COMPONENTS = ["ConfusionMatrixComponent", "RocAucComponent"]
+
+
+def layout_values(layout):
+    """returns a dict with (id, property) keys and the initial values
+    of all components with an id in layout"""
+    values = {}
+
+    def walk(component):
+        if isinstance(getattr(component, "id", None), str):
+            for prop in component._prop_names:
+                values[(component.id, prop)] = getattr(component, prop, None)
+        children = getattr(component, "children", None)
+        for child in children if isinstance(children, (list, tuple)) else [children]:
+            if hasattr(child, "to_plotly_json"):
+                walk(child)
+
+    walk(layout)
+    return values
+
+
+def callback_requests(app, layout):
+    """returns the json bodies of /_dash-update-component requests that trigger
+    each (server side) callback of app with the initial values of layout"""
+    values = layout_values(layout)
+    requests = []
+    for callback in app._callback_list:
+        deps = callback["inputs"] + callback["state"]
+        if callback.get("clientside_function") or not all(
+            (dep["id"], dep["property"]) in values for dep in deps
+        ):
+            continue
+        outputs = [
+            dict(zip(["id", "property"], output.rsplit(".", 1)))
+            for output in callback["output"].strip(".").split("...")
+        ]
+        inputs, state = [
+            [dict(dep, value=values[(dep["id"], dep["property"])]) for dep in deps]
+            for deps in [callback["inputs"], callback["state"]]
+        ]
+        requests.append(
+            dict(
+                output=callback["output"],
+                outputs=outputs if callback["output"].startswith("..") else outputs[0],
+                inputs=inputs,
+                state=state,
+                changedPropIds=[f"{inputs[0]['id']}.{inputs[0]['property']}"],
+            )
+        )
+    return requests
+
+
+@pytest.mark.parametrize(
+    "component_name", COMPONENTS + REGRESSION_COMPONENTS + CLASSIFIER_COMPONENTS
+)
+def test_component_callbacks(benchmark, task, make_explainer, component_name):
+    if (task == "regression" and component_name in CLASSIFIER_COMPONENTS) or (
+        task != "regression" and component_name in REGRESSION_COMPONENTS
+    ):
+        pytest.skip(f"{component_name} does not apply to {task}")
+    component = getattr(custom, component_name)(make_explainer())
+    component.calculate_dependencies()
+
+    app = dash.Dash(__name__)
+    app.layout = component.layout()
+    component.register_callbacks(app)
+    client = app.server.test_client()
+    requests = callback_requests(app, app.layout)
+    assert requests, f"No callbacks found for {component_name}"
+
+    def run_callbacks():
+        for request in requests:
+            response = client.post("/_dash-update-component", json=request)
+            assert response.status_code in [200, 204], response.data[:500]
+
+    benchmark(run_callbacks)
@@ -0,0 +1,51 @@
+from explainerdashboard import ClassifierExplainer, RegressionExplainer
+
+
+def test_explainer(benchmark, task, dataset, model):
+    X, y = dataset
+    explainer_class = (
+        RegressionExplainer if task == "regression" else ClassifierExplainer
+    )
+    benchmark(explainer_class, model, X, y)
+
+
+def test_calculate_properties(benchmark, make_explainer):
+    benchmark(
+        lambda explainer: explainer.calculate_properties(include_interactions=False),
+        setup=make_explainer,
+    )
+
+
+def test_preds(benchmark, make_explainer):
+    benchmark(lambda explainer: explainer.preds, setup=make_explainer)
+
+
+def test_metrics(benchmark, make_explainer):
+    benchmark(
+        lambda explainer: explainer.metrics(), setup=lambda: make_explainer("preds")
+    )
+
+
+def test_shap_values(benchmark, make_explainer):
+    benchmark(lambda explainer: explainer.get_shap_values_df(), setup=make_explainer)
+
+
+def test_permutation_importances(benchmark, make_explainer):
+    benchmark(
+        lambda explainer: explainer.get_permutation_importances_df(),
+        setup=lambda: make_explainer("preds"),
+    )
+
+
+def test_pdp(benchmark, make_explainer):
+    benchmark(
+        lambda explainer: explainer.pdp_df(explainer.columns[0], sample=500),
+        setup=lambda: make_explainer("preds"),
+    )
+
+
+def test_contributions(benchmark, make_explainer):
+    benchmark(
+        lambda explainer: explainer.get_contrib_df(explainer.idxs[0]),
+        setup=make_explainer,
+    )
@@ -1,4 +1,39 @@
 ___version__ = "0.4.8"
 
-from .explainers import ClassifierExplainer, RegressionExplainer  # noqa
-from .dashboards import ExplainerDashboard, ExplainerHub, InlineExplainer  # noqa
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .explainers import ClassifierExplainer, RegressionExplainer  # noqa
+    from .dashboards import ExplainerDashboard, ExplainerHub, InlineExplainer  # noqa
+
+# The explainers and dashboards (and with them shap, dash, flask, etc) only
+# get imported when first accessed, so that e.g. scripts that only load a
+# dataset or build an explainer do not pay for importing the dashboard stack.
+_lazy_imports = {
+    "ClassifierExplainer": ".explainers",
+    "RegressionExplainer": ".explainers",
+    "ExplainerDashboard": ".dashboards",
+    "ExplainerHub": ".dashboards",
+    "InlineExplainer": ".dashboards",
+}
+
+__all__ = list(_lazy_imports)
+
+
+def __getattr__(name):
+    if name in _lazy_imports:
+        try:
+            module = import_module(_lazy_imports[name], __name__)
+        except AttributeError as e:
+            # an AttributeError raised while importing would otherwise get
+            # reported as 'cannot import name' without the underlying error
+            raise ImportError(f"Falha ao importar {name}: {e}") from e
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_lazy_imports))
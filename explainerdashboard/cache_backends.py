@@ -0,0 +1,432 @@
+__all__ = [
+    "CacheBackend",
+    "FileSystemCache",
+    "SQLiteCache",
+    "CacheNamespace",
+    "get_cache_backend",
+]
+
+import os
+import time
+import pickle
+import sqlite3
+import struct
+import hashlib
+import tempfile
+import threading
+from pathlib import Path
+
+
+class CacheBackend:
+    """Interface of a cache that can be shared between processes, e.g. the
+    gunicorn workers that serve the same dashboard, so that a result computed
+    by one worker can be reused by all the others.
+
+    Keys are str and values are bytes (callers are responsible for
+    serialization, see CacheNamespace). Implement get, set, delete, clear
+    and _info to plug in another store (e.g. redis or memcached). Backends
+    should evict entries themselves when they grow too large.
+
+    Hits, misses and evictions are counted per process.
+    """
+
+    url = None
+
+    def __init__(self):
+        self.hits, self.misses, self.evictions = 0, 0, 0
+
+    def get(self, key: str, default=None):
+        """returns the bytes stored under key, or default if not found or expired"""
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, ttl: float = None):
+        """stores value under key. Entries expire after ttl seconds (defaults
+        to the ttl of the backend)."""
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        """removes key from the cache"""
+        raise NotImplementedError
+
+    def clear(self, prefix: str = ""):
+        """removes all keys starting with prefix from the cache"""
+        raise NotImplementedError
+
+    def _info(self) -> dict:
+        """returns dict with the number of entries (size) and total bytes"""
+        raise NotImplementedError
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def _count(self, hit: bool):
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def namespace(self, prefix: str, ttl: float = None, serialize: bool = False):
+        """returns a CacheNamespace view of this backend in which all keys
+        are prefixed with prefix"""
+        return CacheNamespace(self, prefix, ttl=ttl, serialize=serialize)
+
+    def stats(self) -> dict:
+        """returns dict with size, bytes, hits, misses, evictions and hit_rate"""
+        lookups = self.hits + self.misses
+        return dict(
+            self._info(),
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            hit_rate=self.hits / lookups if lookups > 0 else None,
+        )
+
+
+class FileSystemCache(CacheBackend):
+    """Stores every entry in its own file inside directory.
+
+    Files are written to a temporary file first and then moved into place
+    with os.replace, so that other processes never read a partially written
+    entry. Reading an entry updates the modification time of its file, and
+    when the total size of the directory exceeds max_bytes the least recently
+    used files are removed until it is back at 90% of max_bytes.
+
+    Args:
+        directory (str, Path): directory to store the entries in. Gets created
+            if it does not exist.
+        max_bytes (int): maximum total size of the stored entries.
+            Defaults to 1GB.
+        ttl (float): seconds after which entries expire. Defaults to None
+            (never expire).
+    """
+
+    _header = struct.Struct("<dI")
+
+    def __init__(self, directory, max_bytes: int = 1_000_000_000, ttl: float = None):
+        super().__init__()
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.url = "file://" + str(self.directory)
+        self._written = 0
+        self._evict()
+
+    def _path(self, key):
+        return self.directory / (hashlib.sha1(key.encode()).hexdigest() + ".cache")
+
+    def _read(self, path):
+        """returns (expires, key, value) stored in path"""
+        with open(path, "rb") as f:
+            data = f.read()
+        expires, key_len = self._header.unpack_from(data)
+        start = self._header.size
+        return (
+            expires,
+            data[start : start + key_len].decode(),
+            data[start + key_len :],
+        )
+
+    def get(self, key: str, default=None):
+        path = self._path(key)
+        try:
+            expires, _, value = self._read(path)
+        except (FileNotFoundError, struct.error):
+            self._count(False)
+            return default
+        if expires and time.time() > expires:
+            self.delete(key)
+            self._count(False)
+            return default
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        self._count(True)
+        return value
+
+    def set(self, key: str, value: bytes, ttl: float = None):
+        ttl = ttl if ttl is not None else self.ttl
+        expires = time.time() + ttl if ttl else 0.0
+        encoded_key = key.encode()
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(self._header.pack(expires, len(encoded_key)))
+                f.write(encoded_key)
+                f.write(value)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._written += len(value)
+        if self._written > self.max_bytes // 10:
+            self._evict()
+
+    def delete(self, key: str):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def clear(self, prefix: str = ""):
+        for path in self.directory.glob("*.cache"):
+            try:
+                if prefix and not self._read(path)[1].startswith(prefix):
+                    continue
+                os.remove(path)
+            except (FileNotFoundError, struct.error):
+                pass
+
+    def _entries(self):
+        entries = []
+        for path in self.directory.glob("*.cache"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _evict(self):
+        """removes the least recently used entries when the directory
+        holds more than max_bytes"""
+        self._written = 0
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total <= 0.9 * self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                self.evictions += 1
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def _info(self) -> dict:
+        entries = self._entries()
+        return dict(
+            size=len(entries),
+            bytes=sum(size for _, size, _ in entries),
+            max_bytes=self.max_bytes,
+        )
+
+
+class SQLiteCache(CacheBackend):
+    """Stores the entries in a single sqlite database file.
+
+    The database is opened in WAL mode so that readers in other processes
+    do not block writers. Every thread (and every process after a fork,
+    e.g. gunicorn --preload) opens its own connection. When the total size
+    of the stored values exceeds max_bytes the least recently accessed
+    entries are removed until it is back at 90% of max_bytes.
+
+    Args:
+        path (str, Path): path of the sqlite database file.
+        max_bytes (int): maximum total size of the stored values.
+            Defaults to 1GB.
+        ttl (float): seconds after which entries expire. Defaults to None
+            (never expire).
+        timeout (float): seconds to wait for a lock held by another
+            process. Defaults to 30.
+    """
+
+    def __init__(
+        self,
+        path,
+        max_bytes: int = 1_000_000_000,
+        ttl: float = None,
+        timeout: float = 30,
+    ):
+        super().__init__()
+        self.path = str(path)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.timeout = timeout
+        self.url = "sqlite:///" + self.path
+        self._local = threading.local()
+        self._written = 0
+        self._evict()
+
+    def __getstate__(self):
+        # connections cannot be pickled, so they get reopened after loading
+        return dict(
+            path=self.path, max_bytes=self.max_bytes, ttl=self.ttl, timeout=self.timeout
+        )
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(
+                self.path, timeout=self.timeout, isolation_level=None
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, "
+                "value BLOB, size INTEGER, expires REAL, accessed REAL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed)"
+            )
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def get(self, key: str, default=None):
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT value, expires FROM cache WHERE key = ?", (key,)
+        ).fetchone()
+        now = time.time()
+        if row is None or (row[1] and now > row[1]):
+            if row is not None:
+                self.delete(key)
+            self._count(False)
+            return default
+        conn.execute("UPDATE cache SET accessed = ? WHERE key = ?", (now, key))
+        self._count(True)
+        return row[0]
+
+    def set(self, key: str, value: bytes, ttl: float = None):
+        ttl = ttl if ttl is not None else self.ttl
+        now = time.time()
+        self._connection().execute(
+            "INSERT OR REPLACE INTO cache (key, value, size, expires, accessed) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (key, sqlite3.Binary(value), len(value), now + ttl if ttl else 0.0, now),
+        )
+        self._written += len(value)
+        if self._written > self.max_bytes // 10:
+            self._evict()
+
+    def delete(self, key: str):
+        self._connection().execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def clear(self, prefix: str = ""):
+        self._connection().execute(
+            "DELETE FROM cache WHERE substr(key, 1, ?) = ?", (len(prefix), prefix)
+        )
+
+    def _evict(self):
+        """removes expired entries and the least recently accessed entries
+        when the stored values take up more than max_bytes"""
+        self._written = 0
+        conn = self._connection()
+        conn.execute(
+            "DELETE FROM cache WHERE expires > 0 AND expires < ?", (time.time(),)
+        )
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evict = []
+        for key, size in conn.execute("SELECT key, size FROM cache ORDER BY accessed"):
+            if total <= 0.9 * self.max_bytes:
+                break
+            evict.append((key,))
+            total -= size
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany("DELETE FROM cache WHERE key = ?", evict)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        self.evictions += len(evict)
+
+    def _info(self) -> dict:
+        size, total = (
+            self._connection()
+            .execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache")
+            .fetchone()
+        )
+        return dict(size=size, bytes=total, max_bytes=self.max_bytes)
+
+
+class CacheNamespace:
+    """View of a CacheBackend in which all keys are prefixed with prefix,
+    with the same get/set/clear/stats interface as LRUCache, so that it can
+    be used wherever an LRUCache is expected.
+
+    Args:
+        backend (CacheBackend): the shared backend.
+        prefix (str): prefix of all keys in this namespace.
+        ttl (float): seconds after which entries expire. Defaults to None
+            (the ttl of the backend).
+        serialize (bool): pickle values on set and unpickle them on get.
+            When False values should be bytes. Defaults to False.
+    """
+
+    def __init__(
+        self, backend: CacheBackend, prefix: str, ttl: float = None, serialize=False
+    ):
+        self.backend = backend
+        self.prefix = prefix
+        self.ttl = ttl
+        self.serialize = serialize
+        self.hits, self.misses = 0, 0
+
+    def __contains__(self, key):
+        return self.backend.get(self.prefix + key) is not None
+
+    def get(self, key, default=None, count=True):
+        value = self.backend.get(self.prefix + key)
+        if count:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if value is None:
+            return default
+        return pickle.loads(value) if self.serialize else value
+
+    def set(self, key, value):
+        if self.serialize:
+            value = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        self.backend.set(self.prefix + key, value, ttl=self.ttl)
+
+    def clear(self):
+        """removes all entries of this namespace from the backend and
+        resets the statistics"""
+        self.backend.clear(self.prefix)
+        self.hits, self.misses = 0, 0
+
+    def stats(self) -> dict:
+        """returns dict with hits, misses and hit_rate of this namespace
+        (in this process), and the url of the backend"""
+        lookups = self.hits + self.misses
+        return dict(
+            backend=self.backend.url,
+            hits=self.hits,
+            misses=self.misses,
+            hit_rate=self.hits / lookups if lookups > 0 else None,
+        )
+
+
+def get_cache_backend(backend) -> CacheBackend:
+    """returns a CacheBackend for backend, which can be a CacheBackend
+    instance, a url ('sqlite:///path/to/cache.db' or 'file:///path/to/dir')
+    or a path (a file ending with .db/.sqlite becomes a SQLiteCache,
+    anything else a FileSystemCache directory)."""
+    if isinstance(backend, CacheBackend):
+        return backend
+    if isinstance(backend, (str, Path)):
+        backend = str(backend)
+        if backend.startswith("sqlite:///"):
+            return SQLiteCache(backend[len("sqlite:///") :])
+        if backend.startswith("file://"):
+            return FileSystemCache(backend[len("file://") :])
+        if Path(backend).suffix in (".db", ".sqlite", ".sqlite3"):
+            return SQLiteCache(backend)
+        return FileSystemCache(backend)
+    raise ValueError(
+        "backend deve ser uma instância de CacheBackend, um url "
+        "('sqlite:///...' ou 'file://...') ou um caminho, "
+        f"mas é {backend}!"
+    )
@@ -2,19 +2,27 @@
 Command-line tool for starting an explainerdashboard from a particular directory
 """
 import os
+import time
+import json
+import shutil
+import hashlib
 import webbrowser
 from pathlib import Path
 from importlib import import_module
 from copy import deepcopy
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import pickle
 import oyaml as yaml
 
+import numpy as np
 import pandas as pd
+from pandas.api.types import union_categoricals
 import joblib
 import click
 
 import waitress
 
+import explainerdashboard
 from explainerdashboard import *
 from explainerdashboard.explainers import BaseExplainer
 from explainerdashboard.dashboards import ExplainerDashboard
@@ -40,6 +48,160 @@ hub_ascii = """
 """
 
 
+def load_model(modelfile):
+    """Loads a pickled model. Models dumped with joblib get their numpy arrays
+    memory-mapped instead of read into memory."""
+    if str(modelfile).endswith(".joblib"):
+        return joblib.load(modelfile, mmap_mode="r")
+    with open(modelfile, "rb") as f:
+        return pickle.load(f)
+
+
+def model_columns(model):
+    """Returns the list of input columns that model was fitted on, or None
+    if the model does not store them."""
+    for attr in ["feature_names_in_", "feature_name_", "feature_names_"]:
+        if getattr(model, attr, None) is not None:
+            return list(getattr(model, attr))
+    if hasattr(model, "get_booster"):
+        return model.get_booster().feature_names
+    return None
+
+
+def data_file_columns(datafile):
+    """Returns the column names in the header of datafile, or None if they
+    cannot be read without loading the data."""
+    if str(datafile).endswith(".csv"):
+        return list(pd.read_csv(datafile, nrows=0).columns)
+    if str(datafile).endswith(".parquet"):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            return None
+        return pq.read_schema(datafile).names
+    return None
+
+
+def compact_dtypes(df, exclude=None, max_category_ratio=0.5):
+    """Reduces the memory footprint of df in place: integer columns get downcast to
+    the smallest integer type, float columns to float32 when no precision gets
+    lost, and string columns with at most max_category_ratio unique values per
+    row get converted to categoricals. Columns in exclude are left as they are."""
+    exclude = exclude or []
+    for col in df.columns:
+        if col in exclude or pd.api.types.is_bool_dtype(df[col]):
+            continue
+        if pd.api.types.is_integer_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], downcast="integer")
+        elif pd.api.types.is_float_dtype(df[col]) and df[col].dtype != "float32":
+            downcast = df[col].astype("float32")
+            if ((downcast == df[col]) | df[col].isnull()).all():
+                df[col] = downcast
+        elif pd.api.types.is_object_dtype(df[col]) or pd.api.types.is_string_dtype(
+            df[col]
+        ):
+            if df[col].nunique() <= max_category_ratio * len(df):
+                df[col] = df[col].astype("category")
+    return df
+
+
+def _concat_chunks(chunks):
+    """concatenates dataframe chunks, keeping columns that are categorical in
+    every chunk categorical (pd.concat turns them into objects when the
+    categories differ between chunks)"""
+    if len(chunks) == 1:
+        return chunks[0]
+    for col in chunks[0].columns:
+        if all(isinstance(chunk[col].dtype, pd.CategoricalDtype) for chunk in chunks):
+            categories = union_categoricals(
+                [chunk[col] for chunk in chunks], ignore_order=True
+            ).categories
+            for chunk in chunks:
+                chunk[col] = chunk[col].cat.set_categories(categories)
+    return pd.concat(chunks, ignore_index=True)
+
+
+def _iter_data_chunks(datafile, columns=None, chunksize=100_000):
+    if str(datafile).endswith(".csv"):
+        yield from pd.read_csv(datafile, usecols=columns, chunksize=chunksize)
+    elif str(datafile).endswith(".parquet"):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            # without pyarrow the parquet file cannot be streamed
+            yield pd.read_parquet(datafile, columns=columns)
+            return
+        for batch in pq.ParquetFile(datafile).iter_batches(
+            batch_size=chunksize, columns=columns
+        ):
+            yield batch.to_pandas()
+    else:
+        raise ValueError("datafile should either be a .csv or .parquet!")
+
+
+def load_data(
+    datafile,
+    columns=None,
+    nrows=None,
+    sample=None,
+    compact=False,
+    exclude=None,
+    chunksize=100_000,
+):
+    """Loads a .csv or .parquet datafile in chunks of chunksize rows (parquet row
+    groups get streamed with pyarrow), so that only the compacted data has to fit
+    into memory.
+
+    Args:
+        datafile (str, Path): .csv or .parquet file
+        columns (list, optional): only read these columns. Defaults to None (all).
+        nrows (int, optional): only read the first nrows rows. Defaults to None.
+        sample (int, float, optional): randomly sample this number of rows (int),
+            or this fraction of rows (float), with a fixed seed. Defaults to None.
+        compact (bool, optional): reduce the memory footprint with
+            compact_dtypes(). Defaults to False.
+        exclude (list, optional): columns not to compact, e.g. the target.
+        chunksize (int, optional): number of rows per chunk. Defaults to 100_000.
+
+    Returns:
+        pd.DataFrame
+    """
+    rng = np.random.RandomState(0)
+    chunks, n_rows, raw_bytes = [], 0, 0
+    for chunk in _iter_data_chunks(datafile, columns, chunksize):
+        if nrows is not None:
+            chunk = chunk.iloc[: nrows - n_rows]
+        n_rows += len(chunk)
+        if isinstance(sample, float):
+            chunk = chunk.sample(frac=sample, random_state=rng).sort_index()
+        if compact:
+            raw_bytes += chunk.memory_usage(deep=True).sum()
+            chunk = compact_dtypes(chunk, exclude)
+        chunks.append(chunk)
+        if nrows is not None and n_rows >= nrows:
+            break
+    if not chunks:
+        raise ValueError(f"No data found in datafile {datafile}!")
+    df = _concat_chunks(chunks)
+    del chunks
+    if isinstance(sample, int) and sample < len(df):
+        df = df.sample(n=sample, random_state=rng).sort_index().reset_index(drop=True)
+    if compact:
+        # columns that were categorical in only some of the chunks:
+        df = compact_dtypes(df, exclude)
+        print(
+            f"explainerdashboard ===> Loaded {len(df)} rows x {len(df.columns)} columns: "
+            f"{df.memory_usage(deep=True).sum() / 1e6:.1f}MB in memory "
+            f"({raw_bytes / 1e6:.1f}MB before compacting dtypes)"
+        )
+    else:
+        print(
+            f"explainerdashboard ===> Loaded {len(df)} rows x {len(df.columns)} columns: "
+            f"{df.memory_usage(deep=True).sum() / 1e6:.1f}MB in memory"
+        )
+    return df
+
+
 def build_explainer(explainer_config):
     if isinstance(explainer_config, (Path, str)) and str(explainer_config).endswith(
         ".yaml"
@@ -47,26 +209,48 @@ def build_explainer(explainer_config):
         config = yaml.safe_load(open(str(explainer_config), "r"))
     elif isinstance(explainer_config, dict):
         config = explainer_config
+    else:
+        raise ValueError(
+            "explainer_config should either be a .yaml filepath or a dict!"
+        )
     assert (
         "explainer" in config
     ), "Please pass a proper explainer.yaml config file that starts with `explainer:`!"
-    config = explainer_config["explainer"]
+    config = config["explainer"]
 
     print(f"explainerdashboard ===> Loading model from {config['modelfile']}")
-    model = pickle.load(open(config["modelfile"], "rb"))
+    model = load_model(config["modelfile"])
+
+    target_col, index_col = config["data_target"], config.get("data_index")
+    # only read the columns that the model was fitted on (plus target and index):
+    model_cols = config.get("data_columns") or model_columns(model)
+    columns = None
+    if model_cols is not None:
+        file_cols = data_file_columns(config["datafile"])
+        if file_cols is not None and set(model_cols).issubset(file_cols):
+            columns = [
+                col
+                for col in dict.fromkeys([*model_cols, target_col, index_col])
+                if col is not None
+            ]
+        else:
+            # e.g. the generated names (Column_0, Column_1, ...) of a model
+            # that was fitted on a numpy array: read all columns instead
+            model_cols = None
 
     print(f"explainerdashboard ===> Loading data from {config['datafile']}")
-    if str(config["datafile"]).endswith(".csv"):
-        df = pd.read_csv(config["datafile"])
-    elif str(config["datafile"]).endswith(".parquet"):
-        df = pd.read_parquet(config["datafile"])
-    else:
-        raise ValueError("datafile should either be a .csv or .parquet!")
+    df = load_data(
+        config["datafile"],
+        columns=columns,
+        nrows=config.get("data_nrows"),
+        sample=config.get("data_sample"),
+        compact=config.get("data_compact", False),
+        exclude=[target_col, index_col],
+    )
 
     print(
         f"explainerdashboard ===> Using column {config['data_target']} to generate X, y "
     )
-    target_col = config["data_target"]
     X = df.drop(target_col, axis=1)
     y = df[target_col]
 
@@ -80,25 +264,43 @@ def build_explainer(explainer_config):
             "Please set it to the proper index column name, or set it to null"
         )
         X = X.set_index(config["data_index"])
+    if model_cols is not None:
+        X = X[list(model_cols)]
 
     params = config["params"]
 
-    if config["explainer_type"] == "classifier":
+    # explainer.to_yaml() writes the explainer_type in portuguese
+    if config["explainer_type"] in ["classifier", "classificador"]:
         print(f"explainerdashboard ===> Generating ClassifierExplainer...")
         explainer = ClassifierExplainer(model, X, y, **params)
-    elif config["explainer_type"] == "regression":
+    elif config["explainer_type"] in ["regression", "regressão"]:
         print(f"explainerdashboard ===> Generating RegressionExplainer...")
-        explainer = ClassifierExplainer(model, X, y, **params)
+        explainer = RegressionExplainer(model, X, y, **params)
+    else:
+        raise ValueError("explainer_type should either be classifier or regression!")
     return explainer
 
 
-def build_and_dump_explainer(explainer_config, dashboard_config=None):
+def build_and_dump_explainer(explainer_config, dashboard_config=None, timings=None):
+    """Builds the explainer of explainer_config, calculates the properties needed
+    by dashboard_config (a dashboard config dict or a list of them), or else by
+    the dashboard_yaml of the explainer config, or else all properties, and dumps
+    the explainer to its explainerfile. If a timings dict is passed, the duration
+    of each step gets stored in it."""
+    timings = timings if timings is not None else {}
+    start = time.perf_counter()
     explainer = build_explainer(explainer_config)
+    timings["explainer"] = time.perf_counter() - start
 
+    start = time.perf_counter()
     click.echo(
         f"explainerdashboard ===> Calculating properties by building Dashboard..."
     )
-    if dashboard_config is not None:
+    if isinstance(dashboard_config, list):
+        for config in dashboard_config:
+            ExplainerDashboard.from_config(explainer, config)
+        dashboard_config = dashboard_config[0] if dashboard_config else None
+    elif dashboard_config is not None:
         ExplainerDashboard.from_config(explainer, dashboard_config)
     elif Path(explainer_config["explainer"]["dashboard_yaml"]).exists():
         click.echo(
@@ -111,7 +313,9 @@ def build_and_dump_explainer(explainer_config, dashboard_config=None):
     else:
         click.echo(f"explainerdashboard ===> Calculating all properties")
         explainer.calculate_properties()
+    timings["properties"] = time.perf_counter() - start
 
+    start = time.perf_counter()
     click.echo(
         f"explainerdashboard ===> Saving explainer to {explainer_config['explainer']['explainerfile']}..."
     )
@@ -124,9 +328,250 @@ def build_and_dump_explainer(explainer_config, dashboard_config=None):
             f"explainerdashboard ===> Warning explainerfile in explainer config and dashboard config do not match!"
         )
     explainer.dump(explainer_config["explainer"]["explainerfile"])
+    timings["dump"] = time.perf_counter() - start
     return
 
 
+def file_fingerprint(filepath) -> str:
+    """sha256 hash of the content of filepath"""
+    sha256 = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(2**20), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def build_fingerprint(explainer_config, dashboard_configs=None) -> str:
+    """Fingerprint of everything that goes into the explainerfile of explainer_config:
+    the content of the model file and datafile, the explainer settings and the
+    configs of the dashboards that its properties get calculated for."""
+    config = explainer_config["explainer"]
+    fingerprint = dict(
+        version=explainerdashboard.___version__,
+        modelfile=file_fingerprint(config["modelfile"]),
+        datafile=file_fingerprint(config["datafile"]),
+        explainer={
+            k: v
+            for k, v in config.items()
+            if k not in ["explainerfile", "dashboard_yaml"]
+        },
+        dashboards=dashboard_configs,
+    )
+    return hashlib.sha256(
+        json.dumps(fingerprint, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+def _fingerprint_file(explainerfile) -> Path:
+    return Path(str(explainerfile) + ".fingerprint")
+
+
+def is_up_to_date(explainer_config, fingerprint) -> bool:
+    """True if the explainerfile of explainer_config exists and was built from
+    inputs with the same fingerprint"""
+    explainerfile = explainer_config["explainer"]["explainerfile"]
+    fingerprint_file = _fingerprint_file(explainerfile)
+    if not Path(explainerfile).exists() or not fingerprint_file.exists():
+        return False
+    try:
+        return json.loads(fingerprint_file.read_text())["fingerprint"] == fingerprint
+    except (ValueError, KeyError):
+        return False
+
+
+def store_fingerprint(explainer_config, fingerprint, timings=None):
+    """stores the fingerprint (and step timings) of a finished build next to the
+    explainerfile"""
+    _fingerprint_file(explainer_config["explainer"]["explainerfile"]).write_text(
+        json.dumps(dict(fingerprint=fingerprint, timings=timings or {}), indent=2)
+    )
+
+
+def _build_target(explainer_config, dashboard_configs, fingerprint):
+    """builds a single explainer (in a worker process) and returns the step timings"""
+    timings = {}
+    build_and_dump_explainer(explainer_config, dashboard_configs or None, timings)
+    store_fingerprint(explainer_config, fingerprint, timings)
+    return timings
+
+
+def _load_yaml(filepath) -> dict:
+    return yaml.safe_load(open(str(filepath), "r"))
+
+
+def _dashboard_explainerfile(dashboard_config):
+    explainerfile = dashboard_config["dashboard"].get("explainerfile")
+    return str(Path(explainerfile).resolve()) if explainerfile else None
+
+
+def collect_build_targets(filepaths) -> list:
+    """Returns a list of (explainer_config, dashboard_configs) build targets for
+    a list of explainer.yaml, dashboard.yaml and/or hub.yaml files.
+
+    Dashboard configs (given directly or listed in a hub.yaml) get matched to
+    the explainer config with the same explainerfile. Explainer configs of
+    dashboards in a hub.yaml are searched for among the .yaml files in the
+    directories of the hub and its dashboards. When a single explainer.yaml and
+    a single dashboard.yaml are given, they always get combined. Explainers without
+    a matching dashboard use their dashboard_yaml if it exists."""
+    explainer_configs, dashboard_configs, search_dirs = [], [], set()
+    for filepath in filepaths:
+        config = _load_yaml(filepath)
+        if "explainer" in config:
+            explainer_configs.append(config)
+        elif "dashboard" in config:
+            dashboard_configs.append(config)
+        elif "explainerhub" in config:
+            search_dirs.add(Path(filepath).resolve().parent)
+            for db in config["explainerhub"]["dashboards"]:
+                if isinstance(db, dict):
+                    dashboard_configs.append(db)
+                else:
+                    db_path = Path(db)
+                    if not db_path.is_absolute():
+                        db_path = Path(filepath).parent / db_path
+                    search_dirs.add(db_path.resolve().parent)
+                    dashboard_configs.append(_load_yaml(db_path))
+        else:
+            raise ValueError(
+                f"{filepath} is neither an explainer.yaml, dashboard.yaml nor hub.yaml!"
+            )
+
+    if len(explainer_configs) == 1 and len(dashboard_configs) == 1 and not search_dirs:
+        return [(explainer_configs[0], dashboard_configs)]
+
+    needed = {_dashboard_explainerfile(db) for db in dashboard_configs}
+    known = {
+        str(Path(config["explainer"]["explainerfile"]).resolve())
+        for config in explainer_configs
+    }
+    for search_dir in sorted(search_dirs):
+        for yaml_file in sorted(search_dir.glob("*.yaml")):
+            try:
+                config = _load_yaml(yaml_file)
+            except yaml.YAMLError:
+                continue
+            if isinstance(config, dict) and "explainer" in config:
+                explainerfile = str(
+                    Path(config["explainer"]["explainerfile"]).resolve()
+                )
+                if explainerfile in needed and explainerfile not in known:
+                    explainer_configs.append(config)
+                    known.add(explainerfile)
+
+    targets = []
+    for config in explainer_configs:
+        explainerfile = str(Path(config["explainer"]["explainerfile"]).resolve())
+        dbs = [
+            db
+            for db in dashboard_configs
+            if _dashboard_explainerfile(db) == explainerfile
+        ]
+        if not dbs and config["explainer"].get("dashboard_yaml") is not None:
+            if Path(config["explainer"]["dashboard_yaml"]).exists():
+                dbs = [_load_yaml(config["explainer"]["dashboard_yaml"])]
+        targets.append((config, dbs))
+
+    for db in dashboard_configs:
+        if _dashboard_explainerfile(db) not in known:
+            click.echo(
+                "explainerdashboard ===> Warning: could not find an explainer.yaml "
+                f"for {db['dashboard'].get('explainerfile')}, skipping it!"
+            )
+    return targets
+
+
+def build_explainers(targets, n_jobs: int = 1, force: bool = False) -> list:
+    """Builds the explainers of targets (as returned by collect_build_targets),
+    using n_jobs worker processes. Explainers whose model file, datafile, explainer
+    settings and dashboard configs did not change since the last build get skipped
+    (unless force=True), and targets with the same fingerprint only get built once.
+    Returns a list of dicts with the explainerfile, status and timings per target."""
+    results, to_build = [], {}
+    for explainer_config, dashboard_configs in targets:
+        result = dict(
+            explainerfile=explainer_config["explainer"]["explainerfile"],
+            status=None,
+            timings={},
+            error=None,
+        )
+        results.append(result)
+        start = time.perf_counter()
+        fingerprint = build_fingerprint(explainer_config, dashboard_configs)
+        result["timings"]["fingerprint"] = time.perf_counter() - start
+        if not force and is_up_to_date(explainer_config, fingerprint):
+            result["status"] = "skipped"
+        else:
+            to_build.setdefault(fingerprint, []).append(
+                (explainer_config, dashboard_configs, result)
+            )
+
+    def finish(group, fingerprint, timings=None, error=None):
+        (explainer_config, _, result), *duplicates = group
+        if error is not None:
+            for _, _, res in group:
+                res.update(status="failed", error=f"{type(error).__name__}: {error}")
+            return
+        result.update(status="built")
+        result["timings"].update(timings)
+        explainerfile = explainer_config["explainer"]["explainerfile"]
+        for dup_config, _, dup_result in duplicates:
+            dup_file = dup_config["explainer"]["explainerfile"]
+            if Path(dup_file).resolve() != Path(explainerfile).resolve():
+                shutil.copyfile(explainerfile, dup_file)
+            store_fingerprint(dup_config, fingerprint, timings)
+            dup_result.update(status=f"reused {result['explainerfile']}")
+
+    if n_jobs is not None and n_jobs < 0:
+        n_jobs = os.cpu_count()
+    if n_jobs is None or n_jobs <= 1 or len(to_build) <= 1:
+        for fingerprint, group in to_build.items():
+            explainer_config, dashboard_configs, _ = group[0]
+            try:
+                timings = _build_target(
+                    explainer_config, dashboard_configs, fingerprint
+                )
+            except Exception as e:
+                finish(group, fingerprint, error=e)
+            else:
+                finish(group, fingerprint, timings)
+        return results
+
+    with ProcessPoolExecutor(max_workers=min(n_jobs, len(to_build))) as executor:
+        futures = {
+            executor.submit(_build_target, group[0][0], group[0][1], fingerprint): (
+                fingerprint,
+                group,
+            )
+            for fingerprint, group in to_build.items()
+        }
+        for future in as_completed(futures):
+            fingerprint, group = futures[future]
+            try:
+                timings = future.result()
+            except Exception as e:
+                finish(group, fingerprint, error=e)
+            else:
+                finish(group, fingerprint, timings)
+    return results
+
+
+def print_build_summary(results, seconds: float):
+    """prints per explainerfile whether it was built, skipped or reused, and
+    how long each step took"""
+    click.echo(f"explainerdashboard ===> Build summary ({seconds:.1f}s):")
+    for result in results:
+        timings = ", ".join(
+            f"{step} {seconds:.1f}s" for step, seconds in result["timings"].items()
+        )
+        if result["status"] == "failed":
+            click.echo(f"    {result['explainerfile']}: failed ({result['error']})")
+        elif result["status"] == "skipped":
+            click.echo(f"    {result['explainerfile']}: unchanged, skipped ({timings})")
+        else:
+            click.echo(f"    {result['explainerfile']}: {result['status']} ({timings})")
+
+
 def launch_dashboard_from_pkl(explainer_filepath, no_browser, port, no_dashboard=False):
     explainer = BaseExplainer.from_file(explainer_filepath)
 
@@ -288,6 +733,8 @@ def explainerdashboard_cli(ctx):
     Example use:
         explainerdashboard build explainer.yaml
         explainerdashboard build explainer.yaml dashboard.yaml
+        explainerdashboard build hub.yaml --jobs 4
+        explainerdashboard build explainer1.yaml explainer2.yaml --force
         explainerdashboard build --help
 
     If given a second dashboard.yaml argument, will use that dashboard
@@ -298,8 +745,17 @@ def explainerdashboard_cli(ctx):
 
     explainer.yaml file can be generated with explainer.to_yaml("explainer.yaml")
 
-    If no argument given, searches for explainer.yaml, so if you keep that
-    naming convention you can simply start the build with:
+    If given a hub.yaml, builds the explainers of all dashboards in the hub,
+    looking for their explainer.yaml files in the directories of the hub
+    and dashboards. With --jobs N builds N explainers in parallel.
+
+    Explainers whose model file, datafile, explainer.yaml parameters and
+    dashboard configuration did not change since the last build get
+    skipped (the fingerprint of the inputs is stored next to the explainerfile
+    with suffix .fingerprint). Pass --force to rebuild them anyway.
+
+    If no argument given, searches for explainer.yaml or hub.yaml, so if you
+    keep that naming convention you can simply start the build with:
 
     \b
         explainerdashboard build
@@ -354,45 +810,58 @@ def run(ctx, explainer_filepath, no_browser, port):
 
 @explainerdashboard_cli.command(help="build and save explainer object")
 @click.pass_context
-@click.argument("explainer_filepath", nargs=1, required=False)
-@click.argument("dashboard_filepath", nargs=1, required=False)
-def build(ctx, explainer_filepath, dashboard_filepath):
+@click.argument("filepaths", nargs=-1, required=False)
+@click.option(
+    "--jobs",
+    "-j",
+    "n_jobs",
+    default=1,
+    type=int,
+    help="number of explainers to build in parallel (-1 for all cpus).",
+)
+@click.option(
+    "--force",
+    "-f",
+    "force",
+    is_flag=True,
+    help="rebuild explainers even when their inputs did not change.",
+)
+def build(ctx, filepaths, n_jobs, force):
     click.echo(explainer_ascii)
-    if explainer_filepath is None:
+    if not filepaths:
         if (Path().cwd() / "explainer.yaml").exists():
-            explainer_filepath = Path().cwd() / "explainer.yaml"
+            filepaths = [Path().cwd() / "explainer.yaml"]
+        elif (Path().cwd() / "hub.yaml").exists():
+            filepaths = [Path().cwd() / "hub.yaml"]
         else:
             click.echo(
                 "No argument given to explainerdashboard build and "
-                "could not find an explainer.yaml. Aborting."
+                "could not find an explainer.yaml or hub.yaml. Aborting."
             )
             return
 
-    if str(explainer_filepath).endswith(".yaml"):
-        explainer_config = yaml.safe_load(open(str(explainer_filepath), "r"))
-
+    filepaths = [
+        filepath
+        for filepath in filepaths
+        if str(filepath).endswith(".yaml") and Path(filepath).exists()
+    ]
+    start = time.perf_counter()
+    targets = collect_build_targets(filepaths)
+    for explainer_config, dashboard_configs in targets:
         click.echo(
             f"explainerdashboard ===> Building {explainer_config['explainer']['explainerfile']}"
-        )
-
-        if (
-            dashboard_filepath is not None
-            and str(dashboard_filepath).endswith(".yaml")
-            and Path(dashboard_filepath).exists()
-        ):
-            click.echo(
-                f"explainerdashboard ===> Using {dashboard_filepath} to calculate explainer properties"
+            + (
+                f" for {len(dashboard_configs)} dashboard(s)"
+                if dashboard_configs
+                else ""
             )
-            dashboard_config = yaml.safe_load(open(str(dashboard_filepath), "r"))
-        else:
-            dashboard_config = None
-
-        print(
-            f"explainerdashboard ===> Building {explainer_config['explainer']['explainerfile']}"
         )
-        build_and_dump_explainer(explainer_config, dashboard_config)
-        print(f"explainerdashboard ===> Build finished!")
-        return
+    results = build_explainers(targets, n_jobs=n_jobs, force=force)
+    print_build_summary(results, time.perf_counter() - start)
+    if any(result["status"] == "failed" for result in results):
+        raise click.ClickException("Some explainers failed to build!")
+    print(f"explainerdashboard ===> Build finished!")
+    return
 
 
 @explainerdashboard_cli.command(help="run without launching dashboard")
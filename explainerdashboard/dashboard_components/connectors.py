@@ -230,6 +230,8 @@ class CutoffPercentileComponent(ExplainerComponent):
 
 
 class PosLabelConnector(ExplainerComponent):
+    _memoize_callbacks = False
+
     def __init__(self, input_pos_label, output_pos_labels):
         self.input_pos_label_name = self._get_pos_label(input_pos_label)
         self.output_pos_label_names = self._get_pos_labels(output_pos_labels)
@@ -286,6 +288,8 @@ class PosLabelConnector(ExplainerComponent):
 
 
 class CutoffConnector(ExplainerComponent):
+    _memoize_callbacks = False
+
     def __init__(self, input_cutoff, output_cutoffs):
         """Connect the cutoff selector of input_cutoff with those of output_cutoffs.
 
@@ -339,6 +343,8 @@ class CutoffConnector(ExplainerComponent):
 
 
 class IndexConnector(ExplainerComponent):
+    _memoize_callbacks = False
+
     def __init__(self, input_index, output_indexes, explainer=None):
         """Connect the index selector of input_index with those of output_indexes.
 
@@ -400,6 +406,8 @@ class IndexConnector(ExplainerComponent):
 
 
 class HighlightConnector(ExplainerComponent):
+    _memoize_callbacks = False
+
     def __init__(self, input_highlight, output_highlights):
         """Connect the highlight selector of input_highlight with those of output_highlights.
 
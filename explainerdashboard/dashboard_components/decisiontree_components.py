@@ -17,6 +17,7 @@ from .. import to_html
 
 
 class DecisionTreesComponent(ExplainerComponent):
+    _background_callbacks = dict(update_tree_graph=False)
     _state_props = dict(
         index=("decisiontrees-index-", "value"),
         highlight=("decisiontrees-highlight-", "value"),
@@ -113,7 +114,9 @@ class DecisionTreesComponent(ExplainerComponent):
             self.title,
             self.description,
         )
-        self.register_dependencies("preds", "pred_probas")
+        self.register_dependencies("preds")
+        if self.explainer.is_classifier:
+            self.register_dependencies("pred_probas")
 
     def layout(self):
         return dbc.Card(
@@ -503,6 +506,8 @@ class DecisionPathTableComponent(ExplainerComponent):
 
 
 class DecisionPathGraphComponent(ExplainerComponent):
+    _background_callbacks = dict(update_tree_graph=False)
+
     def __init__(
         self,
         explainer,
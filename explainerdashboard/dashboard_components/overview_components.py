@@ -548,6 +548,7 @@ class FeatureDescriptionsComponent(ExplainerComponent):
 
 
 class PdpComponent(ExplainerComponent):
+    _background_callbacks = dict(update_pdp_graph=True)
     _state_props = dict(
         index=("pdp-index-", "value"),
         col=("pdp-col-", "value"),
@@ -751,6 +752,7 @@ class PdpComponent(ExplainerComponent):
                             [
                                 dbc.Col(
                                     [
+                                        self.background_progress(),
                                         dcc.Loading(
                                             id="loading-pdp-graph-" + self.name,
                                             children=[
@@ -21,6 +21,7 @@ from .. import to_html
 
 class RegressionRandomIndexComponent(ExplainerComponent):
     _state_props = dict(index=("random-index-reg-index-", "value"))
+    _memoize_callbacks = False
 
     def __init__(
         self,
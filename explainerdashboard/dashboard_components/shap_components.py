@@ -827,6 +827,8 @@ class ShapDependenceComponent(ExplainerComponent):
 
 
 class ShapSummaryDependenceConnector(ExplainerComponent):
+    _memoize_callbacks = False
+
     def __init__(self, shap_summary_component, shap_dependence_component):
         """Connects a ShapSummaryComponent with a ShapDependence Component:
 
@@ -863,6 +865,7 @@ class ShapSummaryDependenceConnector(ExplainerComponent):
 
 
 class InteractionSummaryComponent(ExplainerComponent):
+    _background_callbacks = dict(update_interaction_scatter_graph=False)
     _state_props = dict(
         col=("interaction-summary-col-", "value"),
         depth=("interaction-summary-depth-", "value"),
@@ -1234,6 +1237,7 @@ class InteractionSummaryComponent(ExplainerComponent):
 
 
 class InteractionDependenceComponent(ExplainerComponent):
+    _background_callbacks = dict(update_dependence_graph=False)
     _state_props = dict(
         col=("interaction-dependence-col-", "value"),
         interact_col=("interaction-dependence-interact-col-", "value"),
@@ -1962,6 +1966,8 @@ class InteractionDependenceComponent(ExplainerComponent):
 
 
 class InteractionSummaryDependenceConnector(ExplainerComponent):
+    _memoize_callbacks = False
+
     def __init__(self, interaction_summary_component, interaction_dependence_component):
         """Connects a InteractionSummaryComponent with an InteractionDependenceComponent:
 
@@ -2117,6 +2123,9 @@ class ShapContributionsGraphComponent(ExplainerComponent):
             self.description,
         )
         self.register_dependencies("shap_values_df")
+        if self.feature_input_component is not None and explainer.shap == "kernel":
+            # the shap values of the what-if input get calculated on request
+            self._background_callbacks = dict(update_output_div=False)
 
     def layout(self):
         return dbc.Card(
@@ -2537,6 +2546,9 @@ class ShapContributionsTableComponent(ExplainerComponent):
         )
 
         self.register_dependencies("shap_values_df")
+        if self.feature_input_component is not None and explainer.shap == "kernel":
+            # the shap values of the what-if input get calculated on request
+            self._background_callbacks = dict(update_output_div=False)
 
     def layout(self):
         return dbc.Card(
@@ -18,16 +18,36 @@ __all__ = [
     "yield_id",
     "get_local_ip_adress",
     "instantiate_component",
+    "CallbackCache",
+    "BackgroundCallbacks",
+    "DownloadJobs",
+    "CallbackMetrics",
+    "plan_dependencies",
+    "calculate_dependencies",
 ]
 
 import sys
 from abc import ABC
 import inspect
 import types
+import json
+import pickle
+import hashlib
+from functools import wraps
 from typing import Union, List, Tuple
 from pathlib import Path
 from importlib import import_module
 import socket
+import time
+import tempfile
+import weakref
+from bisect import bisect_left
+from copy import deepcopy
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+import flask
+from flask import request
 
 import dash
 from dash import html, dcc, Input, Output, State
@@ -35,7 +55,17 @@ from dash.exceptions import PreventUpdate
 
 import dash_bootstrap_components as dbc
 
+import pandas as pd
+
 from . import to_html
+from .explainer_methods import (
+    LRUCache,
+    get_object_size,
+    explainer_memory_usage,
+    size_to_string,
+    progress_reporting,
+)
+from .cache_backends import get_cache_backend
 
 
 # Stolen from https://www.fast.ai/2019/08/06/delegation/
@@ -224,6 +254,1156 @@ def make_hideable(element, hide=False):
         return element
 
 
+class CallbackCache:
+    """Memoizes the outputs of ExplainerComponent callbacks, so that identical
+    inputs (e.g. switching back to a tab or pos label, or multiple users
+    looking at the same index) do not recompute the same figures.
+
+    Outputs are stored pickled in an LRUCache per component, keyed on
+    the callback name, the input and state values and the triggering inputs.
+    Components with _memoize_callbacks=False (e.g. connectors and random index
+    selectors) are never memoized.
+
+    Pass a backend (see cache_backends) to store the outputs in a cache that
+    is shared between processes instead, so that all gunicorn workers serving
+    the dashboard reuse each other's outputs. The size of a shared backend is
+    limited by its own max_bytes instead of by maxsize.
+
+    Normally configured with ExplainerDashboard(explainer, cache=...), e.g.:
+        cache=True: memoize all components with the default settings
+        cache=dict(maxsize=64, ttl=600, components={"PdpComponent": dict(ttl=60)})
+        cache=dict(ttl=600, backend="sqlite:////tmp/dashboard_cache.db")
+
+    Args:
+        maxsize (int): maximum number of outputs to store per component.
+            Defaults to 128.
+        ttl (float): seconds after which stored outputs expire. Defaults to
+            None (never expire).
+        components (dict): per component settings, keyed by component class
+            name or component name, with as values either a dict with maxsize
+            and/or ttl, or False to not memoize that component. Defaults to None.
+        backend (CacheBackend, str): shared cache backend, or the url or path
+            to create one from (see cache_backends.get_cache_backend).
+            Defaults to None (an in-memory LRUCache per component).
+        namespace (str): prefix of the keys in the shared backend. Defaults
+            to None. ExplainerDashboard additionally sets self.fingerprint to a
+            hash of the dashboard name, model and data, so that different
+            dashboards can share a backend, and a retrained model never gets
+            the stored outputs of the previous one.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 128,
+        ttl: float = None,
+        components: dict = None,
+        backend=None,
+        namespace: str = None,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.components = components or {}
+        self.backend = get_cache_backend(backend) if backend is not None else None
+        self.namespace = namespace
+        self.fingerprint = None
+        self._caches = {}
+
+    @classmethod
+    def from_param(cls, cache):
+        """returns a CallbackCache from the ExplainerDashboard cache parameter:
+        None/False, True, int (maxsize), dict (CallbackCache kwargs) or a
+        CallbackCache instance."""
+        if cache is None or cache is False:
+            return None
+        if isinstance(cache, CallbackCache):
+            return cache
+        if cache is True:
+            return cls()
+        if isinstance(cache, int):
+            return cls(maxsize=cache)
+        if isinstance(cache, dict):
+            return cls(**cache)
+        raise ValueError(
+            "cache deve ser None, True, um int (maxsize), um dict ou uma "
+            f"instância de CallbackCache, mas é {cache}!"
+        )
+
+    def to_param(self) -> dict:
+        """returns the settings of this CallbackCache as a dict that can be
+        passed as ExplainerDashboard(cache=...) and stored in a yaml file"""
+        param = dict(maxsize=self.maxsize, ttl=self.ttl, components=self.components)
+        if self.backend is not None:
+            param.update(backend=self.backend.url, namespace=self.namespace)
+        return param
+
+    def _component_settings(self, component):
+        settings = self.components.get(
+            component.name, self.components.get(component.__class__.__name__, {})
+        )
+        if settings is False or not getattr(component, "_memoize_callbacks", True):
+            return None
+        return dict(dict(maxsize=self.maxsize, ttl=self.ttl), **(settings or {}))
+
+    def get_cache(self, component):
+        """returns the LRUCache (or CacheNamespace of the shared backend)
+        of component, or None if the callbacks of component should not be memoized"""
+        if component.name not in self._caches:
+            settings = self._component_settings(component)
+            if settings is None:
+                self._caches[component.name] = None
+            elif self.backend is not None:
+                self._caches[component.name] = self.backend.namespace(
+                    f"callbacks/{self.namespace or ''}/{self.fingerprint or ''}/"
+                    f"{component.name}/",
+                    ttl=settings["ttl"],
+                )
+            else:
+                self._caches[component.name] = LRUCache(**settings)
+        return self._caches[component.name]
+
+    @staticmethod
+    def _key(func, args, kwargs):
+        try:
+            triggered = [t["prop_id"] for t in dash.callback_context.triggered]
+        except Exception:
+            triggered = []
+        payload = json.dumps(
+            [func.__qualname__, args, kwargs, triggered], sort_keys=True, default=str
+        )
+        return hashlib.sha1(payload.encode()).hexdigest()
+
+    def memoize(self, component, func):
+        """returns func wrapped so that its outputs get stored in the cache
+        of component. Returns func itself if component is not memoized."""
+        if component is None or not getattr(component, "_memoize_callbacks", True):
+            return func
+        if self.get_cache(component) is None:
+            return func
+        cache = self.get_cache(component)
+
+        @wraps(func)
+        def memoized_callback(*args, **kwargs):
+            key = self._key(func, args, kwargs)
+            output = cache.get(key)
+            if output is not None:
+                return pickle.loads(output)
+            result = func(*args, **kwargs)
+            cache.set(key, pickle.dumps(result))
+            return result
+
+        return memoized_callback
+
+    def app(self, app, component=None):
+        """returns a wrapper around the dash app whose app.callback decorator
+        memoizes the callbacks of component"""
+        if isinstance(app, _MemoizedCallbackApp):
+            app = app._app
+        return _MemoizedCallbackApp(app, self, component)
+
+    def stats(self) -> dict:
+        """returns a dict with the cache statistics (size, hits, misses,
+        evictions, hit_rate) per memoized component"""
+        return {
+            name: cache.stats()
+            for name, cache in self._caches.items()
+            if cache is not None
+        }
+
+    def clear(self):
+        for cache in self._caches.values():
+            if cache is not None:
+                cache.clear()
+
+
+class _MemoizedCallbackApp:
+    """Wraps a dash app so that callbacks registered through app.callback
+    get memoized by a CallbackCache. All other attributes are passed on
+    to the app itself."""
+
+    def __init__(self, app, callback_cache, component=None):
+        self._app = app
+        self._callback_cache = callback_cache
+        self._component = component
+
+    def callback(self, *args, **kwargs):
+        register = self._app.callback(*args, **kwargs)
+
+        def decorator(func):
+            background = isinstance(self._app, _BackgroundCallbackApp)
+            if background and self._app._background_callbacks.is_background(
+                self._component, func.__name__
+            ):
+                # background callbacks run in another process and get
+                # cached by the BackgroundCallbacks manager instead
+                register(func)
+            else:
+                register(self._callback_cache.memoize(self._component, func))
+            return func
+
+        return decorator
+
+    def for_component(self, component):
+        """returns this wrapper for registering the callbacks of component"""
+        app = self._app
+        if isinstance(app, _BackgroundCallbackApp):
+            app = app.for_component(component)
+        return _MemoizedCallbackApp(app, self._callback_cache, component)
+
+    def __getattr__(self, name):
+        return getattr(self._app, name)
+
+
+class BackgroundCallbacks:
+    """Runs expensive component callbacks (e.g. partial dependence plots with
+    large samples, interaction dependence plots or decision tree rendering)
+    as Dash background callbacks in a separate process, so that they do not
+    block a web worker for their full duration. Jobs are managed by a
+    dash.DiskcacheManager that keeps its state in a local directory, so no
+    external broker (e.g. redis or celery) is needed.
+
+    Components list the names of the callbacks that may run in the background
+    in their _background_callbacks dict, mapped to whether the callback reports
+    its progress (with report_progress()) to self.background_progress() in the
+    layout of the component. A job whose inputs change while it is still
+    running gets cancelled by Dash.
+
+    Results of background callbacks are cached on disk by their inputs and
+    by a hash of the dashboard name, model and data (unless memoize=False),
+    so that they are shared between all processes that use the same cache_dir,
+    but never served to a dashboard with a different (e.g. retrained) model.
+
+    Normally configured with ExplainerDashboard(explainer, background_callbacks=...), e.g.:
+        background_callbacks=True
+        background_callbacks=dict(cache_dir="/tmp/db_jobs", expire=3600)
+        background_callbacks=dict(components={"PdpComponent": False})
+
+    Requires the dash diskcache extras: pip install dash[diskcache]
+
+    Args:
+        cache_dir (str, Path): directory used by the diskcache manager. All
+            processes serving the dashboard should use the same directory.
+            Defaults to a subdirectory per dashboard (name, model and data) in
+            the system temp dir.
+        expire (float): seconds after which unused cached results get
+            removed. Defaults to 86400 (a day).
+        memoize (bool): cache the results of background callbacks by their
+            inputs. Defaults to True.
+        components (dict): per component name or class name, False to never
+            run the callbacks of that component in the background.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Union[str, Path] = None,
+        expire: float = 86400,
+        memoize: bool = True,
+        components: dict = None,
+    ):
+        self.cache_dir = str(cache_dir) if cache_dir is not None else None
+        self.expire = expire
+        self.memoize = memoize
+        self.components = components or {}
+        self.namespace = None
+        self._manager = None
+
+    @classmethod
+    def from_param(cls, background_callbacks):
+        """returns BackgroundCallbacks from the ExplainerDashboard
+        background_callbacks parameter: None/False, True, a dict
+        (BackgroundCallbacks kwargs) or a BackgroundCallbacks instance."""
+        if background_callbacks is None or background_callbacks is False:
+            return None
+        if isinstance(background_callbacks, BackgroundCallbacks):
+            return background_callbacks
+        if background_callbacks is True:
+            return cls()
+        if isinstance(background_callbacks, dict):
+            return cls(**background_callbacks)
+        raise ValueError(
+            "background_callbacks deve ser None, True, um dict ou uma "
+            f"instância de BackgroundCallbacks, mas é {background_callbacks}!"
+        )
+
+    def to_param(self) -> dict:
+        """returns the settings as a dict that can be passed as
+        ExplainerDashboard(background_callbacks=...) and stored in a yaml file"""
+        return dict(
+            cache_dir=self.cache_dir,
+            expire=self.expire,
+            memoize=self.memoize,
+            components=self.components,
+        )
+
+    @property
+    def manager(self):
+        """the dash.DiskcacheManager that runs the background callbacks"""
+        if self._manager is None:
+            try:
+                import diskcache
+            except ImportError:
+                raise ImportError(
+                    "Para usar background_callbacks é necessário instalar o "
+                    "diskcache, psutil e multiprocess: pip install dash[diskcache]"
+                )
+            cache_dir = self.cache_dir or (
+                Path(tempfile.gettempdir())
+                / "explainerdashboard_background_callbacks"
+                / (self.namespace or "default")
+            )
+            self._manager = dash.DiskcacheManager(
+                diskcache.Cache(str(cache_dir)),
+                cache_by=[lambda: self.namespace or ""] if self.memoize else None,
+                expire=self.expire,
+            )
+        return self._manager
+
+    def is_background(self, component, callback_name: str) -> bool:
+        """returns True if the callback_name callback of component should
+        run as a background callback"""
+        if component is None:
+            return False
+        if callback_name not in getattr(component, "_background_callbacks", {}):
+            return False
+        setting = self.components.get(
+            component.name, self.components.get(component.__class__.__name__, True)
+        )
+        return setting is not False
+
+    def callback_kwargs(self, component, callback_name: str) -> dict:
+        """returns the background kwargs for app.callback()"""
+        kwargs = dict(background=True, manager=self.manager)
+        if component._background_callbacks[callback_name]:
+            progress_id = "background-progress-" + component.name
+            kwargs.update(
+                progress=[Output(progress_id, "value"), Output(progress_id, "label")],
+                progress_default=[0, ""],
+                running=[
+                    (Output(progress_id, "style"), {}, dict(display="none")),
+                ],
+            )
+        return kwargs
+
+    def app(self, app, component=None):
+        """returns a wrapper around the dash app whose app.callback decorator
+        runs the background callbacks of component in the background"""
+        if isinstance(app, _BackgroundCallbackApp):
+            app = app._app
+        return _BackgroundCallbackApp(app, self, component)
+
+
+class _BackgroundCallbackApp:
+    """Wraps a dash app so that the callbacks listed in the _background_callbacks
+    of a component get registered as background callbacks of a
+    BackgroundCallbacks manager. All other attributes are passed on to the
+    app itself."""
+
+    def __init__(self, app, background_callbacks, component=None):
+        self._app = app
+        self._background_callbacks = background_callbacks
+        self._component = component
+
+    def callback(self, *args, **kwargs):
+        def decorator(func):
+            if not self._background_callbacks.is_background(
+                self._component, func.__name__
+            ):
+                self._app.callback(*args, **kwargs)(func)
+                return func
+
+            background_kwargs = self._background_callbacks.callback_kwargs(
+                self._component, func.__name__
+            )
+            if "progress" not in background_kwargs:
+                self._app.callback(*args, **kwargs, **background_kwargs)(func)
+                return func
+
+            @wraps(func)
+            def background_callback(set_progress, *args):
+                def reporter(fraction):
+                    set_progress((int(100 * fraction), f"{100 * fraction:.0f}%"))
+
+                with progress_reporting(reporter):
+                    return func(*args)
+
+            self._app.callback(*args, **kwargs, **background_kwargs)(
+                background_callback
+            )
+            return func
+
+        return decorator
+
+    def for_component(self, component):
+        """returns this wrapper for registering the callbacks of component"""
+        return _BackgroundCallbackApp(self._app, self._background_callbacks, component)
+
+    def __getattr__(self, name):
+        return getattr(self._app, name)
+
+
+class DownloadJobs:
+    """Renders the static html behind the download button of a dashboard as
+    a background job on a local thread pool, instead of inside the callback
+    request, so that long exports do not block a web worker or run into
+    proxy timeouts. The header shows the progress of the job by polling it,
+    and the file gets downloaded once the job is done.
+
+    Finished exports are kept in an LRUCache keyed by a hash of the button
+    and the state of the dashboard, so downloading the same state again
+    returns immediately. Exports of a state that is already being rendered
+    attach to the running job. Failed exports are removed from the pending
+    jobs right away, and their error is kept in a separate LRUCache until
+    the browser polls it.
+
+    Normally created with ExplainerDashboard(explainer, background_downloads=...),
+    e.g. background_downloads=True or background_downloads=dict(max_workers=1).
+
+    Args:
+        max_workers (int): number of exports that get rendered concurrently.
+            Defaults to 2.
+        max_pending (int): maximum number of running plus queued exports.
+            Further downloads get refused until one finishes. Defaults to 8.
+        maxsize (int): number of finished exports (and of errors of failed
+            exports) to keep. Defaults to 16.
+        ttl (float): seconds after which finished exports expire. Defaults
+            to None (never).
+        interval (int): milliseconds between progress updates in the
+            browser. Defaults to 1000.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        max_pending: int = 8,
+        maxsize: int = 16,
+        ttl: float = None,
+        interval: int = 1000,
+    ):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.interval = interval
+        self.results = LRUCache(maxsize=maxsize, ttl=ttl)
+        self.errors = LRUCache(maxsize=maxsize, ttl=ttl)
+        self._jobs = {}
+        self._lock = Lock()
+        self._pool = None
+
+    @classmethod
+    def from_param(cls, background_downloads):
+        """returns DownloadJobs from the ExplainerDashboard background_downloads
+        parameter: None/False, True, a dict (DownloadJobs kwargs) or a
+        DownloadJobs instance."""
+        if background_downloads is None or background_downloads is False:
+            return None
+        if isinstance(background_downloads, DownloadJobs):
+            return background_downloads
+        if background_downloads is True:
+            return cls()
+        if isinstance(background_downloads, dict):
+            return cls(**background_downloads)
+        raise ValueError(
+            "background_downloads deve ser None, True, um dict ou uma "
+            f"instância de DownloadJobs, mas é {background_downloads}!"
+        )
+
+    def to_param(self) -> dict:
+        """returns the settings as a dict that can be passed as
+        ExplainerDashboard(background_downloads=...) and stored in a yaml file"""
+        return dict(
+            max_workers=self.max_workers,
+            max_pending=self.max_pending,
+            maxsize=self.maxsize,
+            ttl=self.ttl,
+            interval=self.interval,
+        )
+
+    @staticmethod
+    def job_key(*args) -> str:
+        """returns a hash of args (e.g. button id and state) to identify a job"""
+        payload = json.dumps(args, sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode()).hexdigest()
+
+    def submit(self, key: str, func) -> bool:
+        """starts func(progress) as a background job under key, unless a job
+        with that key is already running or its result is still cached.
+        func should call progress(fraction) as it goes and return the result.
+        Returns False if the job got refused because max_pending jobs are
+        already running or queued."""
+        with self._lock:
+            if key in self._jobs or self.results.get(key, count=False) is not None:
+                return True
+            if len(self._jobs) >= self.max_pending:
+                return False
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="explainerdashboard-download",
+                )
+            job = dict(progress=0.0)
+            self._jobs[key] = job
+            self.errors.pop(key)
+
+        def progress(fraction):
+            job["progress"] = min(max(float(fraction), 0.0), 1.0)
+
+        def run():
+            try:
+                self.results.set(key, func(progress))
+            except Exception as e:
+                with self._lock:
+                    self._jobs.pop(key, None)
+                    self.errors.set(
+                        key,
+                        dict(
+                            state="error",
+                            progress=job["progress"],
+                            error=f"{type(e).__name__}: {e}",
+                        ),
+                    )
+                return
+            with self._lock:
+                self._jobs.pop(key, None)
+
+        self._pool.submit(run)
+        return True
+
+    def status(self, key: str) -> dict:
+        """returns a dict with the state ('done', 'running', 'error' or
+        'unknown') and progress (0-1) of job key. A failed job is reported
+        once and then forgotten."""
+        with self._lock:
+            job = self._jobs.get(key)
+            error = self.errors.pop(key) if job is None else None
+        if error is not None:
+            return error
+        if job is not None:
+            return dict(state="running", progress=job["progress"], error=None)
+        if self.results.get(key, count=False) is not None:
+            return dict(state="done", progress=1.0, error=None)
+        return dict(state="unknown", progress=0.0, error=None)
+
+    def result(self, key: str):
+        """returns the result of job key, or None if it is not done (anymore)"""
+        return self.results.get(key)
+
+    def n_pending(self) -> int:
+        """number of jobs that are running or queued"""
+        with self._lock:
+            return len(self._jobs)
+
+    def stats(self) -> dict:
+        """returns a dict with the number of pending jobs and the statistics
+        of the cache of finished exports"""
+        return dict(pending=self.n_pending(), **self.results.stats())
+
+    def layout(self, name: str) -> list:
+        """returns the components that track a background download in the
+        dashboard header: a poll interval, a store with the current job and
+        a progress bar that only shows while a job is running"""
+        return [
+            dcc.Interval(
+                id="download-interval-" + name, interval=self.interval, disabled=True
+            ),
+            dcc.Store(id="download-job-" + name),
+            html.Div(
+                [
+                    dbc.Progress(
+                        id="download-progress-" + name,
+                        value=0,
+                        label="",
+                        style=dict(minWidth="120px"),
+                    ),
+                    html.Small(id="download-message-" + name, className="text-muted"),
+                ],
+                id="download-status-" + name,
+                style=dict(display="none"),
+            ),
+        ]
+
+    def register_callback(
+        self, app, name: str, buttons: List[str], state_tuples, render
+    ):
+        """registers the callback that starts a background job when one of
+        buttons gets clicked and polls it until the file can be downloaded.
+
+        Args:
+            app: dash app
+            name (str): name of the layout, as passed to self.layout()
+            buttons (List[str]): ids of the download buttons
+            state_tuples: (id, prop) tuples of the dashboard state to export
+            render (callable): render(button_id, state_dict, progress) should
+                return the html to download for button_id
+        """
+
+        def start(job):
+            state_dict = {(id_, prop_): value for id_, prop_, value in job["state"]}
+            return self.submit(
+                job["key"],
+                lambda progress: render(job["button"], state_dict, progress),
+            )
+
+        def outputs(job, status, message=""):
+            if status["state"] == "done":
+                return (
+                    dict(content=self.result(job["key"]), filename="dashboard.html"),
+                    None,
+                    True,
+                    100,
+                    "",
+                    "",
+                    dict(display="none"),
+                )
+            running = status["state"] == "running"
+            percentage = int(100 * status["progress"])
+            return (
+                dash.no_update,
+                job if running else None,
+                not running,
+                percentage,
+                f"{percentage}%" if running else "",
+                message,
+                dict(display="block"),
+            )
+
+        @app.callback(
+            Output("download-page-" + name, "data"),
+            Output("download-job-" + name, "data"),
+            Output("download-interval-" + name, "disabled"),
+            Output("download-progress-" + name, "value"),
+            Output("download-progress-" + name, "label"),
+            Output("download-message-" + name, "children"),
+            Output("download-status-" + name, "style"),
+            [Input(button, "n_clicks") for button in buttons]
+            + [Input("download-interval-" + name, "n_intervals")],
+            [State("download-job-" + name, "data")]
+            + [State(id_, prop_) for id_, prop_ in state_tuples],
+        )
+        def download_in_background(*args):
+            job = args[len(buttons) + 1]
+            state = args[len(buttons) + 2 :]
+            triggered = dash.callback_context.triggered[0]["prop_id"].split(".")[0]
+
+            if triggered in buttons:
+                if args[buttons.index(triggered)] is None:
+                    raise PreventUpdate
+                job_state = [
+                    [id_, prop_, value]
+                    for (id_, prop_), value in zip(state_tuples, state)
+                ]
+                job = dict(
+                    key=self.job_key(name, triggered, job_state),
+                    button=triggered,
+                    state=job_state,
+                )
+            elif not job:
+                raise PreventUpdate
+
+            status = self.status(job["key"])
+            if status["state"] == "unknown":
+                # e.g. polled by another worker process: start the job here
+                if not start(job):
+                    return outputs(
+                        job,
+                        status,
+                        "Demasiadas exportações em curso, tente novamente mais tarde.",
+                    )
+                status = self.status(job["key"])
+            if status["state"] == "error":
+                return outputs(job, status, f"A exportação falhou: {status['error']}")
+            return outputs(job, status)
+
+        return download_in_background
+
+
+class CallbackMetrics:
+    """Measures the latency and response size of the callback requests of
+    dashboards, and serves them together with the callback cache hit rates
+    and the memory usage of the explainers in the Prometheus text format on
+    a /metrics route of the flask server, so that slow or heavy components
+    can be monitored and alerted on in production.
+
+    Requests get timed on the flask server, so including the serialization
+    of the outputs, and are labeled with the dashboard, the component class
+    that registered the callback and the callback output id. Background
+    callbacks get measured per polling request.
+
+    Normally created with ExplainerDashboard(explainer, metrics=...) or
+    ExplainerHub(dashboards, metrics=...), e.g. metrics=True or
+    metrics=dict(route="/db_metrics", latency_buckets=[0.1, 1, 10]).
+    All dashboards on the same flask server share a single CallbackMetrics.
+    The route is not protected by the logins of a hub.
+
+    Args:
+        route (str): route of the metrics endpoint. Defaults to "/metrics".
+        latency_buckets (List[float]): upper bounds in seconds of the latency
+            histogram buckets. Defaults to 0.01s up to 30s.
+        size_buckets (List[int]): upper bounds in bytes of the response size
+            histogram buckets. Defaults to 1kB up to 10MB.
+        memory_interval (float): seconds for which the memory usage of an
+            explainer gets reused between scrapes before it gets measured
+            again. A newly loaded explainer gets measured on the next scrape.
+            Defaults to 60.
+    """
+
+    default_latency_buckets = [0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30]
+    default_size_buckets = [1_000, 10_000, 100_000, 250_000, 1_000_000, 10_000_000]
+
+    def __init__(
+        self,
+        route: str = "/metrics",
+        latency_buckets: List[float] = None,
+        size_buckets: List[int] = None,
+        memory_interval: float = 60,
+    ):
+        self.route = route
+        self.latency_buckets = sorted(latency_buckets or self.default_latency_buckets)
+        self.size_buckets = sorted(size_buckets or self.default_size_buckets)
+        self.memory_interval = memory_interval
+        self._memory = weakref.WeakKeyDictionary()
+        self._histograms = {}
+        self._components = {}
+        self._paths = {}
+        self._dashboards = {}
+        self._lock = Lock()
+
+    @classmethod
+    def from_param(cls, metrics):
+        """returns CallbackMetrics from the ExplainerDashboard metrics parameter:
+        None/False, True, a dict (CallbackMetrics kwargs) or a CallbackMetrics
+        instance."""
+        if metrics is None or metrics is False:
+            return None
+        if isinstance(metrics, CallbackMetrics):
+            return metrics
+        if metrics is True:
+            return cls()
+        if isinstance(metrics, dict):
+            return cls(**metrics)
+        raise ValueError(
+            "metrics deve ser None, True, um dict ou uma instância de "
+            f"CallbackMetrics, mas é {metrics}!"
+        )
+
+    def to_param(self) -> dict:
+        """returns the settings as a dict that can be passed as
+        ExplainerDashboard(metrics=...) and stored in a yaml file"""
+        return dict(
+            route=self.route,
+            latency_buckets=self.latency_buckets,
+            size_buckets=self.size_buckets,
+            memory_interval=self.memory_interval,
+        )
+
+    def register_server(self, server):
+        """adds the hooks that measure the callback requests and the metrics
+        route to the flask server, unless another CallbackMetrics has already
+        been registered with it. Returns the CallbackMetrics of server."""
+        registered = server.extensions.get("explainerdashboard_metrics")
+        if registered is not None:
+            return registered
+        server.extensions["explainerdashboard_metrics"] = self
+        server.before_request(self._start_request)
+        server.after_request(self._end_request)
+        server.add_url_rule(
+            self.route, "explainerdashboard_metrics", self._metrics_response
+        )
+        return self
+
+    def register_dashboard(self, dashboard):
+        """starts measuring the callback requests of dashboard and reporting
+        its cache statistics and explainer memory usage. Returns the
+        CallbackMetrics registered with the flask server of dashboard, which
+        should be used to register the callbacks with."""
+        metrics = self.register_server(dashboard.app.server)
+        name = dashboard.name or "dashboard"
+        path = dashboard.app.config.routes_pathname_prefix + "_dash-update-component"
+        with metrics._lock:
+            metrics._paths[path] = name
+            metrics._dashboards[name] = weakref.ref(dashboard)
+        return metrics
+
+    def app(self, app, dashboard_name: str, component=None):
+        """returns a wrapper around the dash app that records which component
+        registers which callback"""
+        return _MetricsCallbackApp(app, self, dashboard_name, component)
+
+    def add_callback(self, dashboard_name: str, callback_id: str, component=None):
+        """labels the requests of callback_id with the class of component"""
+        self._components[(dashboard_name, callback_id)] = (
+            component.__class__.__name__ if component is not None else ""
+        )
+
+    def observe(
+        self,
+        dashboard_name: str,
+        callback_id: str,
+        seconds: float,
+        size: int,
+        error: bool = False,
+    ):
+        """adds a callback request that took seconds and returned size bytes"""
+        component = self._components.get((dashboard_name, callback_id), "")
+        key = (dashboard_name, component, callback_id)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = dict(
+                    latency=[0] * (len(self.latency_buckets) + 1),
+                    size=[0] * (len(self.size_buckets) + 1),
+                    seconds=0.0,
+                    bytes=0,
+                    count=0,
+                    errors=0,
+                )
+            histogram["latency"][bisect_left(self.latency_buckets, seconds)] += 1
+            histogram["size"][bisect_left(self.size_buckets, size)] += 1
+            histogram["seconds"] += seconds
+            histogram["bytes"] += size
+            histogram["count"] += 1
+            histogram["errors"] += int(error)
+
+    def _start_request(self):
+        # the environ is shared with the flask servers of lazily loaded hub
+        # dashboards, so that their requests only get measured once
+        if (
+            request.path in self._paths
+            and "explainerdashboard.metrics_start" not in request.environ
+        ):
+            request.environ["explainerdashboard.metrics_start"] = time.perf_counter()
+
+    def _end_request(self, response):
+        start = request.environ.pop("explainerdashboard.metrics_start", None)
+        if start is not None:
+            self.observe(
+                self._paths.get(request.path, ""),
+                (request.get_json(silent=True) or {}).get("output", ""),
+                time.perf_counter() - start,
+                response.content_length or 0,
+                error=response.status_code >= 400,
+            )
+        return response
+
+    def _metrics_response(self):
+        return flask.Response(
+            self.render(), content_type="text/plain; version=0.0.4; charset=utf-8"
+        )
+
+    def stats(self) -> dict:
+        """returns a dict with the number of requests, errors, mean latency
+        and mean response size per (dashboard, component, callback)"""
+        with self._lock:
+            return {
+                key: dict(
+                    count=histogram["count"],
+                    errors=histogram["errors"],
+                    mean_seconds=histogram["seconds"] / histogram["count"],
+                    mean_bytes=histogram["bytes"] / histogram["count"],
+                )
+                for key, histogram in self._histograms.items()
+            }
+
+    def explainer_memory(self, explainer) -> int:
+        """returns explainer_memory_usage(explainer), measured at most once
+        every memory_interval seconds per explainer"""
+        now = time.monotonic()
+        with self._lock:
+            measured = self._memory.get(explainer)
+        if measured is not None and now - measured[0] < self.memory_interval:
+            return measured[1]
+        memory = explainer_memory_usage(explainer)
+        with self._lock:
+            self._memory[explainer] = (now, memory)
+        return memory
+
+    def render(self) -> str:
+        """returns all metrics in the Prometheus text exposition format"""
+        lines = []
+
+        def add_metric(name, kind, description, samples):
+            lines.append(f"# HELP explainerdashboard_{name} {description}")
+            lines.append(f"# TYPE explainerdashboard_{name} {kind}")
+            for suffix, labels, value in samples:
+                lines.append(
+                    f"explainerdashboard_{name}{suffix}{_prometheus_labels(labels)} "
+                    f"{_prometheus_value(value)}"
+                )
+
+        def histogram_samples(histograms, name, buckets, total):
+            for (dashboard, component, callback), histogram in histograms:
+                labels = dict(
+                    dashboard=dashboard, component=component, callback=callback
+                )
+                cumulative = 0
+                for bound, count in zip(buckets + [float("inf")], histogram[name]):
+                    cumulative += count
+                    yield "_bucket", dict(labels, le=bound), cumulative
+                yield "_sum", labels, histogram[total]
+                yield "_count", labels, histogram["count"]
+
+        with self._lock:
+            histograms = [
+                (key, deepcopy(histogram))
+                for key, histogram in sorted(self._histograms.items())
+            ]
+            dashboards = [
+                (name, ref()) for name, ref in sorted(self._dashboards.items())
+            ]
+        add_metric(
+            "callback_duration_seconds",
+            "histogram",
+            "Duração dos pedidos de callback.",
+            histogram_samples(histograms, "latency", self.latency_buckets, "seconds"),
+        )
+        add_metric(
+            "callback_response_bytes",
+            "histogram",
+            "Tamanho das respostas dos pedidos de callback.",
+            histogram_samples(histograms, "size", self.size_buckets, "bytes"),
+        )
+        add_metric(
+            "callback_errors_total",
+            "counter",
+            "Pedidos de callback que falharam.",
+            [
+                ("", dict(dashboard=d, component=co, callback=ca), h["errors"])
+                for (d, co, ca), h in histograms
+            ],
+        )
+
+        cache_samples, row_cache_samples, memory_samples = [], [], []
+        for name, dashboard in dashboards:
+            if dashboard is None:
+                continue
+            callback_cache = getattr(dashboard, "callback_cache", None)
+            if callback_cache is not None:
+                for component_name, stats in callback_cache.stats().items():
+                    labels = dict(dashboard=name, component_name=component_name)
+                    cache_samples.append(("_hits_total", labels, stats["hits"]))
+                    cache_samples.append(("_misses_total", labels, stats["misses"]))
+            explainer = getattr(dashboard, "explainer", None)
+            if explainer is None:
+                continue
+            for cache, stats in (explainer.row_cache_stats() or {}).items():
+                labels = dict(dashboard=name, cache=cache)
+                row_cache_samples.append(("_hits_total", labels, stats["hits"]))
+                row_cache_samples.append(("_misses_total", labels, stats["misses"]))
+            memory_samples.append(
+                (
+                    "",
+                    dict(dashboard=name, explainer=explainer.__class__.__name__),
+                    self.explainer_memory(explainer),
+                )
+            )
+        add_metric(
+            "callback_cache",
+            "counter",
+            "Acertos e falhas da cache de callbacks por componente.",
+            cache_samples,
+        )
+        add_metric(
+            "row_cache",
+            "counter",
+            "Acertos e falhas da cache de linhas do explainer.",
+            row_cache_samples,
+        )
+        add_metric(
+            "explainer_memory_bytes",
+            "gauge",
+            "Memória usada (aproximadamente) pelo explainer.",
+            memory_samples,
+        )
+        return "\n".join(lines) + "\n"
+
+
+def _prometheus_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    escaped = {
+        k: str(_prometheus_value(v) if k == "le" else v)
+        .replace("\\", "\\\\")
+        .replace('"', '\\"')
+        .replace("\n", "\\n")
+        for k, v in labels.items()
+    }
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped.items()) + "}"
+
+
+def _prometheus_value(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and not value.is_integer():
+        return repr(value)
+    return str(int(value))
+
+
+class _MetricsCallbackApp:
+    """Wraps a dash app so that the callbacks registered through app.callback
+    get labeled with the component that registered them in CallbackMetrics.
+    All other attributes are passed on to the app itself."""
+
+    def __init__(self, app, callback_metrics, dashboard_name, component=None):
+        self._app = app
+        self._callback_metrics = callback_metrics
+        self._dashboard_name = dashboard_name
+        self._component = component
+
+    def callback(self, *args, **kwargs):
+        register = self._app.callback(*args, **kwargs)
+
+        def decorator(func):
+            result = register(func)
+            self._callback_metrics.add_callback(
+                self._dashboard_name,
+                next(reversed(self._app.callback_map)),
+                self._component,
+            )
+            return result
+
+        return decorator
+
+    def for_component(self, component):
+        """returns this wrapper for registering the callbacks of component"""
+        app = self._app
+        if isinstance(app, (_MemoizedCallbackApp, _BackgroundCallbackApp)):
+            app = app.for_component(component)
+        return _MetricsCallbackApp(
+            app, self._callback_metrics, self._dashboard_name, component
+        )
+
+    def __getattr__(self, name):
+        return getattr(self._app, name)
+
+
+def _dependency_prerequisites(explainer, dependency: str) -> List[str]:
+    """returns the explainer properties that dependency uses internally, so
+    that they can be calculated before it instead of concurrently with it"""
+    if dependency == "pred_percentiles":
+        if getattr(explainer, "is_classifier", False):
+            return ["pred_probas"]
+        return ["preds"]
+    return dict(
+        residuals=["preds"],
+        abs_residuals=["residuals"],
+        shap_interaction_values=["shap_values_df"],
+        mean_abs_shap_interactions=["shap_interaction_values"],
+    ).get(dependency, [])
+
+
+def plan_dependencies(explainer, dependencies: List[str]) -> List[List[str]]:
+    """Orders the unique dependencies in stages: every dependency comes in a
+    later stage than its prerequisites (e.g. preds before residuals and
+    shap values before shap interaction values), so that the dependencies
+    within a stage can be calculated in parallel. Prerequisites that were
+    not registered themselves get added.
+
+    Args:
+        explainer: the explainer the dependencies are properties of.
+        dependencies (List[str]): names of explainer properties.
+
+    Returns:
+        List[List[str]]: dependencies per stage
+    """
+    stage_of = {}
+
+    def get_stage(dep, visiting=()):
+        if dep not in stage_of:
+            if dep in visiting:
+                raise ValueError(
+                    f"Dependência circular: {' -> '.join(visiting)} -> {dep}"
+                )
+            prerequisites = _dependency_prerequisites(explainer, dep)
+            stage_of[dep] = 1 + max(
+                [get_stage(pre, visiting + (dep,)) for pre in prerequisites], default=-1
+            )
+        return stage_of[dep]
+
+    for dep in dependencies:
+        get_stage(dep)
+    stages = [[] for _ in range(max(stage_of.values(), default=-1) + 1)]
+    for dep, stage in stage_of.items():
+        stages[stage].append(dep)
+    return [sorted(stage) for stage in stages]
+
+
+def _calculate_dependency(explainer, dependency: str) -> dict:
+    """calculates a single dependency and returns its timing and the size
+    of its result"""
+    start = time.perf_counter()
+    try:
+        if hasattr(type(explainer), dependency) or dependency in vars(explainer):
+            attribute = getattr(explainer, dependency)
+        elif hasattr(explainer, "get_" + dependency):
+            # e.g. shap_values_df is retrieved with explainer.get_shap_values_df()
+            attribute = getattr(explainer, "get_" + dependency)
+        else:
+            raise AttributeError(
+                f"{explainer.__class__.__name__} não tem a propriedade {dependency}"
+            )
+        result = attribute() if callable(attribute) else attribute
+        error = None
+    except Exception as e:
+        result, error = None, e
+    return dict(
+        dependency=dependency,
+        seconds=time.perf_counter() - start,
+        result_bytes=get_object_size(result) if error is None else 0,
+        error=error,
+    )
+
+
+def calculate_dependencies(
+    explainer, dependencies: List[str], n_jobs: int = None, raise_errors: bool = False
+) -> pd.DataFrame:
+    """Calculates the dependencies (lazily calculated explainer properties)
+    up front, stage by stage as planned by plan_dependencies(), with the
+    dependencies within a stage calculated in parallel on a thread pool
+    (the results have to end up in the explainer of this process). Properties
+    that are needed by several dependencies at the same time only get
+    calculated once, as their calculation holds a lock per property.
+
+    Args:
+        explainer: the explainer the dependencies are properties of.
+        dependencies (List[str]): names of explainer properties.
+        n_jobs (int): maximum number of threads. Defaults to None
+            (one thread per dependency in a stage).
+        raise_errors (bool): raise a ValueError listing the dependencies that
+            failed. If False only print a warning. Defaults to False.
+
+    Returns:
+        pd.DataFrame: with per dependency the stage, the seconds it took to
+            calculate, the result_bytes and result_size of the result (see
+            get_object_size, this is not the peak memory used by the
+            calculation) and the error (if any).
+    """
+    stages = plan_dependencies(explainer, dependencies)
+    report = []
+    for stage, deps in enumerate(stages):
+        if n_jobs == 1 or len(deps) == 1:
+            results = [_calculate_dependency(explainer, dep) for dep in deps]
+        else:
+            with ThreadPoolExecutor(max_workers=n_jobs or len(deps)) as pool:
+                results = list(
+                    pool.map(lambda dep: _calculate_dependency(explainer, dep), deps)
+                )
+        report.extend([dict(result, stage=stage) for result in results])
+
+    report_df = pd.DataFrame(
+        report, columns=["dependency", "stage", "seconds", "result_bytes", "error"]
+    )
+    report_df["result_size"] = report_df.result_bytes.apply(size_to_string)
+    failed = report_df[report_df.error.notnull()]
+    if len(failed) > 0:
+        message = "Falha ao gerar dependências: " + ", ".join(
+            f"explainer.{row.dependency} ({row.error.__class__.__name__}: {row.error})"
+            for row in failed.itertuples()
+        )
+        if raise_errors:
+            raise ValueError(message) from failed.error.iloc[0]
+        print(f"Aviso: {message}", flush=True)
+    return report_df
+
+
 class DummyComponent:
     def __init__(self):
         pass
@@ -261,6 +1441,8 @@ class ExplainerComponent(ABC):
     """
 
     _state_props = {}
+    _memoize_callbacks = True
+    _background_callbacks = {}
 
     def __init__(self, explainer, title=None, name=None):
         """initialize the ExplainerComponent
@@ -413,7 +1595,7 @@ class ExplainerComponent(ABC):
         if not hasattr(self, "_dependencies"):
             self._dependencies = []
         self.register_components()
-        deps = self._dependencies
+        deps = list(self._dependencies)
         for comp in self._components:
             deps.extend(comp.dependencies)
         deps = list(set(deps))
@@ -484,21 +1666,18 @@ class ExplainerComponent(ABC):
         pos_labels = list(set(pos_labels))
         return pos_labels
 
-    def calculate_dependencies(self):
+    def calculate_dependencies(self, n_jobs: int = None, raise_errors: bool = False):
         """calls all properties in self.dependencies so that they get calculated
         up front. This is useful to do before starting a dashboard, so you don't
-        compute properties multiple times in parallel."""
-        for dep in self.dependencies:
-            try:
-                attribute = getattr(self.explainer, dep)
-                if callable(attribute):
-                    _ = attribute()
-            except:
-                # Traduzido
-                ValueError(
-                    f"Falha ao gerar dependência '{dep}': "
-                    f"Falha ao calcular ou recuperar a propriedade do explainer explainer.{dep}..."
-                )
+        compute properties multiple times in parallel.
+
+        Independent dependencies are calculated in parallel, see
+        calculate_dependencies() in dashboard_methods. Returns a pd.DataFrame
+        with the time it took to calculate each dependency and the size of
+        its result."""
+        return calculate_dependencies(
+            self.explainer, self.dependencies, n_jobs=n_jobs, raise_errors=raise_errors
+        )
 
     def layout(self):
         """layout to be defined by the particular ExplainerComponent instance.
@@ -543,7 +1722,24 @@ class ExplainerComponent(ABC):
         self.register_components()
         for comp in self._components:
             comp.register_callbacks(app)
-        self.component_callbacks(app)
+        if isinstance(
+            app, (_MemoizedCallbackApp, _BackgroundCallbackApp, _MetricsCallbackApp)
+        ):
+            self.component_callbacks(app.for_component(self))
+        else:
+            self.component_callbacks(app)
+
+    def background_progress(self):
+        """returns a progress bar that shows the progress of a background
+        callback of this component while it is running (see BackgroundCallbacks),
+        and that stays hidden otherwise"""
+        return dbc.Progress(
+            id="background-progress-" + self.name,
+            value=0,
+            label="",
+            style=dict(display="none"),
+            class_name="mb-2",
+        )
 
 
 class PosLabelSelector(ExplainerComponent):
@@ -693,11 +1889,11 @@ class IndexSelector(ExplainerComponent):
                     if "value" in trigger_props or not search_value:
                         new_options = [index] if index is not None else []
                     else:
-                        new_options = [
-                            idx
-                            for idx in self.explainer.get_index_list()
-                            if (str(search_value) in idx) or (idx == str(index))
-                        ]
+                        new_options = self.explainer.search_index(
+                            search_value, max_results=self.max_idxs_in_dropdown
+                        )
+                        if index is not None and str(index) not in new_options:
+                            new_options = [str(index)] + new_options
                     return new_options[: self.max_idxs_in_dropdown]
 
         else:
@@ -718,6 +1914,8 @@ class IndexSelector(ExplainerComponent):
 class GraphPopout(ExplainerComponent):
     """Provides a way to open a modal popup with the content of a graph figure."""
 
+    _memoize_callbacks = False
+
     def __init__(
         self,
         name: str,
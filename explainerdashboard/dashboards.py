@@ -11,16 +11,25 @@ __all__ = [
     "InlineExplainer",
 ]
 
+import os
 import sys
 import re
+import gc
+import weakref
+import time
 import json
+import hashlib
 import inspect
-import requests
+import shutil
+import tempfile
 from typing import List, Union
 from pathlib import Path
 from copy import copy, deepcopy
+from threading import Lock, Thread
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import warnings
 
+import pandas as pd
 import oyaml as yaml
 
 import dash
@@ -35,9 +44,9 @@ warnings.filterwarnings(
     UserWarning,
     "dash_auth.plotly_auth",
 )
-import dash_auth
 
-from flask import Flask, request, redirect
+from flask import Flask, request, redirect, abort
+from markupsafe import escape
 from flask_simplelogin import SimpleLogin, login_required
 from werkzeug.security import check_password_hash, generate_password_hash
 
@@ -48,13 +57,23 @@ warnings.filterwarnings(
     DeprecationWarning,
     "jupyter_dash.comms",
 )
-from jupyter_dash import JupyterDash
 
 import plotly.io as pio
 
-from .dashboard_methods import instantiate_component, encode_callables, decode_callables
+from .dashboard_methods import (
+    instantiate_component,
+    encode_callables,
+    decode_callables,
+    CallbackCache,
+    BackgroundCallbacks,
+    DownloadJobs,
+    CallbackMetrics,
+    calculate_dependencies,
+)
 from .dashboard_components import *
 from .explainers import BaseExplainer
+from .explainer_methods import explainer_memory_usage, size_to_string
+from .cache_backends import CacheBackend
 from . import to_html
 
 # with pipelines we extract the final model that is fitted on raw numpy arrays and so will throw
@@ -67,6 +86,14 @@ warnings.filterwarnings(
 )
 
 
+def _jupyter_dash():
+    """imports JupyterDash only when a dashboard is actually run in a notebook,
+    as importing it (and IPython) adds noticeably to the import time"""
+    from jupyter_dash import JupyterDash
+
+    return JupyterDash
+
+
 class ExplainerTabsLayout(ExplainerComponent):
     def __init__(
         self,
@@ -82,6 +109,8 @@ class ExplainerTabsLayout(ExplainerComponent):
         block_selector_callbacks=False,
         pos_label=None,
         fluid=True,
+        lazy_tabs=False,
+        background_downloads=None,
         **kwargs,
     ):
         """Generates a multi tab layout from a a list of ExplainerComponents.
@@ -108,8 +137,20 @@ class ExplainerTabsLayout(ExplainerComponent):
             pos_label ({int, str}, optional): initial pos label.
                         Defaults to explainer.pos_label
             fluid (bool, optional): Stretch layout to fill space. Defaults to False.
+            lazy_tabs (bool, optional): only build and send the layout of the
+                first tab with the page, and build the layout of the other tabs
+                the first time they get selected (after which it is cached).
+                In this mode the download button exports the tabs with their
+                default settings. Defaults to False.
+            background_downloads ({bool, dict, DownloadJobs}, optional): render
+                downloads as background jobs with a progress bar in the header,
+                see DownloadJobs. Defaults to None.
         """
         super().__init__(explainer, title, name)
+        self.lazy_tabs = lazy_tabs
+        self.download_jobs = DownloadJobs.from_param(background_downloads)
+        self._tab_layouts = {}
+        self._tab_layouts_lock = Lock()
 
         if self.block_selector_callbacks:
             self.header_hide_selector = True
@@ -126,14 +167,38 @@ class ExplainerTabsLayout(ExplainerComponent):
 
         self.register_components(*self.tabs)
 
-        self.downloadable_tabs = [
-            tab for tab in self.tabs if tab.to_html(add_header=False) != "<div></div>"
-        ]
+        if self.lazy_tabs:
+            # rendering every tab to html would defeat the purpose of lazy tabs
+            self.downloadable_tabs = [
+                tab
+                for tab in self.tabs
+                if type(tab).to_html is not ExplainerComponent.to_html
+            ]
+        else:
+            self.downloadable_tabs = [
+                tab
+                for tab in self.tabs
+                if tab.to_html(add_header=False) != "<div></div>"
+            ]
         if not self.downloadable_tabs:
             self.header_hide_download = True
 
         self.connector = PosLabelConnector(self.selector, self.tabs)
 
+    def tab_layout(self, tab):
+        """returns the layout of tab, building it only once"""
+        with self._tab_layouts_lock:
+            if tab.name not in self._tab_layouts:
+                self._tab_layouts[tab.name] = tab.layout()
+            return self._tab_layouts[tab.name]
+
+    def _tab_children(self, tab, idx):
+        if not self.lazy_tabs:
+            return tab.layout()
+        return html.Div(
+            self.tab_layout(tab) if idx == 0 else None, id="lazy-tab-" + tab.name
+        )
+
     def layout(self):
         """returns a multitab layout plus ExplainerHeader"""
         return dbc.Container(
@@ -163,6 +228,7 @@ class ExplainerTabsLayout(ExplainerComponent):
                                     html.Div(
                                         [
                                             dcc.Download("download-page-" + self.name),
+                                            *self._download_jobs_layout(),
                                             dbc.DropdownMenu(
                                                 [
                                                     dbc.DropdownMenuItem(
@@ -211,11 +277,21 @@ class ExplainerTabsLayout(ExplainerComponent):
                             label=tab.title, # Assume que tab.title já está traduzido
                             id=tab.name,
                             value=tab.name,
-                            children=tab.layout(),
+                            children=self._tab_children(tab, i),
                         )
-                        for tab in self.tabs
+                        for i, tab in enumerate(self.tabs)
                     ],
                 ),
+                *(
+                    [
+                        dcc.Store(
+                            id="lazy-tabs-rendered-" + self.name,
+                            data=[self.tabs[0].name],
+                        )
+                    ]
+                    if self.lazy_tabs
+                    else []
+                ),
                 make_hideable(
                     html.Div(
                         [
@@ -241,10 +317,37 @@ class ExplainerTabsLayout(ExplainerComponent):
             fluid=self.fluid,
         )
 
+    def _download_jobs_layout(self):
+        if self.download_jobs is None:
+            return []
+        return self.download_jobs.layout(self.name)
+
     def to_html(self, state_dict=None, add_header=True):
+        return self.assemble_html(
+            [tab.to_html(state_dict, add_header=False) for tab in self.tabs],
+            add_header=add_header,
+        )
+
+    def _render_download(self, button_id, state_dict, progress):
+        """renders the html for download button_id tab by tab, reporting
+        the fraction of tabs done to progress"""
+        if button_id == "download-button-all" + self.name:
+            tab_htmls = []
+            for i, tab in enumerate(self.tabs):
+                tab_htmls.append(tab.to_html(state_dict, add_header=False))
+                progress((i + 1) / len(self.tabs))
+            return self.assemble_html(tab_htmls)
+        for tab in self.downloadable_tabs:
+            if button_id == "download-button-" + tab.name:
+                return tab.to_html(state_dict)
+        raise ValueError(f"Botão de download desconhecido: {button_id}")
+
+    def assemble_html(self, tab_htmls: List[str], add_header=True):
+        """Combines the static html of each tab (in the order of self.tabs,
+        e.g. rendered in parallel by ExplainerHub.to_zip()) into a single page"""
         html = to_html.title(self.title) # Assume self.title traduzido
         tabs = {
-            tab.title: tab.to_html(state_dict, add_header=False) for tab in self.tabs # Assume tab.title traduzido
+            tab.title: tab_html for tab, tab_html in zip(self.tabs, tab_htmls) # Assume tab.title traduzido
         }
         tabs = {tab: html for tab, html in tabs.items() if html != "<div></div>"}
         html += to_html.tabs(tabs)
@@ -267,7 +370,28 @@ class ExplainerTabsLayout(ExplainerComponent):
                     "Isto pode entrar em conflito com o seletor global de etiqueta pos e gerar erros de callback duplicados. " # Traduzido
                     "Se assim for, defina block_selector_callbacks=True." # Traduzido
                 )
-            self.connector.register_callbacks(app)
+            if self.lazy_tabs:
+                self._register_lazy_pos_label_callbacks(app)
+            else:
+                self.connector.register_callbacks(app)
+
+        if self.lazy_tabs:
+            self._register_lazy_tab_callbacks(app)
+
+        # the components of tabs that have not been rendered yet cannot be
+        # passed as State, so lazy tabs get exported with their defaults
+        state_tuples = [] if self.lazy_tabs else self.get_state_tuples()
+
+        if self.download_jobs is not None:
+            self.download_jobs.register_callback(
+                app,
+                self.name,
+                ["download-button-all" + self.name]
+                + ["download-button-" + tab.name for tab in self.downloadable_tabs],
+                state_tuples,
+                self._render_download,
+            )
+            return
 
         @app.callback(
             Output("download-page-" + self.name, "data"),
@@ -278,11 +402,11 @@ class ExplainerTabsLayout(ExplainerComponent):
                     for tab in self.downloadable_tabs
                 ],
             ],
-            [State(id_, prop_) for id_, prop_ in self.get_state_tuples()],
+            [State(id_, prop_) for id_, prop_ in state_tuples],
         )
         def download_html(*args):
             state_dict = dict(
-                zip(self.get_state_tuples(), args[1 + len(self.downloadable_tabs) :])
+                zip(state_tuples, args[1 + len(self.downloadable_tabs) :])
             )
 
             ctx = dash.callback_context
@@ -296,13 +420,59 @@ class ExplainerTabsLayout(ExplainerComponent):
                     )
             raise PreventUpdate
 
-    def calculate_dependencies(self):
-        """Calculates dependencies for all tabs"""
+    def _register_lazy_tab_callbacks(self, app):
+        """renders the layout of a tab the first time it gets selected"""
+
+        @app.callback(
+            [Output("lazy-tab-" + tab.name, "children") for tab in self.tabs]
+            + [Output("lazy-tabs-rendered-" + self.name, "data")],
+            Input("tabs", "value"),
+            State("lazy-tabs-rendered-" + self.name, "data"),
+        )
+        def render_lazy_tab(tab_name, rendered):
+            rendered = rendered or []
+            if tab_name in rendered:
+                raise PreventUpdate
+            return [
+                self.tab_layout(tab) if tab.name == tab_name else dash.no_update
+                for tab in self.tabs
+            ] + [rendered + [tab_name]]
+
+    def _register_lazy_pos_label_callbacks(self, app):
+        """with lazy tabs the pos label selectors of a tab only exist once the tab
+        has been rendered, so every tab gets its own connector that also syncs the
+        pos label when the tab gets rendered"""
         for tab in self.tabs:
-            try:
-                tab.calculate_dependencies()
-            except AttributeError:
+            pos_labels = PosLabelConnector(self.selector, tab).output_pos_label_names
+            if not pos_labels:
+                continue
+
+            @app.callback(
+                [Output(pos_label, "value") for pos_label in pos_labels],
+                Input("pos-label-" + self.selector.name, "value"),
+                Input("lazy-tabs-rendered-" + self.name, "data"),
+            )
+            def update_tab_pos_labels(
+                pos_label, rendered, tab_name=tab.name, n_outputs=len(pos_labels)
+            ):
+                if tab_name not in (rendered or []):
+                    raise PreventUpdate
+                return tuple(pos_label for _ in range(n_outputs))
+
+    def calculate_dependencies(self, n_jobs: int = None, raise_errors: bool = False):
+        """Calculates dependencies for all tabs at once, so that dependencies
+        shared between tabs only get calculated once and independent dependencies
+        get calculated in parallel. Returns a pd.DataFrame with the time it took
+        to calculate each dependency and the size of its result."""
+        dependencies = []
+        for tab in self.tabs:
+            if hasattr(tab, "dependencies"):
+                dependencies.extend(tab.dependencies)
+            else:
                 print(f"Aviso: {tab} não possui um método calculate_dependencies!") # Traduzido
+        return calculate_dependencies(
+            self.explainer, dependencies, n_jobs=n_jobs, raise_errors=raise_errors
+        )
 
 
 class ExplainerPageLayout(ExplainerComponent):
@@ -320,6 +490,7 @@ class ExplainerPageLayout(ExplainerComponent):
         block_selector_callbacks=False,
         pos_label=None,
         fluid=False,
+        background_downloads=None,
         **kwargs,
     ):
         """Generates a single page layout from a single ExplainerComponent.
@@ -347,9 +518,13 @@ class ExplainerPageLayout(ExplainerComponent):
             pos_label ({int, str}, optional): initial pos label.
                         Defaults to explainer.pos_label
             fluid (bool, optional): Stretch layout to fill space. Defaults to False.
+            background_downloads ({bool, dict, DownloadJobs}, optional): render
+                downloads as background jobs with a progress bar in the header,
+                see DownloadJobs. Defaults to None.
         """
         super().__init__(explainer, title, name)
         self.title = title
+        self.download_jobs = DownloadJobs.from_param(background_downloads)
 
         if self.block_selector_callbacks:
             self.header_hide_selector = True
@@ -402,6 +577,11 @@ class ExplainerPageLayout(ExplainerComponent):
                                                 color="link",
                                             ),
                                             dcc.Download("download-page-" + self.name),
+                                            *(
+                                                self.download_jobs.layout(self.name)
+                                                if self.download_jobs is not None
+                                                else []
+                                            ),
                                         ],
                                         style={
                                             "display": "flex",
@@ -450,8 +630,15 @@ class ExplainerPageLayout(ExplainerComponent):
         )
 
     def to_html(self, state_dict=None, add_header=True):
+        return self.assemble_html(
+            [self.page.to_html(state_dict, add_header=False)], add_header=add_header
+        )
+
+    def assemble_html(self, page_htmls: List[str], add_header=True):
+        """Turns the static html of the page (passed as a single item list, as
+        with ExplainerTabsLayout.assemble_html()) into the dashboard page"""
         html = to_html.title(self.title) # Assume self.title traduzido
-        html += self.page.to_html(state_dict, add_header=False)
+        html += page_htmls[0]
         if add_header:
             return to_html.add_header(html)
         return html
@@ -474,6 +661,16 @@ class ExplainerPageLayout(ExplainerComponent):
                 )
             self.connector.register_callbacks(app)
 
+        if self.download_jobs is not None:
+            self.download_jobs.register_callback(
+                app,
+                self.name,
+                ["download-page-button-" + self.name],
+                self.page.get_state_tuples(),
+                lambda button_id, state_dict, progress: self.to_html(state_dict),
+            )
+            return
+
         @app.callback(
             Output("download-page-" + self.name, "data"),
             [Input("download-page-button-" + self.name, "n_clicks")],
@@ -488,10 +685,12 @@ class ExplainerPageLayout(ExplainerComponent):
                 )
             raise PreventUpdate
 
-    def calculate_dependencies(self):
+    def calculate_dependencies(self, n_jobs: int = None, raise_errors: bool = False):
         """Calculate dependencies of page"""
         try:
-            self.page.calculate_dependencies()
+            return self.page.calculate_dependencies(
+                n_jobs=n_jobs, raise_errors=raise_errors
+            )
         except AttributeError:
             print(
                 f"Aviso: {self.page} não possui um método calculate_dependencies!", # Traduzido
@@ -535,6 +734,11 @@ class ExplainerDashboard:
         shap_dependence: bool = True,
         shap_interaction: bool = True,
         decision_trees: bool = True,
+        cache: Union[bool, int, dict] = None,
+        lazy_tabs: bool = False,
+        background_downloads: Union[bool, dict] = None,
+        background_callbacks: Union[bool, dict] = None,
+        metrics: Union[bool, dict] = None,
         **kwargs,
     ):
         """Creates an explainerdashboard out of an Explainer object.
@@ -623,11 +827,60 @@ class ExplainerDashboard:
             shap_dependence(bool, optional): include ShapDependenceTab, defaults to True.
             shap_interaction(bool, optional): include InteractionsTab if model allows it, defaults to True.
             decision_trees(bool, optional): include DecisionTreesTab if model allows it, defaults to True.
+            cache ({bool, int, dict}, optional): memoize the outputs of component
+                callbacks, so that identical inputs do not recompute the same figures.
+                Pass True for the defaults, an int for the maximum number of outputs
+                per component, or a dict with CallbackCache parameters, e.g.
+                dict(maxsize=64, ttl=600, components={"PdpComponent": dict(ttl=60)}).
+                Add backend="sqlite:///cache.db" (or any CacheBackend) to share the
+                outputs between all processes (e.g. gunicorn workers) serving the dashboard.
+                Hit rates are reported by dashboard.callback_cache_stats().
+                Defaults to None (no memoization).
+            lazy_tabs (bool, optional): only build and send the layout of the
+                first tab when the page loads, and build the other tabs the first
+                time they are selected. Cuts startup time and the size of the initial
+                page for dashboards with many tabs. Downloads then export the tabs
+                with their default settings. Defaults to False.
+            background_downloads ({bool, dict}, optional): render the html behind
+                the download button as a background job on a local thread pool,
+                with a progress bar in the header, instead of inside the callback
+                request. Finished exports are cached by dashboard state. Pass True
+                for the defaults or a dict with DownloadJobs parameters, e.g.
+                dict(max_workers=1, max_pending=4, ttl=600). Defaults to None.
+            background_callbacks ({bool, dict}, optional): run expensive callbacks
+                (partial dependence, interaction dependence, decision trees and
+                kernel shap what-if contributions) as Dash background callbacks in a
+                separate process managed by a local dash.DiskcacheManager, with
+                progress bars and cancellation when inputs change. Pass True for the
+                defaults or a dict with BackgroundCallbacks parameters, e.g.
+                dict(cache_dir="/tmp/dashboard_jobs", components={"PdpComponent": False}).
+                Requires pip install dash[diskcache]. Defaults to None.
+            metrics ({bool, dict}, optional): measure the latency and response
+                size of every callback request per component, and serve them
+                together with the callback cache hit rates and explainer memory
+                usage in Prometheus text format on a /metrics route. Pass True for
+                the defaults or a dict with CallbackMetrics parameters, e.g.
+                dict(route="/db_metrics", latency_buckets=[0.1, 1, 10]).
+                Defaults to None.
         """
         print("A construir o ExplainerDashboard...", flush=True) # Traduzido
 
         self._store_params(no_param=["explainer", "tabs", "server"])
         self._stored_params["tabs"] = self._tabs_to_yaml(tabs)
+        if isinstance(cache, CallbackCache):
+            self._stored_params["cache"] = cache.to_param()
+        elif isinstance(cache, dict) and isinstance(cache.get("backend"), CacheBackend):
+            self._stored_params["cache"] = dict(cache, backend=cache["backend"].url)
+        if isinstance(background_callbacks, BackgroundCallbacks):
+            self._stored_params["background_callbacks"] = (
+                background_callbacks.to_param()
+            )
+        if isinstance(background_downloads, DownloadJobs):
+            self._stored_params["background_downloads"] = (
+                background_downloads.to_param()
+            )
+        if isinstance(metrics, CallbackMetrics):
+            self._stored_params["metrics"] = metrics.to_param()
 
         if not hasattr(explainer, "__version__"):
             raise ValueError(
@@ -715,6 +968,8 @@ class ExplainerDashboard:
                     "Para logins como [['utilizador1', 'senha1']] utilizador1 e " # Traduzido
                     "senha1 devem ser do tipo str!" # Traduzido
                 )
+            import dash_auth
+
             self.auth = dash_auth.BasicAuth(self.app, self.logins)
         self.app.title = title # Assume title traduzido
 
@@ -790,6 +1045,8 @@ class ExplainerDashboard:
             self.header_hide_selector = True
             self.header_hide_download = True
 
+        self.download_jobs = DownloadJobs.from_param(background_downloads)
+
         print("A gerar layout...") # Traduzido
         _, i = yield_id(return_i=True)  # store id generator index
         reset_id_generator("db")  # reset id generator to 0 with prefix "db"
@@ -814,6 +1071,8 @@ class ExplainerDashboard:
                     block_selector_callbacks=self.block_selector_callbacks,
                     pos_label=self.pos_label,
                     fluid=fluid,
+                    lazy_tabs=lazy_tabs,
+                    background_downloads=self.download_jobs,
                 ),
             )
         else:
@@ -832,6 +1091,7 @@ class ExplainerDashboard:
                     block_selector_callbacks=self.block_selector_callbacks,
                     pos_label=self.pos_label,
                     fluid=self.fluid,
+                    background_downloads=self.download_jobs,
                 ),
             )
 
@@ -839,7 +1099,8 @@ class ExplainerDashboard:
         reset_id_generator(start=i + 1)  # reset id generator to previous index
 
         print("A calcular dependências...", flush=True) # Traduzido
-        self.explainer_layout.calculate_dependencies()
+        self.dependency_report = self.explainer_layout.calculate_dependencies()
+        self._print_dependency_report()
         print(
             "Lembrete: pode guardar o explainer (incluindo dependências calculadas) " # Traduzido
             "com explainer.dump('explainer.joblib') e " # Traduzido
@@ -847,7 +1108,70 @@ class ExplainerDashboard:
             flush=True,
         )
         print("A registar callbacks...", flush=True) # Traduzido
-        self.explainer_layout.register_callbacks(self.app)
+        app = self.app
+        self.background_callbacks = BackgroundCallbacks.from_param(background_callbacks)
+        self.callback_cache = CallbackCache.from_param(cache)
+        # only caches that are shared between processes need a key that
+        # identifies the model and data (hashing them takes a while):
+        if self.background_callbacks is not None or (
+            self.callback_cache is not None and self.callback_cache.backend is not None
+        ):
+            namespace = self._cache_namespace(explainer)
+        if self.background_callbacks is not None:
+            self.background_callbacks.namespace = namespace
+            app = self.background_callbacks.app(app)
+        if self.callback_cache is not None:
+            if self.callback_cache.backend is not None:
+                self.callback_cache.fingerprint = namespace
+            app = self.callback_cache.app(app)
+        self.callback_metrics = CallbackMetrics.from_param(metrics)
+        if self.callback_metrics is not None:
+            self.callback_metrics = self.callback_metrics.register_dashboard(self)
+            app = self.callback_metrics.app(
+                app, self.name or "dashboard", self.explainer_layout
+            )
+        self.explainer_layout.register_callbacks(app)
+
+    def _print_dependency_report(self):
+        """prints how long each dependency took to calculate and the size
+        of its result"""
+        report = getattr(self, "dependency_report", None)
+        if report is None or len(report) == 0:
+            return
+        print(
+            f"Dependências calculadas em {report.seconds.sum():.1f}s "
+            "(soma dos tempos, as dependências independentes correm em paralelo):",
+            flush=True,
+        )
+        for row in report.sort_values("seconds", ascending=False).itertuples():
+            print(
+                f"    {row.dependency}: {row.seconds:.2f}s, {row.result_size}",
+                flush=True,
+            )
+
+    def _cache_namespace(self, explainer) -> str:
+        """returns a key prefix for shared callback caches that is the same in
+        every process serving this dashboard, but differs between dashboards,
+        and changes when the model or the data of the explainer change"""
+        fingerprint = json.dumps(
+            [
+                self.name,
+                self.title,
+                explainer.__class__.__name__,
+                explainer._model_fingerprint(),
+                explainer._data_fingerprint(),
+            ],
+            default=str,
+        )
+        return hashlib.sha1(fingerprint.encode()).hexdigest()[:16]
+
+    def callback_cache_stats(self) -> dict:
+        """returns a dict with the hit rates and sizes of the memoized
+        callback outputs per component, or None if the dashboard was
+        not started with cache=..."""
+        if self.callback_cache is None:
+            return None
+        return self.callback_cache.stats()
 
     def to_html(self):
         """return static html output of dashboard"""
@@ -1198,7 +1522,7 @@ class ExplainerDashboard:
                 meta_tags=meta_tags,
             )
         elif self.mode in ["inline", "jupyterlab", "external"]:
-            app = JupyterDash(
+            app = _jupyter_dash()(
                 __name__,
                 external_stylesheets=self.external_stylesheets,
                 assets_ignore=assets_ignore,
@@ -1332,16 +1656,312 @@ class ExplainerDashboard:
             ValueError: if can't find the port to terminate.
         """
         if token is None:
-            token = JupyterDash._token
+            token = _jupyter_dash()._token
 
         shutdown_url = f"http://localhost:{port}/_shutdown_{token}"
         print(f"A tentar encerrar o painel na porta {port}...") # Traduzido
         try:
+            import requests
+
             response = requests.get(shutdown_url)
         except Exception as e:
             print(f"Algo parece ter falhado: {e}") # Traduzido
 
 
+class ExplainerRegistry:
+    """Keeps track of the explainers loaded by an ExplainerHub, keyed by the
+    sha256 hash of the content of their explainerfile, so that dashboards
+    configured on the same explainer artifact (even if stored under different
+    paths) share a single explainer instance (and its cached properties).
+
+    Explainers are only held by weak reference, so an explainer gets
+    dropped once no (loaded) dashboard references it anymore.
+    """
+
+    def __init__(self):
+        self._explainers = weakref.WeakValueDictionary()
+        self._file_hashes = {}
+        self._locks = {}
+        self._lock = Lock()
+
+    def file_hash(self, explainerfile: Union[str, Path]) -> str:
+        """sha256 hash of the content of explainerfile. Hashes are cached by
+        path, size and modification time so files only get read once.
+        If the file does not exist, returns the path instead."""
+        filepath = Path(explainerfile).resolve()
+        if not filepath.exists():
+            return str(filepath)
+        stat = filepath.stat()
+        file_key = (str(filepath), stat.st_size, stat.st_mtime_ns)
+        if file_key not in self._file_hashes:
+            sha256 = hashlib.sha256()
+            with open(filepath, "rb") as f:
+                for chunk in iter(lambda: f.read(2**20), b""):
+                    sha256.update(chunk)
+            self._file_hashes[file_key] = sha256.hexdigest()
+        return self._file_hashes[file_key]
+
+    def load(self, explainerfile: Union[str, Path]):
+        """Returns the explainer stored in explainerfile, or the already loaded
+        explainer with the same file content.
+
+        Args:
+            explainerfile (Union[str, Path]): .joblib, .pkl or .dill file
+
+        Returns:
+            Explainer
+        """
+        key = self.file_hash(explainerfile)
+        with self._lock:
+            key_lock = self._locks.setdefault(key, Lock())
+        with key_lock:
+            explainer = self._explainers.get(key)
+            if explainer is None:
+                explainer = BaseExplainer.from_file(explainerfile)
+                self._explainers[key] = explainer
+            else:
+                print(
+                    f"A reutilizar o explainer já carregado de {explainerfile}...",
+                    flush=True,
+                )
+            return explainer
+
+    def dashboard_from_config(self, config: Union[dict, str, Path], **update_params):
+        """ExplainerDashboard.from_config(config), but loading the
+        explainerfile of config through the registry.
+
+        Args:
+            config (Union[dict, str, Path]): dashboard .yaml file or config dict
+                that includes an explainerfile.
+            update_params: forwarded to ExplainerDashboard.from_config()
+
+        Returns:
+            ExplainerDashboard
+        """
+        if not isinstance(config, dict):
+            config = yaml.safe_load(open(str(config), "r"))
+        explainer = self.load(config["dashboard"]["explainerfile"])
+        return ExplainerDashboard.from_config(explainer, config, **update_params)
+
+    def key(self, explainer) -> str:
+        """Returns the file hash under which explainer was loaded, or None"""
+        for key, registered_explainer in list(self._explainers.items()):
+            if registered_explainer is explainer:
+                return key
+        return None
+
+    def update(self, registry: "ExplainerRegistry"):
+        """Add the explainers and file hashes of another registry"""
+        self._file_hashes.update(registry._file_hashes)
+        self._explainers.update(registry._explainers)
+
+    def __len__(self):
+        return len(self._explainers)
+
+
+class LazyDashboard:
+    """Stand-in for an ExplainerDashboard inside an ExplainerHub with
+    lazy_load=True. Only the dashboard .yaml config gets read up front (for the
+    name, title, description and logins), the explainer gets loaded and the
+    dash app built on first request by the hub, which can also unload it again.
+
+    to_yaml() writes the stored config without loading the explainer. Any
+    other attribute access gets forwarded to the (loaded) dashboard, so that
+    e.g. hub.to_html() keeps working.
+    """
+
+    def __init__(
+        self, config: Union[dict, str, Path], hub: "ExplainerHub" = None, **kwargs
+    ):
+        """
+        Args:
+            config (Union[dict, str, Path]): dashboard .yaml file or config dict
+                as generated by ExplainerDashboard.to_yaml(). Should contain
+                an explainerfile.
+            hub (ExplainerHub, optional): hub that loads and unloads the dashboard.
+            **kwargs: forwarded to ExplainerDashboard.from_config() when loading.
+        """
+        if isinstance(config, (Path, str)) and str(config).endswith(".yaml"):
+            config = yaml.safe_load(open(str(config), "r"))
+        elif isinstance(config, dict):
+            config = deepcopy(config)
+        else:
+            raise ValueError(
+                "Com lazy_load=True, os painéis devem ser passados como ficheiro "
+                f".yaml ou dict de configuração, mas foi recebido {type(config)}!"
+            )
+        assert (
+            "dashboard" in config and "explainerfile" in config["dashboard"]
+        ), "A configuração do painel deve conter 'dashboard' e 'explainerfile'!"
+
+        self.config = config
+        self.hub = hub
+        self.kwargs = kwargs
+        params = config["dashboard"]["params"]
+        self.name = params.get("name")
+        self.title = params.get("title", "Explicação do Modelo")
+        self.description = params.get("description")
+        self.logins = params.get("logins")
+        self.dashboard = None
+        self.error = None
+        self.last_access = 0.0
+        self.lock = Lock()
+
+    @property
+    def loaded(self):
+        return self.dashboard is not None
+
+    def load(self, **kwargs):
+        """Load the explainer and build the dashboard, if not loaded yet.
+
+        Args:
+            **kwargs: forwarded to ExplainerDashboard.from_config(), override
+                the kwargs passed to the constructor.
+
+        Returns:
+            ExplainerDashboard
+        """
+        with self.lock:
+            if self.dashboard is None:
+                config = deepcopy(self.config)
+                config["dashboard"]["params"]["logins"] = None
+                try:
+                    registry = (
+                        self.hub.explainer_registry
+                        if self.hub is not None
+                        else ExplainerRegistry()
+                    )
+                    self.dashboard = registry.dashboard_from_config(
+                        config, **update_kwargs(self.kwargs, name=self.name, **kwargs)
+                    )
+                    self.error = None
+                except Exception as e:
+                    self.error = e
+                    raise
+            return self.dashboard
+
+    def unload(self):
+        """Drop the reference to the dashboard and explainer, so that it can be
+        garbage collected."""
+        with self.lock:
+            self.dashboard = None
+
+    def to_yaml(
+        self,
+        filepath: Union[str, Path] = None,
+        return_dict: bool = False,
+        explainerfile: str = "explainer.joblib",
+        dump_explainer: bool = False,
+        explainerfile_absolute_path: Union[str, Path, bool] = None,
+    ):
+        """Same as ExplainerDashboard.to_yaml(), but writes the stored config
+        (with the kwargs passed to the constructor) instead of loading the
+        dashboard. The explainerfile of the config only
+        gets replaced when dumping the explainer, which copies the original
+        explainerfile when it has the same file format.
+
+        Args:
+            filepath ({str, Path}, optional): Filepath to dump yaml. If None
+                returns the yaml as a string. Defaults to None.
+            return_dict (bool, optional): instead of yaml return dict with
+                config.
+            explainerfile (str, optional): filename of explainer dump. Defaults
+                to `explainer.joblib`.
+            dump_explainer (bool, optional): dump the explainer along with the yaml.
+                Defaults to False.
+            explainerfile_absolute_path (str, Path, bool, optional): absolute path to
+                save explainerfile if not in the same directory as the yaml file.
+        """
+        config = deepcopy(self.config)
+        params = config["dashboard"]["params"]
+        for k, v in update_kwargs(self.kwargs, name=self.name).items():
+            if k in params:
+                params[k] = v
+            else:
+                params.setdefault("kwargs", {})[k] = v
+
+        if return_dict:
+            return config
+
+        if filepath is None:
+            return yaml.dump(config)
+
+        dashboard_path = Path(filepath).absolute().parent
+        dashboard_path.mkdir(parents=True, exist_ok=True)
+        if dump_explainer:
+            if explainerfile_absolute_path:
+                if isinstance(explainerfile_absolute_path, bool):
+                    explainerfile_absolute_path = dashboard_path / explainerfile
+                config["dashboard"]["explainerfile"] = str(
+                    Path(explainerfile_absolute_path).absolute()
+                )
+            else:
+                explainerfile_absolute_path = dashboard_path / explainerfile
+                config["dashboard"]["explainerfile"] = str(explainerfile)
+
+        print(
+            f"A guardar configuração .yaml para {Path(filepath).absolute()}...",
+            flush=True,
+        )
+        yaml.dump(config, open(filepath, "w"))
+
+        if dump_explainer:
+            print(
+                f"A guardar explainer para {explainerfile_absolute_path}...", flush=True
+            )
+            source = Path(self.config["dashboard"]["explainerfile"])
+            target = Path(explainerfile_absolute_path)
+            if self.dashboard is not None:
+                self.dashboard.explainer.dump(target)
+            elif source.suffix == target.suffix:
+                if source.absolute() != target.absolute():
+                    shutil.copyfile(source, target)
+            else:
+                registry = (
+                    self.hub.explainer_registry
+                    if self.hub is not None
+                    else ExplainerRegistry()
+                )
+                registry.load(source).dump(target)
+
+    def __getattr__(self, attr):
+        if attr.startswith("_") or attr in ("config", "hub", "kwargs", "dashboard"):
+            raise AttributeError(attr)
+        if self.hub is not None:
+            return getattr(self.hub.get_dashboard(self.name), attr)
+        return getattr(self.load(), attr)
+
+    def __repr__(self):
+        return f"LazyDashboard(name={self.name!r}, loaded={self.loaded})"
+
+
+# explainers loaded by the worker processes of ExplainerHub.to_zip(n_jobs=...),
+# so that every worker only loads each explainerfile once
+_static_html_explainers = {}
+
+
+def _render_static_html(
+    explainerfile: str,
+    component: dict = None,
+    config: dict = None,
+    update_params: dict = None,
+) -> str:
+    """Renders a single dashboard component (a tab converted with
+    ExplainerDashboard._tabs_to_yaml()) or an entire dashboard config to
+    static html, with update_params forwarded to ExplainerDashboard.from_config()
+    (e.g. the kwargs of a LazyDashboard). Gets called in the worker processes
+    of ExplainerHub.to_zip() and ExplainerHub.save_html() with n_jobs > 1."""
+    if explainerfile not in _static_html_explainers:
+        _static_html_explainers[explainerfile] = BaseExplainer.from_file(explainerfile)
+    explainer = _static_html_explainers[explainerfile]
+    if component is not None:
+        tab = ExplainerDashboard._yamltabs_to_tabs([component], explainer)[0]
+        return tab.to_html(add_header=False)
+    return ExplainerDashboard.from_config(
+        explainer, config, **(update_params or {})
+    ).to_html()
+
+
 class ExplainerHub:
     """ExplainerHub is a way to host multiple dashboards in a single point,
     and manage access through adding user accounts.
@@ -1393,6 +2013,10 @@ class ExplainerHub:
         max_dashboards: int = None,
         add_dashboard_route: bool = False,
         add_dashboard_pattern: str = None,
+        lazy_load: bool = False,
+        max_loaded_dashboards: int = None,
+        max_loaded_memory: int = None,
+        metrics: Union[bool, dict] = None,
         **kwargs,
     ):
         """
@@ -1409,7 +2033,8 @@ class ExplainerHub:
 
         Args:
             dashboards (List[ExplainerDashboard]): list of ExplainerDashboard to
-                include in ExplainerHub.
+                include in ExplainerHub. With lazy_load=True a list of dashboard
+                .yaml files (or config dicts) instead.
             title (str, optional): title to display. Defaults to "Hub de Explainers". # Atualizado docstring
             description (str, optional): Short description of ExplainerHub.
                 Defaults to default text.
@@ -1469,6 +2094,25 @@ class ExplainerHub:
                 called dashboard.yaml, you could set this to "dashboards/{}/dashboard.yaml",
                 and then navigate to /add_dashboard/dashboard5 to add
                 dashboards/dashboard5/dashboard.yaml.
+            lazy_load (bool, optional): Do not load all explainers and build all
+                dashboards on startup, but only when a dashboard is first
+                requested (showing a loading page in the meantime). dashboards
+                should then be a list of dashboard .yaml files (or config dicts)
+                that include an explainerfile. Defaults to False.
+            max_loaded_dashboards (int, optional): with lazy_load, the maximum
+                number of dashboards to keep loaded. When exceeded, the least
+                recently accessed dashboard gets unloaded. Defaults to None.
+            max_loaded_memory (int, optional): with lazy_load, the maximum
+                (approximate) number of bytes used by the loaded explainers:
+                their data and calculated properties, plus the pickled size of
+                their model, shap explainer and other objects. When exceeded,
+                least recently accessed dashboards get unloaded. Defaults to None.
+            metrics ({bool, dict}, optional): serve the callback latencies and
+                response sizes, cache hit rates and explainer memory usage of all
+                dashboards in Prometheus text format on a /metrics route of the
+                hub (see CallbackMetrics). Pass True for the defaults or a dict with
+                CallbackMetrics parameters. Overrides the metrics parameter of
+                the dashboards. Defaults to None.
             **kwargs: all kwargs will be forwarded to the constructors of
                 each dashboard in dashboards dashboards.
         """
@@ -1506,6 +2150,13 @@ class ExplainerHub:
         if secret_key is not None:
             self.app.config["SECRET_KEY"] = secret_key
         SimpleLogin(self.app, login_checker=self._validate_user)
+        self._unload_lock = Lock()
+        self.explainer_registry = ExplainerRegistry()
+        if isinstance(metrics, CallbackMetrics):
+            self._stored_params["metrics"] = metrics.to_param()
+        self.callback_metrics = CallbackMetrics.from_param(metrics)
+        if self.callback_metrics is not None:
+            self.callback_metrics = self.callback_metrics.register_server(self.app)
 
         assert (
             self.max_dashboards is None or len(dashboards) <= self.max_dashboards
@@ -1532,7 +2183,7 @@ class ExplainerHub:
             not illegal_names
         ), f"As seguintes propriedades .name para painéis não são permitidas: {illegal_names}!" # Traduzido
 
-        if self.users:
+        if self.users and not self.lazy_load:
             for dashboard in self.dashboards:
                 if (
                     not self.dbs_open_by_default
@@ -1553,6 +2204,8 @@ class ExplainerHub:
             if self.users and not self.dbs_open_by_default:
                 self._protect_dashviews(self.index_page)
             self._add_flask_routes(self.app)
+        if self.lazy_load:
+            self._add_lazy_dashboard_routes(self.app)
 
     def remove_dashboard(self, dashboard_name):
         """Remove a dashboard from the hub"""
@@ -1564,6 +2217,8 @@ class ExplainerHub:
 
         index_dashboard = self.dashboard_names.index(dashboard_name)
 
+        if isinstance(self.dashboards[index_dashboard], LazyDashboard):
+            self.dashboards[index_dashboard].unload()
         del self.dashboards[index_dashboard]
         del self.dashboard_names[index_dashboard]
         self.removed_dashboard_names.append(dashboard_name)
@@ -1578,9 +2233,15 @@ class ExplainerHub:
         """Add a dashboard to the hub
 
         Args:
-            dashboard (ExplainerDashboard): an ExplainerDashboard to add to the hub
+            dashboard (ExplainerDashboard): an ExplainerDashboard to add to the hub.
+                With lazy_load=True a dashboard .yaml file or config dict instead.
             **kwargs: all kwargs will be forwarded to the constructors of the dashboard
         """
+        if self.lazy_load:
+            dashboard = LazyDashboard(
+                dashboard, hub=self, **update_kwargs(self.kwargs, **kwargs)
+            )
+
         # Remove first dashboard if the max_dashboard is reached
         if (
             self.max_dashboards is not None
@@ -1621,6 +2282,7 @@ class ExplainerHub:
             name=dashboard.name,
             url_base_pathname=f"/{self.base_route}/{dashboard.name}/",
             mode="dash",
+            metrics=self.callback_metrics,
         )
         if dashboard.logins is not None:
             for user, password in dashboard.logins:
@@ -1632,6 +2294,14 @@ class ExplainerHub:
                         "ExplainerHub! Não será adicionado aos logins..." # Traduzido
                     )
                 self.add_user_to_dashboard(dashboard.name, user)
+
+        if self.lazy_load:
+            self.dashboards.append(dashboard)
+            self.dashboard_names.append(dashboard.name)
+            if not self.no_index:
+                self.index_page = self._get_index_page()
+            return dashboard.name
+
         config = deepcopy(dashboard.to_yaml(return_dict=True))
         config["dashboard"]["params"]["logins"] = None
 
@@ -1672,6 +2342,140 @@ class ExplainerHub:
             )
         return dashboard.name
 
+    def get_dashboard(self, dashboard_name: str):
+        """Returns the dashboard with name dashboard_name.
+
+        With lazy_load=True the explainer gets loaded and the dashboard built
+        when needed, after which the least recently accessed dashboards get
+        unloaded if max_loaded_dashboards or max_loaded_memory is exceeded.
+
+        Args:
+            dashboard_name (str): name of the dashboard
+
+        Returns:
+            ExplainerDashboard
+        """
+        if dashboard_name not in self.dashboard_names:
+            raise ValueError(f"{dashboard_name} não é um nome de painel existente!")
+        dashboard = self.dashboards[self.dashboard_names.index(dashboard_name)]
+        if not isinstance(dashboard, LazyDashboard):
+            return dashboard
+
+        dashboard.last_access = time.monotonic()
+        if dashboard.loaded:
+            return dashboard.dashboard
+        print(f"A carregar o painel {dashboard_name}...", flush=True)
+        loaded_dashboard = dashboard.load(
+            server=True,
+            url_base_pathname=f"/{self.base_route}/{dashboard_name}/",
+            mode="dash",
+            metrics=self.callback_metrics,
+        )
+        self.unload_dashboards(keep=dashboard_name)
+        return loaded_dashboard
+
+    @property
+    def loaded_dashboards(self):
+        """names of the dashboards that are currently loaded, from least to
+        most recently accessed"""
+        return [
+            db.name
+            for db in sorted(
+                self.dashboards,
+                key=lambda db: (
+                    getattr(db, "last_access", float("inf"))
+                    if isinstance(db, LazyDashboard)
+                    else float("inf")
+                ),
+            )
+            if not isinstance(db, LazyDashboard) or db.loaded
+        ]
+
+    def memory_report(self):
+        """Returns a pd.DataFrame with the (approximate) memory usage of each
+        loaded explainer, the hash of the explainerfile it was loaded from
+        (if loaded from file) and the names of the dashboards that use it.
+        """
+        explainers, dashboard_names = {}, {}
+        for db in self.dashboards:
+            dashboard = db.dashboard if isinstance(db, LazyDashboard) else db
+            if dashboard is None:
+                continue
+            explainers[id(dashboard.explainer)] = dashboard.explainer
+            dashboard_names.setdefault(id(dashboard.explainer), []).append(db.name)
+
+        memory_df = pd.DataFrame(
+            [
+                dict(
+                    explainer=explainer.__class__.__name__,
+                    file_hash=self.explainer_registry.key(explainer),
+                    dashboards=dashboard_names[id_],
+                    bytes=explainer_memory_usage(explainer),
+                )
+                for id_, explainer in explainers.items()
+            ],
+            columns=["explainer", "file_hash", "dashboards", "bytes"],
+        )
+        memory_df["size"] = memory_df.bytes.apply(size_to_string)
+        print(
+            "Uso total de memória dos explainers carregados (aproximado): ",
+            size_to_string(memory_df.bytes.sum()),
+            flush=True,
+        )
+        return memory_df.sort_values("bytes", ascending=False).reset_index(drop=True)
+
+    def unload_dashboards(self, keep: str = None):
+        """Unload the least recently accessed dashboards until no more than
+        max_loaded_dashboards are loaded and the loaded explainers take up no
+        more than max_loaded_memory bytes. Only applies with lazy_load=True.
+
+        Args:
+            keep (str, optional): name of a dashboard that should not be
+                unloaded (e.g. because it was just requested).
+
+        Returns:
+            List[str]: names of the unloaded dashboards
+        """
+        with self._unload_lock:
+            explainers = {
+                db.name: db.dashboard.explainer
+                for db in self.dashboards
+                if isinstance(db, LazyDashboard) and db.loaded
+            }
+            dashboards = [db for db in self.dashboards if db.name in explainers]
+            # dashboards can share an explainer, which only gets freed once
+            # all of them are unloaded, so count each explainer only once
+            memory = (
+                {id(e): explainer_memory_usage(e) for e in explainers.values()}
+                if self.max_loaded_memory is not None
+                else {}
+            )
+
+            def loaded_memory():
+                return sum(memory[id_] for id_ in {id(e) for e in explainers.values()})
+
+            unloaded = []
+            for db in sorted(dashboards, key=lambda db: db.last_access):
+                too_many = (
+                    self.max_loaded_dashboards is not None
+                    and len(explainers) > self.max_loaded_dashboards
+                )
+                too_large = (
+                    self.max_loaded_memory is not None
+                    and loaded_memory() > self.max_loaded_memory
+                )
+                if not (too_many or too_large):
+                    break
+                if db.name == keep:
+                    continue
+                db.unload()
+                del explainers[db.name]
+                unloaded.append(db.name)
+        if unloaded:
+            gc.collect()
+            print(f"A descarregar os painéis {unloaded}...", flush=True)
+        return unloaded
+
     @classmethod
     def from_config(cls, config: Union[dict, str, Path], **update_params):
         """Instantiate an ExplainerHub based on a config file.
@@ -1684,6 +2488,7 @@ class ExplainerHub:
         Returns:
             ExplainerHub: new instance of ExplainerHub according to the config.
         """
+        filepath = None
         if isinstance(config, (Path, str)) and str(config).endswith(".yaml"):
             filepath = Path(config).parent
             config = yaml.safe_load(open(str(Path(config)), "r"))
@@ -1705,13 +2510,18 @@ class ExplainerHub:
                 filepath = Path(filepath or Path.cwd())
                 return filepath / db
 
-        dashboards = [
-            ExplainerDashboard.from_config(convert_db(db, filepath))
-            for db in config["dashboards"]
-        ]
+        dashboards = [convert_db(db, filepath) for db in config["dashboards"]]
         del config["dashboards"]
         config.update(config.pop("kwargs"))
-        return cls(dashboards, **update_kwargs(config, **update_params))
+        config = update_kwargs(config, **update_params)
+        # dashboards configured on the same explainerfile share the explainer
+        registry = ExplainerRegistry()
+        if not config.get("lazy_load", False):
+            # with lazy_load the hub only loads dashboards when requested
+            dashboards = [registry.dashboard_from_config(db) for db in dashboards]
+        hub = cls(dashboards, **config)
+        hub.explainer_registry.update(registry)
+        return hub
 
     def to_yaml(
         self,
@@ -1852,6 +2662,8 @@ class ExplainerHub:
         """Instantiate a list of dashboards and copy to logins to the ExplainerHub self.logins."""
         dashboard_list = []
         for i, dashboard in enumerate(dashboards):
+            if self.lazy_load:
+                dashboard = LazyDashboard(dashboard, hub=self, **kwargs)
             if dashboard.name is None:
                 print(
                     "Lembrete, pode definir .name e .description do ExplainerDashboard " # Traduzido
@@ -1871,6 +2683,7 @@ class ExplainerHub:
                 name=dashboard_name,
                 url_base_pathname=f"/{self.base_route}/{dashboard_name}/",
                 mode="dash",
+                metrics=self.callback_metrics,
             )
             if dashboard.logins is not None:
                 for user, password in dashboard.logins:
@@ -1882,6 +2695,10 @@ class ExplainerHub:
                             "ExplainerHub! Não será adicionado aos logins..." # Traduzido
                         )
                     self.add_user_to_dashboard(dashboard_name, user)
+            if self.lazy_load:
+                dashboard.name = dashboard_name
+                dashboard_list.append(dashboard)
+                continue
             config = deepcopy(dashboard.to_yaml(return_dict=True))
             config["dashboard"]["params"]["logins"] = None
 
@@ -2399,7 +3216,10 @@ class ExplainerHub:
         return self._hub_page(html, static=True)
 
     def save_html(
-        self, filename: Union[str, Path] = None, save_dashboards: bool = True
+        self,
+        filename: Union[str, Path] = None,
+        save_dashboards: bool = True,
+        n_jobs: int = None,
     ):
         """Store output of to_html to a file
 
@@ -2407,6 +3227,8 @@ class ExplainerHub:
             filename (str, Path): filename to store html
             save_dashboard (bool): save dashboards the make up the hub into
                 individual static html files.
+            n_jobs (int, optional): number of processes to render the dashboards
+                with (-1 for all cores). Defaults to None (render sequentially).
         """
         html = self.to_html()
         if filename is None:
@@ -2415,24 +3237,134 @@ class ExplainerHub:
             print(f"A guardar hub para {filename}...") # Traduzido
             f.write(html)
         if save_dashboards:
+            for db_name, db_html in self.static_html_pages(n_jobs):
+                print(f"A guardar painel {db_name} para {db_name}.html...") # Traduzido
+                with open(db_name + ".html", "w") as f:
+                    f.write(db_html)
+
+    def static_html_pages(self, n_jobs: int = None):
+        """Generator that yields (dashboard name, static html) for every dashboard
+        in the hub.
+
+        With n_jobs > 1 (or -1 for all cores) the dashboards get rendered on a
+        pool of worker processes, with a separate task for every tab, and pages
+        get yielded as soon as all of their tabs are done. Dashboards that
+        cannot be rendered by a worker get rendered in this process instead.
+
+        Args:
+            n_jobs (int, optional): number of worker processes. Defaults to None
+                (render sequentially in this process).
+        """
+        if n_jobs is not None and n_jobs < 0:
+            n_jobs = os.cpu_count()
+        if n_jobs is None or n_jobs <= 1:
             for db in self.dashboards:
-                print(f"A guardar painel {db.name} para {db.name}.html...") # Traduzido
-                db.save_html(db.name + ".html")
+                yield db.name, db.to_html()
+            return
+
+        with tempfile.TemporaryDirectory() as tmpdir, ProcessPoolExecutor(
+            n_jobs
+        ) as pool:
+            futures, htmls, explainerfiles, in_process = {}, {}, {}, []
+            for db in self.dashboards:
+                dashboard = db.dashboard if isinstance(db, LazyDashboard) else db
+                if dashboard is None:
+                    # not loaded, so let a worker load it from its explainerfile
+                    config = deepcopy(db.config)
+                    config["dashboard"]["params"]["logins"] = None
+                    future = pool.submit(
+                        _render_static_html,
+                        config["dashboard"]["explainerfile"],
+                        config=config,
+                        # the same params as LazyDashboard.load():
+                        update_params=update_kwargs(db.kwargs, name=db.name),
+                    )
+                    futures[future] = (db, None, 1)
+                    htmls[db.name] = {}
+                    continue
+
+                explainer, layout = dashboard.explainer, dashboard.explainer_layout
+                components = (
+                    layout.tabs
+                    if isinstance(layout, ExplainerTabsLayout)
+                    else [layout.page]
+                )
+                try:
+                    # dashboards that share an explainer share the dumped file
+                    if id(explainer) not in explainerfiles:
+                        explainerfile = Path(tmpdir) / (
+                            f"explainer{len(explainerfiles)}."
+                            + ("dill" if explainer.shap == "kernel" else "joblib")
+                        )
+                        explainer.dump(explainerfile)
+                        explainerfiles[id(explainer)] = str(explainerfile)
+                    yaml_components = [
+                        ExplainerDashboard._tabs_to_yaml(component)
+                        for component in components
+                    ]
+                except Exception:
+                    in_process.append(db)
+                    continue
+                htmls[db.name] = {}
+                for i, component in enumerate(yaml_components):
+                    future = pool.submit(
+                        _render_static_html,
+                        explainerfiles[id(explainer)],
+                        component=component,
+                    )
+                    futures[future] = (db, i, len(components))
+
+            for future in as_completed(futures):
+                db, i, n_components = futures[future]
+                if db.name not in htmls:
+                    continue  # rendered in this process after an earlier failure
+                try:
+                    htmls[db.name][i] = future.result()
+                except Exception as e:
+                    print(
+                        f"Aviso: falha ao gerar {db.name} num processo separado "
+                        f"({e}), a gerar neste processo...",
+                        flush=True,
+                    )
+                    del htmls[db.name]
+                    yield db.name, db.to_html()
+                    continue
+                if len(htmls[db.name]) == n_components:
+                    db_htmls = htmls.pop(db.name)
+                    if i is None:
+                        yield db.name, db_htmls[None]
+                    else:
+                        layout = self.get_dashboard(db.name).explainer_layout
+                        yield db.name, layout.assemble_html(
+                            [db_htmls[i] for i in range(n_components)]
+                        )
+            for db in in_process:
+                yield db.name, db.to_html()
 
-    def to_zip(self, filename: Union[str, Path], name: str = "explainerhub"):
+    def to_zip(
+        self, filename: Union[str, Path], name: str = "explainerhub", n_jobs: int = None
+    ):
         """Store static version of ExplainerHub to a zipfile along with static
-        versions of all underlying dashboards.
+        versions of all underlying dashboards. Pages get written to the zipfile
+        as soon as they are rendered, and share a single plotly.min.js file.
 
         Args:
             filename (Union[str, Path], optional): filename of zip file, eg. "hub.zip".
             name (str): name for the directory inside the zipfile
+            n_jobs (int, optional): number of processes to render the dashboards
+                with (-1 for all cores). Defaults to None (render sequentially).
         """
         import zipfile
+        from plotly.offline import get_plotlyjs
 
         zf = zipfile.ZipFile(Path(filename), "w")
+        zf.writestr(f"/{name}/plotly.min.js", get_plotlyjs())
         zf.writestr(f"/{name}/index.html", self.to_html())
-        for db in self.dashboards:
-            zf.writestr(f"/{name}/" + db.name + ".html", db.to_html())
+        for db_name, db_html in self.static_html_pages(n_jobs):
+            zf.writestr(
+                f"/{name}/" + db_name + ".html",
+                to_html.share_plotlyjs(db_html, src="plotly.min.js"),
+            )
         zf.close()
         print(f"Guardada versão html estática do ExplainerHub em {filename}...") # Traduzido
 
@@ -2577,7 +3509,12 @@ class ExplainerHub:
                             dashboard_path.endswith(".yaml")
                             and Path(dashboard_path).exists()
                         ):
-                            db = ExplainerDashboard.from_config(dashboard_path)
+                            if self.lazy_load:
+                                db = dashboard_path
+                            else:
+                                db = self.explainer_registry.dashboard_from_config(
+                                    dashboard_path
+                                )
                             dashboard_name = self.add_dashboard(
                                 db,
                                 bootstrap=f"{self.app.static_url_path}/bootstrap.min.css",
@@ -2597,6 +3534,81 @@ class ExplainerHub:
                         print("ERRO: Falha ao remover painel!", flush=True) # Traduzido
                     return redirect(f"/", code=302)
 
+    def _loading_page(self, dashboard: LazyDashboard, error: Exception = None):
+        """html page to show while a dashboard is being loaded, which refreshes
+        itself every two seconds, or an error message if loading failed."""
+        if error is None:
+            refresh = '<meta http-equiv="refresh" content="2">'
+            message = f"A carregar o painel {escape(dashboard.title)}..."
+        else:
+            refresh = ""
+            message = (
+                f"Falha ao carregar o painel {escape(dashboard.title)}: "
+                f"{escape(repr(error))}"
+            )
+        return f"""
+        <html>
+        <head>{refresh}<title>{escape(dashboard.title)}</title></head>
+        <body>
+            <div style="margin-top: 100px; text-align: center; font-family: sans-serif">
+                <h3>{message}</h3>
+            </div>
+        </body>
+        </html>
+        """
+
+    def _add_lazy_dashboard_routes(self, app):
+        """With lazy_load=True the dashboards do not get mounted on the hub's
+        flask server, as flask does not allow adding routes once the server
+        has started. Instead each dashboard gets its own flask server, and
+        requests to /<base_route>/<dashboard_name>/... get forwarded to
+        it by a single route, which checks the logins and loads the dashboard
+        when needed.
+
+        Args:
+            app (flask.Flask): flask app to add routes to.
+        """
+
+        def dashboard_view(dashboard_name, path=""):
+            if dashboard_name not in self.dashboard_names:
+                abort(404)
+            dashboard = self.dashboards[self.dashboard_names.index(dashboard_name)]
+            if not dashboard.loaded and path == "":
+                # Loading an explainer can take a while, so do it in the
+                # background and show a self-refreshing loading page meanwhile
+                if dashboard.error is not None:
+                    error, dashboard.error = dashboard.error, None
+                    return self._loading_page(dashboard, error), 500
+                if not dashboard.lock.locked():
+                    Thread(
+                        target=self.get_dashboard, args=(dashboard_name,), daemon=True
+                    ).start()
+                return self._loading_page(dashboard)
+            # a flask view can return a wsgi app, which then handles the request
+            return self.get_dashboard(dashboard_name).app.server.wsgi_app
+
+        def lazy_dashboard(dashboard_name, path=""):
+            if self.users and (
+                not self.dbs_open_by_default
+                or dashboard_name in self.dashboards_with_users
+            ):
+                return login_required(
+                    username=self.get_dashboard_users(dashboard_name)
+                )(dashboard_view)(dashboard_name, path)
+            return dashboard_view(dashboard_name, path)
+
+        app.add_url_rule(
+            f"/{self.base_route}/<dashboard_name>/",
+            view_func=lazy_dashboard,
+            methods=["GET", "POST"],
+        )
+        app.add_url_rule(
+            f"/{self.base_route}/<dashboard_name>/<path:path>",
+            endpoint="lazy_dashboard_path",
+            view_func=lazy_dashboard,
+            methods=["GET", "POST"],
+        )
+
     def flask_server(self):
         """return the Flask server inside the class instance"""
         return self.app
@@ -2687,11 +3699,13 @@ class InlineExplainer:
         if port is None:
             port = self._port
         if token is None:
-            token = JupyterDash._token
+            token = _jupyter_dash()._token
 
         shutdown_url = f"http://localhost:{port}/_shutdown_{token}"
         print(f"A tentar encerrar o painel na porta {port}...") # Traduzido
         try:
+            import requests
+
             response = requests.get(shutdown_url)
         except Exception as e:
             print(f"Algo parece ter falhado: {e}") # Traduzido
@@ -2715,7 +3729,7 @@ class InlineExplainer:
             )
 
     def _run_component(self, component, title):
-        app = JupyterDash(__name__)
+        app = _jupyter_dash()(__name__)
         app.title = title # Assume title traduzido
         app.layout = component.layout()
         component.register_callbacks(app)
@@ -11,11 +11,25 @@ __all__ = [
 import numpy as np
 import pandas as pd
 from pathlib import Path
+from functools import lru_cache
 
 train_csv = Path(__file__).resolve().parent / "datasets" / "titanic_train.csv"
 test_csv = Path(__file__).resolve().parent / "datasets" / "titanic_test.csv"
-d_train = pd.read_csv(train_csv)
-d_test = pd.read_csv(test_csv)
+
+
+@lru_cache(maxsize=None)
+def _load_titanic():
+    """reads the titanic csv files the first time a dataset is requested,
+    instead of at import time"""
+    return pd.read_csv(train_csv), pd.read_csv(test_csv)
+
+
+def __getattr__(name):
+    # d_train and d_test used to be module attributes read at import time
+    if name in ("d_train", "d_test"):
+        return _load_titanic()[name == "d_test"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 feature_descriptions = {
     "Sex": "Gender of passenger",
@@ -31,6 +45,7 @@ feature_descriptions = {
 
 
 def titanic_survive():
+    d_train, d_test = _load_titanic()
     X_train = d_train.drop(["Survival", "Name"], axis=1)
     X_train.index = d_train.Name
     X_train.index.name = "Passenger"
@@ -43,6 +58,7 @@ def titanic_survive():
 
 
 def titanic_fare():
+    d_train, d_test = _load_titanic()
     X_train = d_train.drop(["Fare", "Name"], axis=1)
     X_train.index = d_train.Name
     X_train.index.name = "Passenger"
@@ -55,6 +71,7 @@ def titanic_fare():
 
 
 def titanic_embarked():
+    d_train, d_test = _load_titanic()
     d_train2 = d_train.copy()
     d_train2 = d_train2[d_train2.Embarked_Unknown == 0]
     X_train = d_train2.drop(
@@ -110,6 +127,7 @@ def titanic_embarked():
 
 
 def titanic_names(train_only=False, test_only=False):
+    d_train, d_test = _load_titanic()
     if train_only:
         return d_train["Name"].values.tolist()
     if test_only:
@@ -21,6 +21,13 @@ __all__ = [
     "permutation_importances",
     "cv_permutation_importances",
     "get_mean_absolute_shap_df",
+    "get_mean_abs_shap_interactions",
+    "model_accepts_arrays",
+    "KernelModelPredict",
+    "copy_kernel_explainer",
+    "kernel_shap_values",
+    "linear_shap_supported",
+    "LinearShapExplainer",
     "get_grid_points",
     "get_pdp_df",
     "get_precision_df",
@@ -34,12 +41,38 @@ __all__ = [
     "get_xgboost_path_df",
     "get_xgboost_path_summary_df",
     "get_xgboost_preds_df",
+    "LRUCache",
+    "get_row_hash",
+    "ShapRowBatcher",
+    "IndexSearch",
+    "SortedRangeIndex",
+    "random_row_in_ranges",
+    "stratified_sample_order",
+    "get_iqr_bounds",
+    "get_pickled_size",
+    "get_object_size",
+    "explainer_memory_usage",
+    "size_to_string",
+    "report_progress",
+    "progress_reporting",
+    "add_timing_callback",
+    "remove_timing_callback",
+    "timed_computation",
 ]
 
 from functools import partial
 import re
-from collections import Counter
+import sys
+import time
+import pickle
+import weakref
+import logging
+import hashlib
+from threading import Lock, Event
+from collections import Counter, OrderedDict
 from typing import List, Union
+from contextlib import contextmanager
+from contextvars import ContextVar
 import warnings
 
 import numpy as np
@@ -52,7 +85,7 @@ from sklearn.base import clone
 from sklearn.pipeline import Pipeline
 from sklearn.model_selection import KFold, StratifiedKFold
 
-from joblib import Parallel, delayed
+from joblib import Parallel, delayed, effective_n_jobs
 
 
 def append_dict_to_df(df: pd.DataFrame, row_dict: dict) -> pd.DataFrame:
@@ -833,6 +866,288 @@ def get_mean_absolute_shap_df(columns, shap_values, onehot_dict=None):
     return shap_df
 
 
+def get_mean_abs_shap_interactions(shap_interaction_values, chunk_size: int = 10000):
+    """returns the (m, m) matrix of mean absolute shap interaction values,
+    calculated in chunks of chunk_size rows so that no (n, m, m) temporary array
+    is needed.
+
+    Args:
+        shap_interaction_values (np.ndarray): shap interaction values of shape (n, m, m)
+        chunk_size (int): number of rows to process at a time. Defaults to 10000.
+
+    Returns:
+        np.ndarray
+    """
+    n = len(shap_interaction_values)
+    total = np.zeros(shap_interaction_values.shape[1:], dtype=np.float64)
+    for start in range(0, n, chunk_size):
+        total += np.abs(shap_interaction_values[start : start + chunk_size]).sum(0)
+    return total / max(n, 1)
+
+
+def model_accepts_arrays(model, X: pd.DataFrame, method: str = "predict") -> bool:
+    """returns True if model gives the same predictions for X.values as for
+    the DataFrame X, so that it can be called on numpy arrays directly. This is
+    not the case for e.g. pipelines that select columns by name.
+
+    Args:
+        model: fitted model
+        X (pd.DataFrame): a few rows to compare the predictions on
+        method (str): prediction method of model. Defaults to 'predict'.
+
+    Returns:
+        bool
+    """
+    if not all(is_numeric_dtype(dtype) for dtype in X.dtypes):
+        return False
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            return bool(
+                np.allclose(
+                    np.asarray(getattr(model, method)(X.values), dtype=float),
+                    np.asarray(getattr(model, method)(X), dtype=float),
+                    equal_nan=True,
+                )
+            )
+    except Exception:
+        return False
+
+
+class KernelModelPredict:
+    """Prediction function for shap.KernelExplainer, that calls the predict
+    (or predict_proba) method of model on the numpy arrays sampled by shap.
+
+    The arrays only get wrapped in a pd.DataFrame with the original columns when
+    as_frame=True, as constructing a DataFrame for every call adds up over the
+    many calls of a kernel explainer. Unlike a local function, instances can be
+    pickled, so that explainers with shap='kernel' can be stored with joblib
+    and the shap values calculated in parallel processes.
+
+    Args:
+        model: fitted model
+        columns (List[str]): feature names of the model
+        method (str): 'predict' or 'predict_proba'. Defaults to 'predict'.
+        as_frame (bool): wrap the arrays in a pd.DataFrame. Defaults to True.
+    """
+
+    def __init__(
+        self, model, columns: List[str], method: str = "predict", as_frame=True
+    ):
+        self.model = model
+        self.columns = list(columns)
+        self.method = method
+        self.as_frame = as_frame
+
+    def __call__(self, data_asarray):
+        if self.as_frame:
+            preds = getattr(self.model, self.method)(
+                pd.DataFrame(data_asarray, columns=self.columns)
+            )
+        else:
+            with warnings.catch_warnings():
+                # e.g. 'X does not have valid feature names'
+                warnings.simplefilter("ignore", UserWarning)
+                preds = getattr(self.model, self.method)(data_asarray)
+        preds = np.asarray(preds)
+        if self.method == "predict":
+            return preds.reshape(len(preds))
+        return preds
+
+
+def copy_kernel_explainer(shap_explainer):
+    """returns a new shap.KernelExplainer with the same model, background data
+    and link as shap_explainer, but without the state that shap_explainer keeps
+    from explaining its last rows, which cannot be pickled.
+
+    Args:
+        shap_explainer (shap.KernelExplainer): kernel explainer to copy
+
+    Returns:
+        shap.KernelExplainer
+    """
+    import shap
+
+    return shap.KernelExplainer(
+        shap_explainer.model.f, shap_explainer.data, link=shap_explainer.link
+    )
+
+
+def _seeded_shap_values(shap_explainer, X, seed, **shap_kwargs):
+    """shap_explainer.shap_values(X) with np.random seeded with seed, so that the
+    coalitions that shap.KernelExplainer samples are reproducible. Restores the
+    global random state afterwards."""
+    if seed is None:
+        return shap_explainer.shap_values(X, **shap_kwargs)
+    random_state = np.random.get_state()
+    np.random.seed(seed)
+    try:
+        return shap_explainer.shap_values(X, **shap_kwargs)
+    finally:
+        np.random.set_state(random_state)
+
+
+def kernel_shap_values(
+    shap_explainer,
+    X,
+    n_jobs: int = None,
+    chunks_per_job: int = 4,
+    random_state: int = 0,
+    **shap_kwargs,
+):
+    """calculates the shap values of a shap.KernelExplainer for the rows of X in
+    chunks, spread over n_jobs processes.
+
+    A kernel explainer samples the feature coalitions it evaluates at random
+    (unless nsamples covers all coalitions), so each chunk gets its own seed
+    derived from random_state: the result is reproducible for the same
+    random_state, n_jobs and chunks_per_job, but not identical to a single
+    shap_explainer.shap_values(X) call, or to a call with a different n_jobs
+    (the values agree up to the sampling error of nsamples).
+
+    Args:
+        shap_explainer (shap.KernelExplainer): kernel explainer with a
+            picklable model (see KernelModelPredict).
+        X ({pd.DataFrame, np.ndarray}): rows to explain
+        n_jobs (int): number of processes, -1 for all cores. Defaults to None
+            (a single call in the current process).
+        chunks_per_job (int): number of chunks per process, so that processes
+            that finish early pick up remaining rows. Defaults to 4.
+        random_state (int): seed for the coalition sampling of the chunks,
+            None to use the global np.random state. Defaults to 0.
+        **shap_kwargs: passed on to shap_explainer.shap_values(), e.g. nsamples.
+
+    Returns:
+        shap values as returned by shap_explainer.shap_values(): either a
+        np.ndarray or a list of np.ndarrays (one per label).
+    """
+    n_jobs = effective_n_jobs(n_jobs) if n_jobs is not None else 1
+    n_chunks = min(len(X), n_jobs * chunks_per_job)
+    if n_jobs == 1 or n_chunks <= 1:
+        return _seeded_shap_values(shap_explainer, X, random_state, **shap_kwargs)
+
+    seeds = (
+        np.random.SeedSequence(random_state).generate_state(n_chunks)
+        if random_state is not None
+        else [None] * n_chunks
+    )
+    shap_explainer = copy_kernel_explainer(shap_explainer)
+    shap_kwargs = dict(shap_kwargs, silent=True)
+    chunks = Parallel(n_jobs=n_jobs)(
+        delayed(_seeded_shap_values)(
+            shap_explainer,
+            X.iloc[idxs] if isinstance(X, pd.DataFrame) else X[idxs],
+            seed,
+            **shap_kwargs,
+        )
+        for idxs, seed in zip(np.array_split(np.arange(len(X)), n_chunks), seeds)
+    )
+    if isinstance(chunks[0], list):
+        return [
+            np.concatenate([chunk[label] for chunk in chunks])
+            for label in range(len(chunks[0]))
+        ]
+    return np.concatenate(chunks)
+
+
+LINEAR_SHAP_MODELS = [
+    "LinearRegression",
+    "Ridge",
+    "RidgeCV",
+    "Lasso",
+    "LassoCV",
+    "ElasticNet",
+    "ElasticNetCV",
+    "LogisticRegression",
+    "LogisticRegressionCV",
+]
+
+
+def linear_shap_supported(model) -> bool:
+    """returns True if model is a fitted sklearn linear model of which the
+    shap values can be calculated in closed form by LinearShapExplainer.
+    (pipelines get split by the explainer, so model should be the final
+    estimator)
+
+    Args:
+        model: fitted model
+
+    Returns:
+        bool
+    """
+    return (
+        type(model).__module__.startswith("sklearn.")
+        and type(model).__name__ in LINEAR_SHAP_MODELS
+        and hasattr(model, "coef_")
+        and hasattr(model, "intercept_")
+    )
+
+
+class LinearShapExplainer:
+    """Calculates the (interventional) shap values of a fitted sklearn linear
+    model directly from its coefficients: coef * (X - mean(background)).
+    Exposes the same expected_value and shap_values() as shap.LinearExplainer
+    and gives the same results (just like the shap.maskers.Independent that
+    shap.LinearExplainer wraps the background data in, the background gets
+    sampled down to max_samples rows), but writes the shap values chunk by
+    chunk into a single output array, instead of materializing X - mean and a
+    separate array per class before stacking them.
+
+    For classifiers the shap values are in logodds space. Binary classifiers
+    give shap values of shape (n_rows, n_features) for the positive class,
+    multiclass classifiers of shape (n_rows, n_features, n_classes).
+
+    Args:
+        model: fitted sklearn linear model (see linear_shap_supported)
+        data ({pd.DataFrame, np.ndarray}): background data
+        max_samples (int): sample background data down to this many rows.
+            Defaults to 100.
+        chunk_size (int): calculate the shap values in chunks of this many rows,
+            so that the temporary arrays stay small for large X. Defaults
+            to 10_000.
+    """
+
+    def __init__(self, model, data, max_samples: int = 100, chunk_size=10_000):
+        import shap
+
+        if len(data) > max_samples:
+            data = shap.utils.sample(data, max_samples)
+        self.mean = np.asarray(data).mean(axis=0)
+
+        self.coef = np.asarray(model.coef_)
+        self.intercept = np.asarray(model.intercept_)
+        if self.coef.ndim > 1 and self.coef.shape[0] == 1:
+            # binary classifier: only the positive class
+            self.coef, self.intercept = self.coef[0], self.intercept.reshape(-1)[0]
+        self.expected_value = np.dot(self.coef, self.mean) + self.intercept
+        self.chunk_size = chunk_size
+
+    def shap_values(self, X, **kwargs):
+        """returns the shap values for the rows of X. kwargs (e.g.
+        check_additivity) are ignored, as the shap values are exact."""
+        if isinstance(X, (pd.DataFrame, pd.Series)):
+            X = X.values
+        X = np.atleast_2d(X)
+        dtype = np.result_type(X, self.mean, self.coef)
+        if self.coef.ndim == 1:
+            shap_values = np.empty(X.shape, dtype=dtype)
+        else:
+            shap_values = np.empty((*X.shape, len(self.coef)), dtype=dtype)
+        for start in range(0, len(X), self.chunk_size):
+            chunk = np.subtract(X[start : start + self.chunk_size], self.mean)
+            if self.coef.ndim == 1:
+                np.multiply(
+                    chunk, self.coef, out=shap_values[start : start + len(chunk)]
+                )
+            else:
+                np.multiply(
+                    chunk[:, :, None],
+                    self.coef.T[None, :, :],
+                    out=shap_values[start : start + len(chunk)],
+                )
+        return shap_values
+
+
 def get_grid_points(array, n_grid_points=10, min_percentage=0, max_percentage=100):
     """seperates a numerical array into a number of grid points. Helper function
     for get_pdp_df.
@@ -940,7 +1255,7 @@ def get_pdp_df(
             pdp_df = pd.DataFrame()
     else:
         pdp_df = pd.DataFrame()
-    for grid_value in grid_values:
+    for i, grid_value in enumerate(grid_values):
         dtemp = X_sample.copy()
         if isinstance(feature, list):
             if grid_value in X_sample.columns:
@@ -966,6 +1281,7 @@ def get_pdp_df(
                 dtemp = dtemp.values.astype("float32")
             preds = model.predict(dtemp).squeeze()
             pdp_df[grid_value] = preds
+        report_progress((i + 1) / len(grid_values))
     if multiclass:
         return pdp_dfs
     else:
@@ -1826,3 +2142,752 @@ def get_xgboost_preds_df(xgbmodel, X_row, pos_label=1):
             0, "pred_proba"
         ]
     return xgboost_preds_df
+
+
+_progress_reporter = ContextVar("progress_reporter", default=None)
+
+
+def report_progress(fraction: float):
+    """reports the fraction (0-1) of a long running calculation that is done to
+    the reporter set by progress_reporting(), e.g. the progress bar of the
+    background callback that runs the calculation. Does nothing otherwise."""
+    reporter = _progress_reporter.get()
+    if reporter is not None:
+        reporter(min(max(float(fraction), 0.0), 1.0))
+
+
+@contextmanager
+def progress_reporting(reporter):
+    """calls reporter(fraction) for every report_progress(fraction) inside
+    the with block"""
+    token = _progress_reporter.set(reporter)
+    try:
+        yield
+    finally:
+        _progress_reporter.reset(token)
+
+
+logger = logging.getLogger("explainerdashboard")
+
+_timing_callbacks = []
+_current_computation = ContextVar("current_computation", default=None)
+
+
+def add_timing_callback(callback):
+    """Registers callback(event: dict) to be called at the start and the end of
+    every instrumented calculation (see timed_computation()), e.g. to send
+    the timings to a monitoring system. Returns the callback."""
+    if callback not in _timing_callbacks:
+        _timing_callbacks.append(callback)
+    return callback
+
+
+def remove_timing_callback(callback):
+    """Unregisters a callback registered with add_timing_callback()"""
+    if callback in _timing_callbacks:
+        _timing_callbacks.remove(callback)
+
+
+def _emit_timing_event(event: dict):
+    for callback in list(_timing_callbacks):
+        try:
+            callback(dict(event))
+        except Exception:
+            logger.exception(f"O callback de tempos {callback} falhou!")
+
+
+@contextmanager
+def timed_computation(
+    name: str, shape: tuple = None, records: list = None, result=None
+):
+    """Instruments the calculation inside the with block: emits a 'start' and
+    an 'end' event to the logger 'explainerdashboard' (the end at INFO level)
+    and to the callbacks registered with add_timing_callback().
+
+    The end event contains the wall time and cpu time (of the whole process)
+    in seconds, the shape of the input data, the size of the result in bytes
+    and the error if the calculation raised one. Calculations that get
+    triggered inside another one have that one as parent, and their time is
+    included in the time of the parent.
+
+    Args:
+        name (str): name of the calculation, e.g. 'get_shap_values_df'.
+        shape (tuple, optional): (rows, columns) of the input data.
+        records (list, optional): list to append the end event to.
+        result (callable, optional): function returning the result of the
+            calculation after the with block, used to calculate result_bytes.
+    """
+    n_rows, n_cols = (tuple(shape or ()) + (None, None))[:2]
+    event = dict(
+        name=name, parent=_current_computation.get(), n_rows=n_rows, n_cols=n_cols
+    )
+    logger.debug(f"A calcular {name}...")
+    _emit_timing_event(dict(event, event="start", timestamp=time.time()))
+    token = _current_computation.set(name)
+    start, start_cpu, error = time.perf_counter(), time.process_time(), None
+    try:
+        yield
+    except BaseException as e:
+        error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current_computation.reset(token)
+        event.update(
+            event="end",
+            timestamp=time.time(),
+            wall_time=time.perf_counter() - start,
+            cpu_time=time.process_time() - start_cpu,
+            result_bytes=(
+                get_object_size(result())
+                if result is not None and error is None
+                else None
+            ),
+            error=error,
+        )
+        if records is not None:
+            records.append(event)
+        if error is None:
+            logger.info(
+                f"{name} calculado em {event['wall_time']:.2f}s "
+                f"(cpu {event['cpu_time']:.2f}s, {size_to_string(event['result_bytes'] or 0)})"
+            )
+        else:
+            logger.warning(f"{name} falhou após {event['wall_time']:.2f}s: {error}")
+        _emit_timing_event(event)
+
+
+class LRUCache:
+    """Thread-safe least-recently-used cache with an optional time-to-live.
+
+    Keeps track of hits, misses and evictions so that the cache size
+    can be tuned with .stats().
+
+    Args:
+        maxsize (int): maximum number of items to keep. Defaults to 256.
+        ttl (float): number of seconds after which an item expires.
+            Defaults to None (items never expire).
+    """
+
+    _missing = object()
+
+    def __init__(self, maxsize: int = 256, ttl: float = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = Lock()
+        self.clear()
+
+    def __getstate__(self):
+        # Locks are not picklable and cached values should not end up on disk
+        return dict(maxsize=self.maxsize, ttl=self.ttl)
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return self.get(key, default=self._missing, count=False) is not self._missing
+
+    def clear(self):
+        """empties the cache and resets the statistics"""
+        with self._lock:
+            self._items = OrderedDict()
+            self.hits, self.misses, self.evictions = 0, 0, 0
+
+    def get(self, key, default=None, count=True):
+        """returns the cached value for key, or default if not found or expired"""
+        with self._lock:
+            if key in self._items:
+                timestamp, value = self._items[key]
+                if self.ttl is None or time.monotonic() - timestamp < self.ttl:
+                    self._items.move_to_end(key)
+                    if count:
+                        self.hits += 1
+                    return value
+                del self._items[key]
+            if count:
+                self.misses += 1
+            return default
+
+    def pop(self, key, default=None):
+        """removes key and returns its value, or default if not found or expired"""
+        with self._lock:
+            timestamp, value = self._items.pop(key, (None, default))
+            if timestamp is None:
+                return default
+            if self.ttl is not None and time.monotonic() - timestamp >= self.ttl:
+                return default
+            return value
+
+    def set(self, key, value):
+        """stores value under key, evicting the least recently used items
+        when maxsize is exceeded"""
+        with self._lock:
+            self._items[key] = (time.monotonic(), value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        """returns dict with size, hits, misses, evictions and hit_rate"""
+        lookups = self.hits + self.misses
+        return dict(
+            size=len(self._items),
+            maxsize=self.maxsize,
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            hit_rate=self.hits / lookups if lookups > 0 else None,
+        )
+
+
+def get_row_hash(X_row: pd.DataFrame) -> str:
+    """returns a hash of the content (column names and values) of X_row,
+    independent of its index, that can be used as a cache key."""
+    h = hashlib.sha1(",".join(map(str, X_row.columns)).encode())
+    h.update(pd.util.hash_pandas_object(X_row, index=False).values.tobytes())
+    return h.hexdigest()
+
+
+class _PendingShapRow:
+    __slots__ = ("key", "X_row", "event", "result", "error")
+
+    def __init__(self, key, X_row):
+        self.key, self.X_row = key, X_row
+        self.event = Event()
+        self.result, self.error = None, None
+
+
+def _slice_shap_values(shap_values, idx):
+    """select row idx from shap values as returned by shap_explainer.shap_values(),
+    which can be either a 2d np.ndarray, a 3d np.ndarray (n, m, labels) or
+    a list of 2d np.ndarrays (one per label)."""
+    if isinstance(shap_values, list):
+        return [np.array(sv[idx : idx + 1]) for sv in shap_values]
+    return np.array(shap_values[idx : idx + 1])
+
+
+def _copy_shap_values(shap_values):
+    if isinstance(shap_values, list):
+        return [sv.copy() for sv in shap_values]
+    return shap_values.copy()
+
+
+class ShapRowBatcher:
+    """Coalesces single row shap value requests that arrive concurrently
+    into a single batched shap_values call, and caches the results by row content.
+
+    The first request that arrives becomes the leader of a batch: it waits for
+    window_ms milliseconds to collect requests from other threads, then calculates
+    the shap values of all unique rows at once and hands each waiting thread
+    its own row. Results are stored in an LRUCache keyed on get_row_hash(X_row),
+    so that repeated requests for the same row (e.g. going back and forth
+    between what-if scenarios) are served without recalculation.
+
+    Args:
+        window_ms (float): number of milliseconds to wait for other requests
+            to join a batch. Defaults to 10.
+        max_batch_size (int): maximum number of rows to pass to a single
+            shap_values call. Defaults to 64.
+        cache_size (int): number of rows to keep in the cache. Pass 0
+            to disable caching. Defaults to 256.
+        cache: cache to use instead of an LRUCache of cache_size, e.g. a
+            CacheNamespace(backend, prefix, serialize=True) of a CacheBackend
+            that is shared between processes. Defaults to None.
+    """
+
+    def __init__(
+        self,
+        window_ms: float = 10,
+        max_batch_size: int = 64,
+        cache_size: int = 256,
+        cache=None,
+    ):
+        self.window_ms = window_ms
+        self.max_batch_size = max_batch_size
+        self.cache_size = cache_size
+        if cache is None and cache_size > 0:
+            cache = LRUCache(maxsize=cache_size)
+        self.cache = cache
+        self._lock = Lock()
+        self._pending = []
+        self.batches, self.batched_rows = 0, 0
+
+    def __getstate__(self):
+        # a shared cache gets replaced by an LRUCache after loading
+        return dict(
+            window_ms=self.window_ms,
+            max_batch_size=self.max_batch_size,
+            cache_size=self.cache_size,
+        )
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def shap_values(self, X_row: pd.DataFrame, shap_values_func: callable):
+        """returns the shap values for a single row X_row, in the same format
+        as shap_values_func(X_row) would have returned them.
+
+        Args:
+            X_row (pd.DataFrame): single row dataframe
+            shap_values_func (callable): function that takes a pd.DataFrame
+                and returns the shap values for each row.
+        """
+        key = get_row_hash(X_row)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return _copy_shap_values(cached)
+
+        request = _PendingShapRow(key, X_row)
+        with self._lock:
+            self._pending.append(request)
+            is_leader = len(self._pending) == 1
+
+        if is_leader:
+            time.sleep(self.window_ms / 1000)
+            with self._lock:
+                batch, self._pending = self._pending, []
+            self._run_batch(batch, shap_values_func)
+
+        request.event.wait()
+        if request.error is not None:
+            raise request.error
+        return _copy_shap_values(request.result)
+
+    def _run_batch(self, batch, shap_values_func):
+        unique_rows = OrderedDict()
+        for request in batch:
+            unique_rows.setdefault(request.key, request.X_row)
+        keys = list(unique_rows.keys())
+        results = {}
+        try:
+            for start in range(0, len(keys), self.max_batch_size):
+                chunk_keys = keys[start : start + self.max_batch_size]
+                X = pd.concat([unique_rows[key] for key in chunk_keys])
+                shap_values = shap_values_func(X)
+                for idx, key in enumerate(chunk_keys):
+                    results[key] = _slice_shap_values(shap_values, idx)
+                    if self.cache is not None:
+                        self.cache.set(key, results[key])
+                with self._lock:
+                    self.batches += 1
+                    self.batched_rows += len(chunk_keys)
+            for request in batch:
+                request.result = results[request.key]
+        except Exception as e:
+            for request in batch:
+                request.error = e
+        finally:
+            for request in batch:
+                request.event.set()
+
+    def stats(self) -> dict:
+        """returns dict with the number of batches, the average batch size
+        and the statistics of the row cache."""
+        return dict(
+            batches=self.batches,
+            avg_batch_size=self.batched_rows / self.batches if self.batches else None,
+            cache=self.cache.stats() if self.cache is not None else None,
+        )
+
+
+class IndexSearch:
+    """Search index over a (possibly very long) list of str indexes, that returns
+    the indexes that start with or contain a search string without scanning
+    the whole list.
+
+    Prefix queries are answered with a binary search over a sorted copy of
+    the index list. Substring queries intersect the posting lists of all the
+    n-grams in the search string, and only check the remaining candidates.
+    The n-gram index gets built (with vectorized numpy operations, in chunks
+    of indexes) on the first substring query.
+
+    Args:
+        index_list (List[str]): list of indexes
+        ngram (int): length of the n-grams in the substring index, at most 3.
+            Search strings shorter than ngram fall back to a scan that stops
+            as soon as enough matches have been found. Defaults to 3.
+        chunk_size (int): number of indexes to process at a time when
+            building the n-gram index. Defaults to 10_000.
+    """
+
+    def __init__(self, index_list, ngram: int = 3, chunk_size: int = 10_000):
+        if not 1 <= ngram <= 3:
+            raise ValueError(f"ngram deve estar entre 1 e 3, mas é {ngram}!")
+        self.index_list = np.array([str(idx) for idx in index_list], dtype=object)
+        self.sorted_index_list = np.sort(self.index_list)
+        self.ngram = ngram
+        self.chunk_size = chunk_size
+        self._gram_codes = None
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self.index_list)
+
+    def __getstate__(self):
+        # Locks are not picklable
+        return {k: v for k, v in self.__dict__.items() if k != "_lock"}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = Lock()
+
+    def _ngrams(self, s: str) -> set:
+        return {s[i : i + self.ngram] for i in range(len(s) - self.ngram + 1)}
+
+    @staticmethod
+    def _gram_code(gram: str) -> int:
+        """n-grams are coded as the 21 bit unicode code points of their
+        characters packed into a single int64"""
+        code = 0
+        for char in gram:
+            code = (code << 21) | ord(char)
+        return code
+
+    def _chunk_ngrams(self, start: int):
+        """returns the codes of the n-grams in the indexes in the chunk that
+        starts at start (sorted, and every n-gram once per index) and the
+        positions of the indexes they occur in"""
+        chars = self.index_list[start : start + self.chunk_size].astype(str)
+        width = chars.dtype.itemsize // 4
+        if width < self.ngram:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        codes = chars.view(np.uint32).reshape(len(chars), width).astype(np.int64)
+        n_grams = width - self.ngram + 1
+        grams = codes[:, :n_grams]
+        for i in range(1, self.ngram):
+            grams = (grams << 21) | codes[:, i : i + n_grams]
+        # str arrays are padded with null characters, so an n-gram is part of
+        # the index if its last character is not padding:
+        valid = codes[:, self.ngram - 1 :] != 0
+        rows = np.broadcast_to(np.arange(len(chars))[:, None], grams.shape)[valid]
+        # sort on a single (n-gram, row) key, which also drops n-grams
+        # that occur more than once in the same index:
+        chunk_codes, gram_idxs = np.unique(grams[valid], return_inverse=True)
+        keys = np.unique(gram_idxs * len(chars) + rows)
+        return chunk_codes[keys // len(chars)], start + keys % len(chars)
+
+    def build_ngram_index(self):
+        """builds the n-gram index used for substring queries: the sorted
+        n-gram codes, and per n-gram a (sorted) posting list of the positions
+        of the indexes that contain it, stored back to back in a single array.
+        Gets called automatically on the first substring query if not called
+        before."""
+        with self._lock:
+            if self._gram_codes is not None:
+                return
+            starts = range(0, len(self.index_list), self.chunk_size)
+            # first pass: count the indexes per n-gram
+            gram_codes = np.empty(0, dtype=np.int64)
+            counts = np.empty(0, dtype=np.int64)
+            for start in starts:
+                grams, _ = self._chunk_ngrams(start)
+                chunk_codes, chunk_counts = np.unique(grams, return_counts=True)
+                all_codes = np.union1d(gram_codes, chunk_codes)
+                all_counts = np.zeros(len(all_codes), dtype=np.int64)
+                all_counts[np.searchsorted(all_codes, gram_codes)] += counts
+                all_counts[np.searchsorted(all_codes, chunk_codes)] += chunk_counts
+                gram_codes, counts = all_codes, all_counts
+            offsets = np.concatenate([[0], np.cumsum(counts)])
+            # second pass: fill in the posting lists, chunk by chunk
+            positions = np.empty(
+                offsets[-1],
+                dtype=np.int32 if len(self.index_list) < 2**31 else np.int64,
+            )
+            filled = offsets[:-1].copy()
+            for start in starts:
+                grams, chunk_positions = self._chunk_ngrams(start)
+                if len(grams) == 0:
+                    continue
+                gram_idxs = np.searchsorted(gram_codes, grams)
+                group_starts = np.flatnonzero(np.r_[True, grams[1:] != grams[:-1]])
+                group_sizes = np.diff(np.r_[group_starts, len(grams)])
+                ranks = np.arange(len(grams)) - np.repeat(group_starts, group_sizes)
+                positions[filled[gram_idxs] + ranks] = chunk_positions
+                filled[gram_idxs[group_starts]] += group_sizes
+            self._gram_offsets, self._gram_positions = offsets, positions
+            self._gram_codes = gram_codes
+
+    def _posting_list(self, gram: str):
+        """returns the positions of the indexes that contain gram, or None"""
+        code = self._gram_code(gram)
+        i = np.searchsorted(self._gram_codes, code)
+        if i == len(self._gram_codes) or self._gram_codes[i] != code:
+            return None
+        return self._gram_positions[self._gram_offsets[i] : self._gram_offsets[i + 1]]
+
+    def startswith(self, prefix: str, max_results: int = None) -> List[str]:
+        """returns (sorted) indexes that start with prefix"""
+        lo = np.searchsorted(self.sorted_index_list, prefix, side="left")
+        hi = np.searchsorted(self.sorted_index_list, prefix + "\U0010ffff", side="left")
+        if max_results is not None:
+            hi = min(hi, lo + max_results)
+        return self.sorted_index_list[lo:hi].tolist()
+
+    def contains(self, substring: str, max_results: int = None) -> List[str]:
+        """returns indexes that contain substring, in the order of the index list"""
+        if max_results is not None and max_results <= 0:
+            return []
+        if len(substring) < self.ngram:
+            candidates = range(len(self.index_list))
+        else:
+            if self._gram_codes is None:
+                self.build_ngram_index()
+            posting_lists = []
+            for gram in self._ngrams(substring):
+                posting_list = self._posting_list(gram)
+                if posting_list is None:
+                    return []
+                posting_lists.append(posting_list)
+            posting_lists.sort(key=len)
+            candidates = posting_lists[0]
+            for posting_list in posting_lists[1:]:
+                candidates = np.intersect1d(
+                    candidates, posting_list, assume_unique=True
+                )
+        matches = []
+        for pos in candidates:
+            if substring in self.index_list[pos]:
+                matches.append(self.index_list[pos])
+                if max_results is not None and len(matches) >= max_results:
+                    break
+        return matches
+
+    def search(self, search_value: str, max_results: int = 1000) -> List[str]:
+        """returns up to max_results indexes that contain search_value,
+        with the indexes that start with search_value first."""
+        search_value = str(search_value)
+        results = self.startswith(search_value, max_results)
+        if len(results) < max_results:
+            results.extend(
+                idx
+                for idx in self.contains(search_value, max_results + len(results))
+                if not idx.startswith(search_value)
+            )
+        return results[:max_results]
+
+
+class SortedRangeIndex:
+    """Sorted ordering (argsort) of a numeric array, so that the rows with
+    values within a range can be found with a binary search instead of
+    building a boolean mask over all rows.
+
+    Args:
+        values (np.ndarray, pd.Series): numeric values. NaN values never
+            fall within any range.
+    """
+
+    def __init__(self, values):
+        self.values = np.asarray(values, dtype=np.float64)
+        self.order = np.argsort(self.values, kind="stable")
+        self.n_valid = int(np.count_nonzero(~np.isnan(self.values)))
+        self.sorted_values = self.values[self.order][: self.n_valid]
+
+    def __len__(self):
+        return len(self.values)
+
+    def slice(self, min_value=None, max_value=None, include_min=True):
+        """returns (lo, hi) such that self.order[lo:hi] are the rows with
+        min_value <= value <= max_value (or min_value < value when include_min=False)"""
+        lo = (
+            0
+            if min_value is None
+            else int(
+                np.searchsorted(
+                    self.sorted_values,
+                    min_value,
+                    side="left" if include_min else "right",
+                )
+            )
+        )
+        hi = (
+            self.n_valid
+            if max_value is None
+            else int(np.searchsorted(self.sorted_values, max_value, side="right"))
+        )
+        return lo, max(lo, hi)
+
+    def contains(self, rows, min_value=None, max_value=None, include_min=True):
+        """returns a boolean mask indicating whether the values of rows
+        fall within the range"""
+        values = self.values[rows]
+        mask = ~np.isnan(values)
+        if min_value is not None:
+            mask &= values >= min_value if include_min else values > min_value
+        if max_value is not None:
+            mask &= values <= max_value
+        return mask
+
+
+def random_row_in_ranges(constraints, max_tries: int = 10, batch_size: int = 32):
+    """Returns a random row that satisfies all constraints, or None if there is none.
+
+    Only the constraint with the fewest matching rows (as found by binary
+    search) gets used to generate candidate rows, which are then checked
+    against the other constraints (rejection sampling). Only when max_tries
+    batches of candidates have all been rejected do the candidate rows
+    get filtered exhaustively.
+
+    Args:
+        constraints (List[tuple]): list of (SortedRangeIndex, ranges), where
+            ranges is a list of (min_value, max_value, include_min) tuples. A row
+            satisfies a constraint if its value falls within any of the ranges.
+        max_tries (int): number of batches of candidates to try before
+            falling back to an exhaustive search. Defaults to 10.
+        batch_size (int): number of candidates per batch. Defaults to 32.
+
+    Returns:
+        int: row number
+    """
+    slices = [
+        [sorted_index.slice(*range_) for range_ in ranges]
+        for sorted_index, ranges in constraints
+    ]
+    counts = [sum(hi - lo for lo, hi in slices_) for slices_ in slices]
+    if not counts or min(counts) == 0:
+        return None
+
+    source = int(np.argmin(counts))
+    source_index, source_slices = constraints[source][0], slices[source]
+    others = [c for i, c in enumerate(constraints) if i != source]
+    slice_ends = np.cumsum([hi - lo for lo, hi in source_slices])
+    slice_starts = np.array([lo for lo, _ in source_slices])
+
+    def satisfies_others(rows):
+        mask = np.ones(len(rows), dtype=bool)
+        for sorted_index, ranges in others:
+            in_ranges = np.zeros(len(rows), dtype=bool)
+            for range_ in ranges:
+                in_ranges |= sorted_index.contains(rows, *range_)
+            mask &= in_ranges
+        return mask
+
+    for _ in range(max_tries):
+        offsets = np.random.randint(0, counts[source], size=batch_size)
+        which = np.searchsorted(slice_ends, offsets, side="right")
+        offsets = offsets - np.concatenate([[0], slice_ends[:-1]])[which]
+        rows = source_index.order[slice_starts[which] + offsets]
+        accepted = rows[satisfies_others(rows)]
+        if len(accepted) > 0:
+            return int(accepted[0])
+
+    rows = np.concatenate([source_index.order[lo:hi] for lo, hi in source_slices])
+    rows = rows[satisfies_others(rows)]
+    if len(rows) == 0:
+        return None
+    return int(np.random.choice(rows))
+
+
+def stratified_sample_order(strata, seed: int = 0) -> np.ndarray:
+    """Returns a seeded ordering of all rows such that every prefix of the
+    ordering is a stratified sample: the first k rows contain each stratum
+    in (approximately) the same proportion as the full data. Samples of
+    different sizes are therefore nested and reproducible.
+
+    Each row gets the key (random position within its stratum + uniform
+    jitter) / stratum size, and rows are ordered by this key.
+
+    Args:
+        strata (np.ndarray): stratum label for each row.
+        seed (int): random seed. Defaults to 0.
+
+    Returns:
+        np.ndarray: row numbers
+    """
+    rng = np.random.default_rng(seed)
+    _, codes, sizes = np.unique(strata, return_inverse=True, return_counts=True)
+    codes = codes.ravel()
+    shuffled = rng.permutation(len(codes))
+    by_stratum = shuffled[np.argsort(codes[shuffled], kind="stable")]
+    positions = np.empty(len(codes))
+    positions[by_stratum] = np.arange(len(codes)) - np.repeat(
+        np.cumsum(sizes) - sizes, sizes
+    )
+    keys = (positions + rng.random(len(codes))) / sizes[codes]
+    return np.argsort(keys, kind="stable")
+
+
+def get_iqr_bounds(values, k: float = 1.5):
+    """returns the (lower, upper) bounds outside of which values are
+    considered outliers: more than k*IQR below q1 or above q3."""
+    q1, q3 = np.nanpercentile(values, [25, 75])
+    return q1 - k * (q3 - q1), q3 + k * (q3 - q1)
+
+
+class _ByteCounter:
+    """file-like object that only counts the bytes written to it"""
+
+    def __init__(self):
+        self.bytes = 0
+
+    def write(self, data):
+        self.bytes += len(data)
+
+
+_pickled_sizes = weakref.WeakKeyDictionary()
+
+
+def get_pickled_size(obj) -> int:
+    """returns the number of bytes of obj when pickled, without keeping the
+    pickle in memory, or sys.getsizeof(obj) if obj cannot be pickled. The size
+    is calculated once per object (as long as obj can be weakly referenced),
+    so mutating obj afterwards does not change it."""
+    try:
+        return _pickled_sizes[obj]
+    except (KeyError, TypeError):
+        pass
+    counter = _ByteCounter()
+    try:
+        pickle.dump(obj, counter, protocol=pickle.HIGHEST_PROTOCOL)
+        size = counter.bytes
+    except Exception:
+        size = sys.getsizeof(obj)
+    try:
+        _pickled_sizes[obj] = size
+    except TypeError:
+        pass
+    return size
+
+
+def get_object_size(obj) -> int:
+    """returns the (approximate) number of bytes used by obj: the memory
+    usage (including the python objects in object columns) of DataFrames,
+    Series and Indexes, the nbytes of numpy arrays, the sum of the items of
+    lists, tuples and dicts, sys.getsizeof for scalars and strings, and the
+    pickled size (see get_pickled_size) of any other object, e.g. models, shap
+    explainers and decision tree objects."""
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True).sum())
+    elif isinstance(obj, (pd.Series, pd.Index)):
+        return int(obj.memory_usage(deep=True))
+    elif isinstance(obj, np.ndarray):
+        return obj.nbytes
+    elif isinstance(obj, (list, tuple, set)):
+        return sum(get_object_size(o) for o in obj)
+    elif isinstance(obj, dict):
+        # (a snapshot, as other threads may be adding items)
+        return sum(get_object_size(o) for o in list(obj.values()))
+    elif obj is None or isinstance(obj, (str, bytes, int, float, bool, np.generic)):
+        return sys.getsizeof(obj)
+    return get_pickled_size(obj)
+
+
+def explainer_memory_usage(explainer) -> int:
+    """(approximate) number of bytes used by the attributes of an explainer:
+    the data and calculated properties, plus the pickled size of the model,
+    shap explainer and other objects (see get_object_size). Takes a snapshot
+    of the attributes, so it can be called while callbacks are calculating
+    lazy properties of the explainer in other threads."""
+    return int(sum(get_object_size(v) for v in list(explainer.__dict__.values())))
+
+
+def size_to_string(num, suffix="B") -> str:
+    """returns a human readable string for num bytes, e.g. '3.4MiB'"""
+    for unit in ["", "Ki", "Mi", "Gi", "Ti", "Pi", "Ei", "Zi"]:
+        if np.abs(num) < 1024.0:
+            return "%3.1f%s%s" % (num, unit, suffix)
+        num /= 1024.0
+    return "%.1f%s%s" % (num, "Yi", suffix)
@@ -43,6 +43,131 @@ from sklearn.metrics import (
 from .explainer_methods import matching_cols, safe_isinstance
 
 
+# svg markers (go.Scatter) look crisper, but webgl (go.Scattergl) renders
+# much faster once there are more than a few thousand points:
+SCATTERGL_CUTOFF = 2000
+
+
+def _scatter_trace(n_points):
+    """returns go.Scattergl for plots with more than SCATTERGL_CUTOFF points,
+    go.Scatter otherwise"""
+    return go.Scattergl if n_points > SCATTERGL_CUTOFF else go.Scatter
+
+
+def _aggregate(n_points, max_points):
+    """plots with more than max_points get rendered as binned heatmaps"""
+    return max_points is not None and n_points > max_points
+
+
+def _bin_edges(values, nbins=100, log=False):
+    """returns nbins+1 equally spaced (or log-spaced) bin edges over the range
+    of the finite values"""
+    values = values[np.isfinite(values)]
+    if len(values) == 0:
+        return np.array([0.0, 1.0])
+    lo, hi = values.min(), values.max()
+    if lo == hi:
+        return np.array([lo - 0.5, hi + 0.5])
+    if log and lo > 0:
+        return np.geomspace(lo, hi, nbins + 1)
+    return np.linspace(lo, hi, nbins + 1)
+
+
+def _binned_heatmap(
+    x,
+    y=None,
+    color=None,
+    nbins=100,
+    x_edges=None,
+    y_edges=None,
+    x_title="x",
+    y_title="y",
+    color_title=None,
+    round=3,
+    colorscale="Bluered",
+    showscale=True,
+    colorbar=None,
+    name=None,
+):
+    """Bins x and y server-side into a 2d histogram and returns a go.Heatmap
+    trace, so that the size of the figure does not depend on the number of points.
+
+    Cells are colored by the number of points, or by the mean of color
+    if color is given. Empty cells are left blank. If y is None all points
+    are put in a single row spanning y=0 to y=1. If y_title is None the
+    y value is left out of the hover text.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.full(len(x), 0.5) if y is None else np.asarray(y, dtype=float)
+    valid = np.isfinite(x) & np.isfinite(y)
+    x, y = x[valid], y[valid]
+    if x_edges is None:
+        x_edges = _bin_edges(x, nbins)
+    if y_edges is None:
+        y_edges = _bin_edges(y, nbins)
+
+    counts = np.histogram2d(x, y, bins=[x_edges, y_edges])[0]
+    hovertemplate = f"{x_title}: %{{x:.{round}f}}<br>"
+    if y_title is not None:
+        hovertemplate += f"{y_title}: %{{y:.{round}f}}<br>"
+    hovertemplate += "n=%{customdata:.0f}"
+    if color is not None:
+        color = np.asarray(color, dtype=float)[valid]
+        has_color = np.isfinite(color)
+        color_sums = np.histogram2d(
+            x[has_color],
+            y[has_color],
+            bins=[x_edges, y_edges],
+            weights=color[has_color],
+        )[0]
+        color_counts = np.histogram2d(
+            x[has_color], y[has_color], bins=[x_edges, y_edges]
+        )[0]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            z = color_sums / color_counts
+        hovertemplate += f"<br>mean {color_title}: %{{z:.{round}f}}"
+    else:
+        z = counts.copy()
+    z[counts == 0] = np.nan
+    if colorbar is None:
+        colorbar = dict(title=color_title if color is not None else "n")
+
+    return go.Heatmap(
+        x=(x_edges[:-1] + x_edges[1:]) / 2,
+        y=(y_edges[:-1] + y_edges[1:]) / 2,
+        z=z.T.round(round + 3),
+        customdata=counts.T.astype(int),
+        colorscale=colorscale,
+        showscale=showscale,
+        colorbar=colorbar,
+        hovertemplate=hovertemplate + "<extra></extra>",
+        hoverongaps=False,
+        name=name,
+    )
+
+
+def _binned_box(values, name):
+    """returns a go.Box trace with precomputed quartiles and fences of values,
+    instead of sending all values to the browser."""
+    values = np.asarray(values, dtype=float)
+    values = values[np.isfinite(values)]
+    if len(values) == 0:
+        return go.Box(name=str(name), x=[name], y=[np.nan], showlegend=False)
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+    return go.Box(
+        name=str(name),
+        x=[name],
+        q1=[q1],
+        median=[median],
+        q3=[q3],
+        mean=[values.mean()],
+        lowerfence=[values[values >= q1 - 1.5 * iqr].min()],
+        upperfence=[values[values <= q3 + 1.5 * iqr].max()],
+        showlegend=False,
+    )
+
+
 def plotly_prediction_piechart(predictions_df, showlegend=True, size=250):
     """Return piechart with predict_proba distributions for ClassifierExplainer
 
@@ -814,6 +939,8 @@ def plotly_dependence_plot(
     units="",
     highlight_index=None,
     idxs=None,
+    max_points=None,
+    nbins=100,
 ):
     """Returns a dependence plot showing the relationship between feature col_name
     and shap values for col_name. Do higher values of col_name increase prediction
@@ -833,6 +960,13 @@ def plotly_dependence_plot(
             the plot. Defaults to None.
         idxs (pd.Index, optional): list of descriptors of the index, e.g.
             names or other identifiers. Defaults to None.
+        max_points (int, optional): if there are more than max_points points,
+            render a binned heatmap (colored by the mean of interact_col if
+            numeric, otherwise by the number of points) instead of a scatter
+            plot. The highlighted index is still shown as an exact point.
+            Defaults to None (never aggregate).
+        nbins (int, optional): number of bins along each axis when aggregating.
+            Defaults to 100.
 
     Returns:
         Plotly fig
@@ -858,8 +992,12 @@ def plotly_dependence_plot(
             highlight_name = highlight_index
 
     col_name = X_col.name
+    aggregate = _aggregate(len(X_col), max_points)
+    Scatter = _scatter_trace(len(X_col))
 
-    if interact_col is not None:
+    if aggregate:
+        text = None
+    elif interact_col is not None:
         text = np.array(
             [
                 f"{idxs.name}={index}<br>{X_col.name}={col_val}<br>{interact_col.name}={col_col_val}<br>SHAP={shap_val:.{round}f}"
@@ -880,10 +1018,28 @@ def plotly_dependence_plot(
 
     X_col = X_col.copy().replace({na_fill: np.nan})
     y = shap_values
-    if interact_col is not None and not is_numeric_dtype(interact_col):
+    if aggregate:
+        if interact_col is not None and is_numeric_dtype(interact_col):
+            color = interact_col.replace({na_fill: np.nan})
+        else:
+            color = None
+        data.append(
+            _binned_heatmap(
+                X_col,
+                shap_values,
+                color=color,
+                nbins=nbins,
+                x_title=col_name,
+                y_title="SHAP",
+                color_title=interact_col.name if color is not None else None,
+                round=round,
+                colorscale="Bluered" if color is not None else "Blues",
+            )
+        )
+    elif interact_col is not None and not is_numeric_dtype(interact_col):
         for onehot_col in interact_col.unique().tolist():
             data.append(
-                go.Scattergl(
+                Scatter(
                     x=X_col[interact_col == onehot_col].replace({na_fill: np.nan}),
                     y=shap_values[interact_col == onehot_col],
                     mode="markers",
@@ -906,7 +1062,7 @@ def plotly_dependence_plot(
     elif interact_col is not None and is_numeric_dtype(interact_col):
         if na_fill in interact_col:
             data.append(
-                go.Scattergl(
+                Scatter(
                     x=X_col[interact_col != na_fill],
                     y=shap_values[interact_col != na_fill],
                     mode="markers",
@@ -923,7 +1079,7 @@ def plotly_dependence_plot(
                 )
             )
             data.append(
-                go.Scattergl(
+                Scatter(
                     x=X_col[interact_col == na_fill],
                     y=shap_values[interact_col == na_fill],
                     mode="markers",
@@ -934,7 +1090,7 @@ def plotly_dependence_plot(
             )
         else:
             data.append(
-                go.Scattergl(
+                Scatter(
                     x=X_col,
                     y=shap_values,
                     mode="markers",
@@ -953,7 +1109,7 @@ def plotly_dependence_plot(
 
     else:
         data.append(
-            go.Scattergl(
+            Scatter(
                 x=X_col,
                 y=shap_values,
                 mode="markers",
@@ -980,12 +1136,16 @@ def plotly_dependence_plot(
 
     fig = go.Figure(data, layout)
 
-    if interact_col is not None and not is_numeric_dtype(interact_col):
+    if (
+        interact_col is not None
+        and not is_numeric_dtype(interact_col)
+        and not aggregate
+    ):
         fig.update_layout(showlegend=True)
 
     if highlight_index is not None:
         fig.add_trace(
-            go.Scattergl(
+            Scatter(
                 x=[X_col.iloc[highlight_idx]],
                 y=[shap_values[highlight_idx]],
                 mode="markers",
@@ -1044,6 +1204,7 @@ def plotly_shap_violin_plot(
     Returns:
         Plotly fig
     """
+    jitter = np.random.default_rng(seed=0)  # reproducible figures
 
     assert not is_numeric_dtype(
         X_col
@@ -1128,7 +1289,7 @@ def plotly_shap_violin_plot(
             if is_numeric_dtype(X_color_col):
                 fig.add_trace(
                     go.Scattergl(
-                        x=np.random.randn((X_col == cat).sum()),
+                        x=jitter.standard_normal((X_col == cat).sum()),
                         y=shap_values[X_col == cat],
                         name=X_color_col.name,
                         mode="markers",
@@ -1165,7 +1326,7 @@ def plotly_shap_violin_plot(
 
                     fig.add_trace(
                         go.Scattergl(
-                            x=np.random.randn(
+                            x=jitter.standard_normal(
                                 ((X_col == cat) & (X_color_col == color_cat)).sum()
                             ),
                             y=shap_values[(X_col == cat) & (X_color_col == color_cat)],
@@ -1192,7 +1353,7 @@ def plotly_shap_violin_plot(
                 if X_color_col.nunique() > max_cat_colors:
                     fig.add_trace(
                         go.Scattergl(
-                            x=np.random.randn(
+                            x=jitter.standard_normal(
                                 ((X_col == cat) & (~X_color_col.isin(color_cats))).sum()
                             ),
                             y=shap_values[
@@ -1227,7 +1388,7 @@ def plotly_shap_violin_plot(
         elif points:
             fig.add_trace(
                 go.Scattergl(
-                    x=np.random.randn((X_col == cat).sum()),
+                    x=jitter.standard_normal((X_col == cat).sum()),
                     y=shap_values[X_col == cat],
                     mode="markers",
                     showlegend=False,
@@ -1890,6 +2051,8 @@ def plotly_shap_scatter_plot(
     na_fill=-999,
     round=3,
     max_cat_colors=5,
+    max_points=None,
+    nbins=100,
 ):
     """Generate a shap values summary plot where features are ranked from
     highest mean absolute shap value to lowest, with point clouds shown
@@ -1911,10 +2074,19 @@ def plotly_shap_scatter_plot(
             will be colored grey in the graph.. Defaults to -999.
         round (int, optional): rounding to apply to floats. Defaults to 3.
         index_name (str): identifier for idxs. Defaults to "index".
+        max_points (int, optional): if X has more than max_points rows,
+            bin the shap values of each feature server-side, colored by
+            the mean feature value (numerical features) or the number of
+            points per category (categorical features), instead of plotting
+            every point. The highlighted index is still shown as an exact point.
+            Defaults to None (never aggregate).
+        nbins (int, optional): number of shap value bins when aggregating.
+            Defaults to 100.
 
     Returns:
         Plotly fig
     """
+    jitter = np.random.default_rng(seed=0)  # reproducible figures
     assert matching_cols(
         X, shap_values_df
     ), "X and shap_values_df should have matching columns!"
@@ -1955,14 +2127,63 @@ def plotly_shap_scatter_plot(
         subplot_titles=display_columns,
         shared_xaxes=True,
     )
+    aggregate = _aggregate(length, max_points)
+    Scatter = _scatter_trace(length)
+    if aggregate:
+        shap_edges = np.linspace(min_shap, max_shap, nbins + 1)
 
     for i, col in enumerate(display_columns):
-        if is_numeric_dtype(X[col]):
+        if aggregate and is_numeric_dtype(X[col]):
+            fig.add_trace(
+                _binned_heatmap(
+                    shap_values_df[col],
+                    color=X[col].replace({na_fill: np.nan}),
+                    x_edges=shap_edges,
+                    y_edges=np.array([0.0, 1.0]),
+                    x_title="shap",
+                    y_title=None,
+                    color_title=col,
+                    round=round,
+                    colorbar=dict(
+                        title="feature value <br> (red is high)",
+                        tickfont=dict(color="rgba(0, 0, 0, 0)"),
+                    ),
+                    name=col,
+                ),
+                row=i + 1,
+                col=1,
+            )
+        elif aggregate:
+            # one row of bins per category, colored by number of points:
+            color_cats = list(X[col].value_counts().index[:max_cat_colors])
+            row_cats = color_cats + (
+                ["Other"] if X[col].nunique() > max_cat_colors else []
+            )
+            row_edges = np.linspace(0, 1, len(row_cats) + 1)
+            for row, cat in enumerate(row_cats):
+                cat_mask = ~X[col].isin(color_cats) if cat == "Other" else X[col] == cat
+                fig.add_trace(
+                    _binned_heatmap(
+                        shap_values_df[col][cat_mask],
+                        np.full(cat_mask.sum(), row_edges[row : row + 2].mean()),
+                        x_edges=shap_edges,
+                        y_edges=row_edges,
+                        x_title=f"{col}={cat}<br>shap",
+                        y_title=None,
+                        round=round,
+                        colorscale="Greys",
+                        showscale=False,
+                        name=str(cat),
+                    ),
+                    row=i + 1,
+                    col=1,
+                )
+        elif is_numeric_dtype(X[col]):
             # numerical feature get a single bluered plot
             fig.add_trace(
-                go.Scattergl(
+                Scatter(
                     x=shap_values_df[col],
-                    y=np.random.rand(length),
+                    y=jitter.random(length),
                     mode="markers",
                     marker=dict(
                         size=5,
@@ -2008,9 +2229,9 @@ def plotly_shap_scatter_plot(
             colors = colors[:n_color_cats]
             for cat, color in zip(color_cats, colors):
                 fig.add_trace(
-                    go.Scattergl(
+                    Scatter(
                         x=shap_values_df[col][X[col] == cat],
-                        y=np.random.rand((X[col] == cat).sum()),
+                        y=jitter.random((X[col] == cat).sum()),
                         mode="markers",
                         marker=dict(
                             size=5,
@@ -2034,9 +2255,9 @@ def plotly_shap_scatter_plot(
                 )
             if X[col].nunique() > max_cat_colors:
                 fig.add_trace(
-                    go.Scattergl(
+                    Scatter(
                         x=shap_values_df[col][~X[col].isin(color_cats)],
-                        y=np.random.rand((~X[col].isin(color_cats)).sum()),
+                        y=jitter.random((~X[col].isin(color_cats)).sum()),
                         mode="markers",
                         marker=dict(
                             size=5,
@@ -2063,9 +2284,9 @@ def plotly_shap_scatter_plot(
 
         if highlight_index is not None:
             fig.add_trace(
-                go.Scattergl(
+                Scatter(
                     x=[shap_values_df[col].iloc[highlight_idx]],
-                    y=[0],
+                    y=[0.5 if aggregate else 0],
                     mode="markers",
                     marker=dict(
                         color="LightSkyBlue",
@@ -2109,6 +2330,8 @@ def plotly_predicted_vs_actual(
     log_y=False,
     idxs=None,
     index_name="index",
+    max_points=None,
+    nbins=100,
 ):
     """Generate graph showing predicted values from a regressor model vs actual
     values.
@@ -2124,6 +2347,11 @@ def plotly_predicted_vs_actual(
         log_y (bool, optional): Log y axis. Defaults to False.
         idxs (List[str], optional): list of identifiers for each observation. Defaults to None.
         index_name (str): identifier for idxs. Defaults to "index".
+        max_points (int, optional): if there are more than max_points points,
+            render a binned heatmap of the number of points per bin instead
+            of a scatter plot. Defaults to None (never aggregate).
+        nbins (int, optional): number of bins along each axis when aggregating.
+            Defaults to 100.
 
     Returns:
         Plotly fig
@@ -2135,26 +2363,42 @@ def plotly_predicted_vs_actual(
     else:
         idxs = [str(i) for i in range(len(preds))]
 
-    marker_text = [
-        f"{index_name}: {idx}<br>Observed: {actual:.{round}f}<br>Prediction: {pred:.{round}f}"
-        for idx, actual, pred in zip(idxs, y, preds)
-    ]
+    Scatter = _scatter_trace(len(preds))
+    if _aggregate(len(preds), max_points):
+        log_x, log_y = log_x or logs, log_y or logs
+        trace0 = _binned_heatmap(
+            y,
+            preds,
+            x_edges=_bin_edges(np.asarray(y, dtype=float), nbins, log=log_x),
+            y_edges=_bin_edges(np.asarray(preds, dtype=float), nbins, log=log_y),
+            x_title="Observed",
+            y_title="Prediction",
+            round=round,
+            colorscale="Blues",
+            name=f"predicted {target}" + (f" ({units})" if units else ""),
+        )
+        sorted_y = np.array([np.nanmin(y), np.nanmax(y)])
+    else:
+        marker_text = [
+            f"{index_name}: {idx}<br>Observed: {actual:.{round}f}<br>Prediction: {pred:.{round}f}"
+            for idx, actual, pred in zip(idxs, y, preds)
+        ]
 
-    trace0 = go.Scattergl(
-        x=y,
-        y=preds,
-        mode="markers",
-        name=f"predicted {target}" + f" ({units})" if units else "",
-        text=marker_text,
-        hoverinfo="text",
-    )
+        trace0 = Scatter(
+            x=y,
+            y=preds,
+            mode="markers",
+            name=f"predicted {target}" + (f" ({units})" if units else ""),
+            text=marker_text,
+            hoverinfo="text",
+        )
+        sorted_y = np.sort(y)
 
-    sorted_y = np.sort(y)
-    trace1 = go.Scattergl(
+    trace1 = Scatter(
         x=sorted_y,
         y=sorted_y,
         mode="lines",
-        name=f"observed {target}" + f" ({units})" if units else "",
+        name=f"observed {target}" + (f" ({units})" if units else ""),
         hoverinfo="none",
     )
 
@@ -2189,6 +2433,8 @@ def plotly_plot_residuals(
     round=2,
     idxs=None,
     index_name="index",
+    max_points=None,
+    nbins=100,
 ):
     """generates a residual plot
 
@@ -2204,6 +2450,11 @@ def plotly_plot_residuals(
         round (int, optional): [description]. Defaults to 2.
         idxs ([type], optional): [description]. Defaults to None.
         index_name (str): identifier for idxs. Defaults to "index".
+        max_points (int, optional): if there are more than max_points points,
+            render a binned heatmap of the number of points per bin instead
+            of a scatter plot. Defaults to None (never aggregate).
+        nbins (int, optional): number of bins along each axis when aggregating.
+            Defaults to 100.
 
     Returns:
         [type]: [description]
@@ -2232,22 +2483,39 @@ def plotly_plot_residuals(
             f"'ratio', 'log-ratio'] but is equal to {residuals}!"
         )
 
-    residuals_text = [
-        f"{index_name}: {idx}<br>Observed: {actual:.{round}f}<br>Prediction: {pred:.{round}f}<br>Residual: {residual:.{round}f}"
-        for idx, actual, pred, residual in zip(idxs, y, preds, res)
-    ]
-    trace0 = go.Scattergl(
-        x=y if vs_actual else preds,
-        y=residuals_display,
-        mode="markers",
-        name=residuals_name,
-        text=residuals_text,
-        hoverinfo="text",
-    )
+    Scatter = _scatter_trace(len(preds))
+    if _aggregate(len(preds), max_points):
+        trace0 = _binned_heatmap(
+            y if vs_actual else preds,
+            residuals_display,
+            nbins=nbins,
+            x_title="Observed" if vs_actual else "Prediction",
+            y_title="Residual",
+            round=round,
+            colorscale="Blues",
+            name=residuals_name,
+        )
+        line_x = np.array(
+            [np.nanmin(y if vs_actual else preds), np.nanmax(y if vs_actual else preds)]
+        )
+    else:
+        residuals_text = [
+            f"{index_name}: {idx}<br>Observed: {actual:.{round}f}<br>Prediction: {pred:.{round}f}<br>Residual: {residual:.{round}f}"
+            for idx, actual, pred, residual in zip(idxs, y, preds, res)
+        ]
+        trace0 = Scatter(
+            x=y if vs_actual else preds,
+            y=residuals_display,
+            mode="markers",
+            name=residuals_name,
+            text=residuals_text,
+            hoverinfo="text",
+        )
+        line_x = y if vs_actual else preds
 
-    trace1 = go.Scattergl(
-        x=y if vs_actual else preds,
-        y=np.ones(len(preds)) if residuals == "ratio" else np.zeros(len(preds)),
+    trace1 = Scatter(
+        x=line_x,
+        y=np.ones(len(line_x)) if residuals == "ratio" else np.zeros(len(line_x)),
         mode="lines",
         name=(f"Observed {target}" + f" ({units})" if units else "")
         if vs_actual
@@ -2287,6 +2555,8 @@ def plotly_residuals_vs_col(
     na_fill=-999,
     index_name="index",
     cats_order=None,
+    max_points=None,
+    nbins=100,
 ):
     """Generates a residuals plot vs a particular feature column.
 
@@ -2309,11 +2579,19 @@ def plotly_residuals_vs_col(
         index_name (str): identifier for idxs. Defaults to "index".
         cats_order (list, optional): list of categories to display. If None
             defaults to X_col.unique().tolist() so displays all categories.
+        max_points (int, optional): if there are more than max_points points,
+            render box plots with precomputed quartiles (categorical features)
+            or a binned heatmap of the number of points per bin (numerical
+            features) instead of all individual points. Defaults to None
+            (never aggregate).
+        nbins (int, optional): number of bins along each axis when aggregating.
+            Defaults to 100.
 
 
     Returns:
         Plotly fig
     """
+    jitter = np.random.default_rng(seed=0)  # reproducible figures
     if col_name is None:
         try:
             col_name = col.name
@@ -2344,17 +2622,25 @@ def plotly_residuals_vs_col(
             f"'ratio', 'log-ratio'] but is equal to {residuals}!"
         )
 
-    residuals_text = [
-        f"{index_name}: {idx}<br>Actual: {actual:.{round}f}<br>Prediction: {pred:.{round}f}<br>Residual: {residual:.{round}f}"
-        for idx, actual, pred, residual in zip(idxs, y, preds, res)
-    ]
+    aggregate = _aggregate(len(preds), max_points)
+    Scatter = _scatter_trace(len(preds))
+    if not aggregate:
+        residuals_text = [
+            f"{index_name}: {idx}<br>Actual: {actual:.{round}f}<br>Prediction: {pred:.{round}f}<br>Residual: {residual:.{round}f}"
+            for idx, actual, pred, residual in zip(idxs, y, preds, res)
+        ]
 
     if not is_numeric_dtype(col):
         if cats_order is None:
             cats_order = sorted(col.unique().tolist())
         n_cats = len(cats_order)
 
-        if points:
+        if aggregate:
+            fig = go.Figure(
+                [_binned_box(residuals_display[col == cat], cat) for cat in cats_order]
+            )
+            points = False
+        elif points:
             fig = make_subplots(
                 rows=1,
                 cols=2 * n_cats,
@@ -2372,34 +2658,35 @@ def plotly_residuals_vs_col(
             ]
         )
 
-        for i, cat in enumerate(cats_order):
-            column = 1 + i * 2 if points else 1 + i
-            fig.add_trace(
-                go.Violin(
-                    x=col[col == cat],
-                    y=residuals_display[col == cat],
-                    name=cat,
-                    box_visible=True,
-                    meanline_visible=True,
-                    showlegend=False,
-                ),
-                row=1,
-                col=column,
-            )
-            if points:
+        if not aggregate:
+            for i, cat in enumerate(cats_order):
+                column = 1 + i * 2 if points else 1 + i
                 fig.add_trace(
-                    go.Scattergl(
-                        x=np.random.randn(len(col[col == cat])),
+                    go.Violin(
+                        x=col[col == cat],
                         y=residuals_display[col == cat],
-                        mode="markers",
+                        name=cat,
+                        box_visible=True,
+                        meanline_visible=True,
                         showlegend=False,
-                        text=[t for t, b in zip(residuals_text, col == cat) if b],
-                        hoverinfo="text",
-                        marker=dict(size=7, opacity=0.3, color="blue"),
                     ),
                     row=1,
-                    col=column + 1,
+                    col=column,
                 )
+                if points:
+                    fig.add_trace(
+                        Scatter(
+                            x=jitter.standard_normal(len(col[col == cat])),
+                            y=residuals_display[col == cat],
+                            mode="markers",
+                            showlegend=False,
+                            text=[t for t, b in zip(residuals_text, col == cat) if b],
+                            hoverinfo="text",
+                            marker=dict(size=7, opacity=0.3, color="blue"),
+                        ),
+                        row=1,
+                        col=column + 1,
+                    )
 
         if points:
             for i in range(n_cats):
@@ -2415,18 +2702,31 @@ def plotly_residuals_vs_col(
     else:
         col[col == na_fill] = np.nan
 
-        trace0 = go.Scattergl(
-            x=col,
-            y=residuals_display,
-            mode="markers",
-            name=residuals_name,
-            text=residuals_text,
-            hoverinfo="text",
-        )
+        if aggregate:
+            trace0 = _binned_heatmap(
+                col,
+                residuals_display,
+                nbins=nbins,
+                x_title=col_name,
+                y_title="Residual",
+                round=round,
+                colorscale="Blues",
+                name=residuals_name,
+            )
+        else:
+            trace0 = Scatter(
+                x=col,
+                y=residuals_display,
+                mode="markers",
+                name=residuals_name,
+                text=residuals_text,
+                hoverinfo="text",
+            )
 
-        trace1 = go.Scattergl(
-            x=col,
-            y=np.ones(len(preds)) if residuals == "ratio" else np.zeros(len(preds)),
+        line_x = np.array([np.nanmin(col), np.nanmax(col)]) if aggregate else col
+        trace1 = Scatter(
+            x=line_x,
+            y=np.ones(len(line_x)) if residuals == "ratio" else np.zeros(len(line_x)),
             mode="lines",
             name=col_name,
             hoverinfo="none",
@@ -2467,6 +2767,8 @@ def plotly_actual_vs_col(
     target="",
     index_name="index",
     cats_order=None,
+    max_points=None,
+    nbins=100,
 ):
     """Generates a residuals plot vs a particular feature column.
 
@@ -2487,11 +2789,19 @@ def plotly_actual_vs_col(
         index_name (str): identifier for idxs. Defaults to "index".
         cats_order (list, optional): list of categories to display. If None
             defaults to X_col.unique().tolist() so displays all categories.
+        max_points (int, optional): if there are more than max_points points,
+            render box plots with precomputed quartiles (categorical features)
+            or a binned heatmap of the number of points per bin (numerical
+            features) instead of all individual points. Defaults to None
+            (never aggregate).
+        nbins (int, optional): number of bins along each axis when aggregating.
+            Defaults to 100.
 
 
     Returns:
         Plotly fig
     """
+    jitter = np.random.default_rng(seed=0)  # reproducible figures
     if col_name is None:
         try:
             col_name = col.name
@@ -2504,17 +2814,23 @@ def plotly_actual_vs_col(
     else:
         idxs = [str(i) for i in range(len(preds))]
 
-    y_text = [
-        f"{index_name}: {idx}<br>Observed {target}: {actual:.{round}f}<br>Prediction: {pred:.{round}f}"
-        for idx, actual, pred in zip(idxs, y, preds)
-    ]
+    aggregate = _aggregate(len(preds), max_points)
+    Scatter = _scatter_trace(len(preds))
+    if not aggregate:
+        y_text = [
+            f"{index_name}: {idx}<br>Observed {target}: {actual:.{round}f}<br>Prediction: {pred:.{round}f}"
+            for idx, actual, pred in zip(idxs, y, preds)
+        ]
 
     if not is_numeric_dtype(col):
         if cats_order is None:
             cats_order = sorted(col.unique().tolist())
         n_cats = len(cats_order)
 
-        if points:
+        if aggregate:
+            fig = go.Figure([_binned_box(y[col == cat], cat) for cat in cats_order])
+            points = False
+        elif points:
             fig = make_subplots(
                 rows=1,
                 cols=2 * n_cats,
@@ -2529,34 +2845,35 @@ def plotly_actual_vs_col(
             range=[np.percentile(y, winsor), np.percentile(y, 100 - winsor)]
         )
 
-        for i, cat in enumerate(cats_order):
-            column = 1 + i * 2 if points else 1 + i
-            fig.add_trace(
-                go.Violin(
-                    x=col[col == cat],
-                    y=y[col == cat],
-                    name=cat,
-                    box_visible=True,
-                    meanline_visible=True,
-                    showlegend=False,
-                ),
-                row=1,
-                col=column,
-            )
-            if points:
+        if not aggregate:
+            for i, cat in enumerate(cats_order):
+                column = 1 + i * 2 if points else 1 + i
                 fig.add_trace(
-                    go.Scattergl(
-                        x=np.random.randn(len(col[col == cat])),
+                    go.Violin(
+                        x=col[col == cat],
                         y=y[col == cat],
-                        mode="markers",
+                        name=cat,
+                        box_visible=True,
+                        meanline_visible=True,
                         showlegend=False,
-                        text=[t for t, b in zip(y_text, col == cat) if b],
-                        hoverinfo="text",
-                        marker=dict(size=7, opacity=0.6, color="blue"),
                     ),
                     row=1,
-                    col=column + 1,
+                    col=column,
                 )
+                if points:
+                    fig.add_trace(
+                        Scatter(
+                            x=jitter.standard_normal(len(col[col == cat])),
+                            y=y[col == cat],
+                            mode="markers",
+                            showlegend=False,
+                            text=[t for t, b in zip(y_text, col == cat) if b],
+                            hoverinfo="text",
+                            marker=dict(size=7, opacity=0.6, color="blue"),
+                        ),
+                        row=1,
+                        col=column + 1,
+                    )
 
         if points:
             for i in range(n_cats):
@@ -2578,14 +2895,26 @@ def plotly_actual_vs_col(
     else:
         col[col == na_fill] = np.nan
 
-        trace0 = go.Scattergl(
-            x=col,
-            y=y,
-            mode="markers",
-            name="Observed",
-            text=y_text,
-            hoverinfo="text",
-        )
+        if aggregate:
+            trace0 = _binned_heatmap(
+                col,
+                y,
+                nbins=nbins,
+                x_title=col_name,
+                y_title="Observed",
+                round=round,
+                colorscale="Blues",
+                name="Observed",
+            )
+        else:
+            trace0 = Scatter(
+                x=col,
+                y=y,
+                mode="markers",
+                name="Observed",
+                text=y_text,
+                hoverinfo="text",
+            )
 
         data = [trace0]
 
@@ -2621,6 +2950,8 @@ def plotly_preds_vs_col(
     target="",
     index_name="index",
     cats_order=None,
+    max_points=None,
+    nbins=100,
 ):
     """Generates plot of predictions vs a particular feature column.
 
@@ -2641,10 +2972,18 @@ def plotly_preds_vs_col(
         index_name (str): identifier for idxs. Defaults to "index".
         cats_order (list, optional): list of categories to display. If None
             defaults to X_col.unique().tolist() so displays all categories.
+        max_points (int, optional): if there are more than max_points points,
+            render box plots with precomputed quartiles (categorical features)
+            or a binned heatmap of the number of points per bin (numerical
+            features) instead of all individual points. Defaults to None
+            (never aggregate).
+        nbins (int, optional): number of bins along each axis when aggregating.
+            Defaults to 100.
 
     Returns:
         Plotly fig
     """
+    jitter = np.random.default_rng(seed=0)  # reproducible figures
     if col_name is None:
         try:
             col_name = col.name
@@ -2657,17 +2996,23 @@ def plotly_preds_vs_col(
     else:
         idxs = [str(i) for i in range(len(preds))]
 
-    preds_text = [
-        f"{index_name}: {idx}<br>Predicted {target}: {pred:.{round}f}{units}<br>Observed {target}: {actual:.{round}f}{units}"
-        for idx, actual, pred in zip(idxs, y, preds)
-    ]
+    aggregate = _aggregate(len(preds), max_points)
+    Scatter = _scatter_trace(len(preds))
+    if not aggregate:
+        preds_text = [
+            f"{index_name}: {idx}<br>Predicted {target}: {pred:.{round}f}{units}<br>Observed {target}: {actual:.{round}f}{units}"
+            for idx, actual, pred in zip(idxs, y, preds)
+        ]
 
     if not is_numeric_dtype(col):
         if cats_order is None:
             cats_order = sorted(col.unique().tolist())
         n_cats = len(cats_order)
 
-        if points:
+        if aggregate:
+            fig = go.Figure([_binned_box(preds[col == cat], cat) for cat in cats_order])
+            points = False
+        elif points:
             fig = make_subplots(
                 rows=1,
                 cols=2 * n_cats,
@@ -2682,34 +3027,35 @@ def plotly_preds_vs_col(
             range=[np.percentile(preds, winsor), np.percentile(preds, 100 - winsor)]
         )
 
-        for i, cat in enumerate(cats_order):
-            column = 1 + i * 2 if points else 1 + i
-            fig.add_trace(
-                go.Violin(
-                    x=col[col == cat],
-                    y=preds[col == cat],
-                    name=cat,
-                    box_visible=True,
-                    meanline_visible=True,
-                    showlegend=False,
-                ),
-                row=1,
-                col=column,
-            )
-            if points:
+        if not aggregate:
+            for i, cat in enumerate(cats_order):
+                column = 1 + i * 2 if points else 1 + i
                 fig.add_trace(
-                    go.Scattergl(
-                        x=np.random.randn(len(col[col == cat])),
+                    go.Violin(
+                        x=col[col == cat],
                         y=preds[col == cat],
-                        mode="markers",
+                        name=cat,
+                        box_visible=True,
+                        meanline_visible=True,
                         showlegend=False,
-                        text=[t for t, b in zip(preds_text, col == cat) if b],
-                        hoverinfo="text",
-                        marker=dict(size=7, opacity=0.6, color="blue"),
                     ),
                     row=1,
-                    col=column + 1,
+                    col=column,
                 )
+                if points:
+                    fig.add_trace(
+                        Scatter(
+                            x=jitter.standard_normal(len(col[col == cat])),
+                            y=preds[col == cat],
+                            mode="markers",
+                            showlegend=False,
+                            text=[t for t, b in zip(preds_text, col == cat) if b],
+                            hoverinfo="text",
+                            marker=dict(size=7, opacity=0.6, color="blue"),
+                        ),
+                        row=1,
+                        col=column + 1,
+                    )
 
         if points:
             for i in range(n_cats):
@@ -2733,14 +3079,26 @@ def plotly_preds_vs_col(
     else:
         col[col == na_fill] = np.nan
 
-        trace0 = go.Scattergl(
-            x=col,
-            y=preds,
-            mode="markers",
-            name="Predicted",
-            text=preds_text,
-            hoverinfo="text",
-        )
+        if aggregate:
+            trace0 = _binned_heatmap(
+                col,
+                preds,
+                nbins=nbins,
+                x_title=col_name,
+                y_title="Predicted",
+                round=round,
+                colorscale="Blues",
+                name="Predicted",
+            )
+        else:
+            trace0 = Scatter(
+                x=col,
+                y=preds,
+                mode="markers",
+                name="Predicted",
+                text=preds_text,
+                hoverinfo="text",
+            )
 
         data = [trace0]
 
@@ -10,7 +10,6 @@ __all__ = [
     "XGBRegressionExplainer",
 ]
 
-import sys
 import inspect
 from abc import ABC
 import base64
@@ -18,7 +17,7 @@ from pathlib import Path
 from typing import List, Dict, Union, Callable
 from types import MethodType
 from functools import wraps
-from threading import Lock
+from threading import Lock, RLock
 import warnings
 
 import numpy as np
@@ -26,11 +25,6 @@ import pandas as pd
 from pandas.api.types import is_numeric_dtype
 from pandas.errors import OptionError
 
-import shap
-
-from dtreeviz import DTreeVizAPI
-from dtreeviz.models.shadow_decision_tree import ShadowDecTree
-
 from sklearn.model_selection import KFold
 from sklearn.base import clone
 from sklearn.pipeline import Pipeline
@@ -53,6 +47,7 @@ from sklearn.metrics import average_precision_score
 
 from .explainer_methods import *
 from .explainer_plots import *
+from .cache_backends import get_cache_backend
 
 
 import plotly.io as pio
@@ -91,6 +86,64 @@ def insert_pos_label(func):
     return inner
 
 
+def _label_calculated(cache, pos_label) -> bool:
+    """whether a per label cache (a list or a dict keyed by pos_label) holds pos_label"""
+    if isinstance(cache, dict):
+        return pos_label in cache
+    return 0 <= pos_label < len(cache)
+
+
+def timed(attr, per_label=None):
+    """decorator that instruments the calculation of the lazily calculated
+    attribute attr with timed_computation() when it has not been calculated yet,
+    and stores the timings in self._timings (see BaseExplainer.timings()).
+
+    For classifiers that store a result per pos_label in attr, pass per_label,
+    so that a label that has not been calculated yet gets instrumented as well:
+    either True when attr is a list or dict indexed by pos_label, or a function
+    per_label(self, pos_label) that returns whether the result for pos_label
+    has been calculated (pos_label resolved to an int, as with insert_pos_label).
+
+    The calculation holds a lock per attribute, so that threads that need attr
+    at the same time (e.g. in calculate_dependencies()) wait for a single
+    calculation instead of calculating and assigning it concurrently."""
+
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        def calculated(self, args, kwargs):
+            if not hasattr(self, attr):
+                return False
+            if per_label is None or not self.is_classifier:
+                return True
+            pos_label = signature.bind(self, *args, **kwargs).arguments.get("pos_label")
+            pos_label = (
+                self.pos_label if pos_label is None else self.pos_label_index(pos_label)
+            )
+            if per_label is True:
+                return _label_calculated(getattr(self, attr), pos_label)
+            return per_label(self, pos_label)
+
+        @wraps(func)
+        def inner(self, *args, **kwargs):
+            if calculated(self, args, kwargs):
+                return func(self, *args, **kwargs)
+            with self._get_attr_lock(attr):
+                if calculated(self, args, kwargs):
+                    return func(self, *args, **kwargs)
+                with timed_computation(
+                    func.__name__,
+                    shape=self.X.shape,
+                    records=self.__dict__.setdefault("_timings", []),
+                    result=lambda: getattr(self, attr, None),
+                ):
+                    return func(self, *args, **kwargs)
+
+        return inner
+
+    return decorator
+
+
 class BaseExplainer(ABC):
     """ """
 
@@ -115,6 +168,8 @@ class BaseExplainer(ABC):
         na_fill: float = -999,
         precision: str = "float64",
         shap_kwargs: Dict = None,
+        kernel_background_k: int = None,
+        kernel_nsamples: Union[int, str] = "auto",
     ):
         """Defines the basic functionality that is shared by both
         ClassifierExplainer and RegressionExplainer.
@@ -150,8 +205,9 @@ class BaseExplainer(ABC):
             target: name of the predicted target, e.g. "Survival",
                 "Ticket price", etc. Defaults to y.name.
             n_jobs (int): for jobs that can be parallelized using joblib,
-                how many processes to split the job in. For now only used
-                for calculating permutation importances. Defaults to None.
+                how many processes to split the job in. Used for calculating
+                permutation importances and shap='kernel' shap values.
+                Defaults to None.
             permutation_cv (int): Deprecated! Use parameter cv instead!
                 (now also works for calculating metrics)
             cv (int): If not None then permutation importances and metrics
@@ -162,6 +218,13 @@ class BaseExplainer(ABC):
             precision: precision with which to store values. Defaults to "float64".
             shap_kwargs(dict): dictionary of keyword arguments to be passed to the shap explainer.
                 most typically used to supress an additivity check e.g. `shap_kwargs=dict(check_additivity=False)`
+            kernel_background_k (int): with shap='kernel', summarize X_background
+                (or X if not given) with weighted k-means (shap.kmeans) into this
+                many centroids, instead of using a random sample of 50 rows of X.
+                Requires numeric features. Defaults to None.
+            kernel_nsamples ({int, str}): with shap='kernel', the number of times
+                the model gets evaluated to explain each row. Lower is faster but
+                more approximate. Defaults to 'auto' (2 * n_features + 2048).
         """
         self._params_dict = dict(
             shap=shap,
@@ -175,6 +238,8 @@ class BaseExplainer(ABC):
             na_fill=na_fill,
             precision=precision,
             shap_kwargs=shap_kwargs,
+            kernel_background_k=kernel_background_k,
+            kernel_nsamples=kernel_nsamples,
         )
 
         if permutation_cv is not None:
@@ -297,6 +362,8 @@ class BaseExplainer(ABC):
 
         self.metric = permutation_metric
         self.shap_kwargs = shap_kwargs or {}
+        self.kernel_background_k = kernel_background_k
+        self.kernel_nsamples = kernel_nsamples
 
         if shap == "guess":
             shap_guess = guess_shap(self.model)
@@ -361,6 +428,13 @@ class BaseExplainer(ABC):
         self._get_index_list_func = None
         self._get_X_row_func = None
         self._get_y_func = None
+        self._get_X_rows_func = None
+        self._get_y_batch_func = None
+        self._X_row_cache = None
+        self._y_cache = None
+        self._read_ahead = 0
+        self._shap_row_batcher = None
+        self._plot_aggregation = dict(max_points=100_000, nbins=100)
 
         if index_name is None:
             if self.idxs.name is not None:
@@ -399,6 +473,10 @@ class BaseExplainer(ABC):
             self._lock = Lock()
         return self._lock
 
+    def _get_attr_lock(self, attr: str):
+        """returns the lock that guards the lazy calculation of attr"""
+        return self.__dict__.setdefault("_attr_locks", {}).setdefault(attr, RLock())
+
     @classmethod
     def from_file(cls, filepath):
         """Load an Explainer from file. Depending on the suffix of the filepath
@@ -442,15 +520,15 @@ class BaseExplainer(ABC):
             filepath (str, Path): filepath where to save the Explainer.
         """
         filepath = Path(filepath)
-        if self.shap == "kernel" and not str(filepath).endswith(".dill"):
-            print(
-                "Aviso! KernelExplainer não funciona com joblib ou pickle, " # Traduzido
-                "mas apenas com dill, por isso especifique, por exemplo, filepath='explainer.dill' " # Traduzido
-                "para usar dill em vez de joblib ou pickle.", # Traduzido
-                flush=True,
-            )
+        if self.shap == "kernel" and hasattr(self, "_shap_explainer"):
+            # drop the (unpicklable) state of the last rows it explained
+            self._shap_explainer = copy_kernel_explainer(self._shap_explainer)
         if hasattr(self, "_lock"):
             del self._lock  # Python Locks are not picklable
+        if hasattr(self, "_attr_locks"):
+            del self._attr_locks
+        if hasattr(self, "_index_search"):
+            del self._index_search  # gets rebuilt on demand
         if str(filepath).endswith(".pkl") or str(filepath).endswith(".pickle"):
             import pickle
 
@@ -511,8 +589,8 @@ class BaseExplainer(ABC):
                 modelfile=modelfile,
                 datafile=datafile,
                 explainerfile=explainerfile,
-                data_target=self.target,
-                data_index=self.idxs.name,
+                data_target=target_col or self.target,
+                data_index=index_col or self.idxs.name,
                 explainer_type="classificador" if self.is_classifier else "regressão", # Traduzido
                 dashboard_yaml=dashboard_yaml,
                 params=self._params_dict,
@@ -614,6 +692,11 @@ class BaseExplainer(ABC):
                 return True
             if self._get_index_list_func is not None and index in self.get_index_list():
                 return True
+            if (
+                getattr(self, "_X_row_cache", None) is not None
+                and index in self._X_row_cache
+            ):
+                return True
             if self._index_exists_func is not None and self._index_exists_func(index):
                 return True
         return False
@@ -648,9 +731,31 @@ class BaseExplainer(ABC):
             return self.idxs
 
     def reset_index_list(self):
-        """resets the available indexes using the function provided by explainer.set_index_list_func()"""
+        """resets the available indexes using the function provided by explainer.set_index_list_func()
+        and clears the external row cache (see set_row_cache())"""
         if self._get_index_list_func is not None:
             self._index_list = pd.Index(self._get_index_list_func())
+        if hasattr(self, "_index_search"):
+            del self._index_search
+        self.clear_row_cache()
+
+    def get_index_search(self) -> IndexSearch:
+        """returns an IndexSearch over get_index_list(), that gets rebuilt
+        after reset_index_list()"""
+        if not hasattr(self, "_index_search"):
+            self._index_search = IndexSearch(self.get_index_list())
+        return self._index_search
+
+    def search_index(self, search_value: str, max_results: int = 1000) -> List[str]:
+        """returns up to max_results indexes that contain search_value, with
+        indexes that start with search_value listed first.
+
+        Args:
+            search_value (str): string to search for
+            max_results (int): maximum number of indexes to return.
+                Defaults to 1000.
+        """
+        return self.get_index_search().search(search_value, max_results)
 
     def set_index_list_func(self, func):
         """Sets an external function all available indexes from an external source.
@@ -678,8 +783,8 @@ class BaseExplainer(ABC):
             X_row = self.X.iloc[[self.get_idx(index)]]
         elif isinstance(index, int) and index >= 0 and index < len(self):
             X_row = self.X.iloc[[index]]
-        elif self._get_X_row_func is not None and self.index_exists(index):
-            X_row = self._get_X_row_func(index)
+        elif self._external_X_rows_available() and self.index_exists(index):
+            X_row = self._get_external_X_row(index)
         else:
             raise IndexNotFoundError(index=index)
 
@@ -722,8 +827,8 @@ class BaseExplainer(ABC):
             return self.y.iloc[[self.get_idx(index)]].item()
         elif isinstance(index, int) and index >= 0 and index < len(self):
             return self.y.iloc[[index]].item()
-        elif self._get_y_func is not None and self.index_exists(index):
-            y = self._get_y_func(index)
+        elif self._external_y_available() and self.index_exists(index):
+            y = self._get_external_y(index)
             if isinstance(y, pd.Series) or isinstance(y, np.ndarray):
                 try:
                     return y.item()
@@ -753,6 +858,211 @@ class BaseExplainer(ABC):
                 f"passou func={func.__name__}{inspect.signature(func)}" # Traduzido
             )
 
+    def set_X_rows_func(self, func):
+        """Sets an external function to retrieve multiple rows of input data
+        in a single call. Used instead of the function set with set_X_row_func(),
+        and allows read-ahead of neighbouring indexes (see set_row_cache()).
+
+        func should either be a function that takes a single parameter: def func(indexes)
+        or a method that takes a single parameter: def func(self, indexes)
+        and should return a pd.DataFrame with one row for each index in indexes,
+        in the same order.
+        """
+        assert callable(func), f"{func} não é chamável! Passe uma função ou um método!"
+        argspec = inspect.getfullargspec(func).args
+        if argspec == ["self", "indexes"]:
+            self._get_X_rows_func = MethodType(func, self)
+        elif argspec == ["indexes"]:
+            self._get_X_rows_func = func
+        else:
+            raise ValueError(
+                f"O parâmetro func deve ser uma função {func.__name__}(indexes) "
+                f"ou um método {func.__name__}(self, indexes)! Em vez disso, você "
+                f"passou func={func.__name__}{inspect.signature(func)}"
+            )
+
+    def set_y_batch_func(self, func):
+        """Sets an external function to retrieve the observed labels for multiple
+        indexes in a single call. Used instead of the function set with set_y_func(),
+        and allows read-ahead of neighbouring indexes (see set_row_cache()).
+
+        func should either be a function that takes a single parameter: def func(indexes)
+        or a method that takes a single parameter: def func(self, indexes)
+        and should return a pd.Series or np.ndarray with a label for each index
+        in indexes, in the same order.
+        """
+        assert callable(func), f"{func} não é chamável! Passe uma função ou um método!"
+        argspec = inspect.getfullargspec(func).args
+        if argspec == ["self", "indexes"]:
+            self._get_y_batch_func = MethodType(func, self)
+        elif argspec == ["indexes"]:
+            self._get_y_batch_func = func
+        else:
+            raise ValueError(
+                f"O parâmetro func deve ser uma função {func.__name__}(indexes) "
+                f"ou um método {func.__name__}(self, indexes)! Em vez disso, você "
+                f"passou func={func.__name__}{inspect.signature(func)}"
+            )
+
+    def set_data_source(self, source):
+        """Connects an external data source, such as
+        explainerdashboard.datasources.SQLDataSource, to the explainer in one call.
+        Sets the index list, index exists, X rows and (if the source has a
+        target_col) y functions of the explainer to the methods of the source.
+
+        Any columns or dtypes not specified in the source are set to those
+        of the explainer.
+
+        Args:
+            source: object with methods get_index_list(), index_exists(index),
+                get_X_rows(indexes) and get_y(indexes).
+        """
+        if getattr(source, "columns", None) is None:
+            source.columns = list(self.columns)
+        if getattr(source, "dtypes", None) is None:
+            source.dtypes = self.X.dtypes
+        self._get_index_list_func = source.get_index_list
+        self._index_exists_func = source.index_exists
+        self._get_X_rows_func = source.get_X_rows
+        if getattr(source, "target_col", None) is not None:
+            self._get_y_batch_func = source.get_y
+        for attr in ["_index_list", "_index_search"]:
+            if hasattr(self, attr):
+                delattr(self, attr)
+        self.clear_row_cache()
+        self._data_source = source
+
+    def set_row_cache(
+        self,
+        maxsize: int = 1000,
+        ttl: float = None,
+        read_ahead: int = 0,
+        enable: bool = True,
+    ):
+        """Cache the rows and labels retrieved from an external source
+        (see set_X_row_func(), set_X_rows_func(), set_y_func() and set_y_batch_func()),
+        so that multiple components asking for the same index only result in
+        a single call to the external source.
+
+        Args:
+            maxsize (int): maximum number of indexes to keep in the cache.
+                Defaults to 1000.
+            ttl (float): number of seconds after which cached rows expire.
+                Defaults to None (rows never expire).
+            read_ahead (int): when a batch function has been set with
+                set_X_rows_func() or set_y_batch_func(), also fetch the next
+                read_ahead indexes in the index list (see set_index_list_func())
+                in the same call. Defaults to 0.
+            enable (bool): pass enable=False to switch off the cache again.
+                Defaults to True.
+        """
+        if enable:
+            self._X_row_cache = LRUCache(maxsize=maxsize, ttl=ttl)
+            self._y_cache = LRUCache(maxsize=maxsize, ttl=ttl)
+            self._read_ahead = read_ahead
+        else:
+            self._X_row_cache, self._y_cache, self._read_ahead = None, None, 0
+
+    def clear_row_cache(self):
+        """empties the cache of externally retrieved rows and labels"""
+        for cache in [
+            getattr(self, "_X_row_cache", None),
+            getattr(self, "_y_cache", None),
+        ]:
+            if cache is not None:
+                cache.clear()
+
+    def row_cache_stats(self) -> dict:
+        """returns dict with the statistics (size, hits, misses, evictions,
+        hit_rate) of the external row cache for X and y, or None when the
+        cache has not been enabled with set_row_cache()."""
+        if getattr(self, "_X_row_cache", None) is None:
+            return None
+        return dict(X=self._X_row_cache.stats(), y=self._y_cache.stats())
+
+    def _external_X_rows_available(self):
+        return (
+            self._get_X_row_func is not None
+            or getattr(self, "_get_X_rows_func", None) is not None
+        )
+
+    def _external_y_available(self):
+        return (
+            self._get_y_func is not None
+            or getattr(self, "_get_y_batch_func", None) is not None
+        )
+
+    def _read_ahead_indexes(self, index, cache):
+        """returns the indexes following index in the index list that are
+        not yet in cache, up to self._read_ahead of them"""
+        read_ahead = getattr(self, "_read_ahead", 0)
+        if not read_ahead or cache is None or self._get_index_list_func is None:
+            return []
+        index_list = self.get_index_list()
+        try:
+            pos = index_list.get_loc(index)
+        except KeyError:
+            return []
+        if not isinstance(pos, int):
+            return []
+        return [
+            idx
+            for idx in index_list[pos + 1 : pos + 1 + read_ahead]
+            if idx not in cache
+        ]
+
+    def _get_external_X_row(self, index):
+        """retrieves a single row from the external source, using the
+        row cache and batch function when available"""
+        cache = getattr(self, "_X_row_cache", None)
+        if cache is not None:
+            X_row = cache.get(index)
+            if X_row is not None:
+                return X_row
+        if getattr(self, "_get_X_rows_func", None) is not None:
+            indexes = [index] + self._read_ahead_indexes(index, cache)
+            X_rows = self._get_X_rows_func(indexes)
+            if len(X_rows) != len(indexes):
+                raise ValueError(
+                    f"A função de set_X_rows_func devolveu {len(X_rows)} linhas "
+                    f"para {len(indexes)} índices!"
+                )
+            if cache is not None:
+                for i, idx in enumerate(indexes):
+                    cache.set(idx, X_rows.iloc[[i]])
+            return X_rows.iloc[[0]]
+        X_row = self._get_X_row_func(index)
+        if cache is not None:
+            cache.set(index, X_row)
+        return X_row
+
+    def _get_external_y(self, index):
+        """retrieves a single label from the external source, using the
+        row cache and batch function when available"""
+        cache = getattr(self, "_y_cache", None)
+        if cache is not None:
+            y = cache.get(index)
+            if y is not None:
+                return y
+        if getattr(self, "_get_y_batch_func", None) is not None:
+            indexes = [index] + self._read_ahead_indexes(index, cache)
+            ys = self._get_y_batch_func(indexes)
+            if not isinstance(ys, pd.Series):
+                ys = pd.Series(np.asarray(ys).reshape(-1))
+            if len(ys) != len(indexes):
+                raise ValueError(
+                    f"A função de set_y_batch_func devolveu {len(ys)} valores "
+                    f"para {len(indexes)} índices!"
+                )
+            if cache is not None:
+                for i, idx in enumerate(indexes):
+                    cache.set(idx, ys.iloc[[i]])
+            return ys.iloc[[0]]
+        y = self._get_y_func(index)
+        if cache is not None:
+            cache.set(index, y)
+        return y
+
     def get_row_from_input(
         self, inputs: List, ranked_by_shap=False, return_merged=False
     ):
@@ -953,27 +1263,10 @@ class BaseExplainer(ABC):
                 return X[col].value_counts().nlargest(topx).index.tolist()
         elif sort == "shap":
             if topx is None:
-                return (
-                    pd.Series(
-                        self.get_shap_values_df(pos_label)[col].values,
-                        index=self.get_col(col),
-                    )
-                    .abs()
-                    .groupby(level=0, observed=False)
-                    .mean()
-                    .sort_values(ascending=False)
-                    .index.tolist()
-                )
+                return self.mean_abs_shap_per_category(col, pos_label).index.tolist()
             else:
                 return (
-                    pd.Series(
-                        self.get_shap_values_df(pos_label)[col].values,
-                        index=self.get_col(col),
-                    )
-                    .abs()
-                    .groupby(level=0, observed=False)
-                    .mean()
-                    .sort_values(ascending=False)
+                    self.mean_abs_shap_per_category(col, pos_label)
                     .nlargest(topx)
                     .index.tolist()
                 )
@@ -982,7 +1275,46 @@ class BaseExplainer(ABC):
                 f"sort='{sort}', mas deveria estar em {{'alphabet', 'freq', 'shap'}}" # Traduzido
             )
 
+    def mean_abs_shap_per_category(self, col, pos_label=None) -> pd.Series:
+        """Mean absolute shap value of categorical feature col for each of its
+        categories, sorted in descending order. Calculated once per col and
+        pos_label, and then stored.
+
+        Args:
+            col (str): categorical feature
+            pos_label: (Default value = None)
+
+        Returns:
+            pd.Series
+        """
+        if pos_label is None:
+            pos_label = self.pos_label
+        if self.is_classifier:
+            pos_label = self.pos_label_index(pos_label)
+        if not hasattr(self, "_mean_abs_shap_per_category"):
+            self._mean_abs_shap_per_category = {}
+        if (col, pos_label) not in self._mean_abs_shap_per_category:
+            self._mean_abs_shap_per_category[(col, pos_label)] = (
+                pd.Series(
+                    self.get_shap_values_df(pos_label)[col].values,
+                    index=self.get_col(col),
+                )
+                .abs()
+                .groupby(level=0, observed=False)
+                .mean()
+                .sort_values(ascending=False)
+            )
+        return self._mean_abs_shap_per_category[(col, pos_label)]
+
+    def _clear_shap_summaries(self):
+        """drops the stored summaries of shap (interaction) values, so that
+        they get recalculated after the shap values have been changed"""
+        for attr in ["_mean_abs_shap_interactions", "_mean_abs_shap_per_category"]:
+            if hasattr(self, attr):
+                delattr(self, attr)
+
     @property
+    @timed("_preds")
     def preds(self):
         """returns model model predictions"""
         if not hasattr(self, "_preds"):
@@ -998,6 +1330,7 @@ class BaseExplainer(ABC):
 
         return self._preds
 
+    @timed("_pred_percentiles")
     @insert_pos_label
     def pred_percentiles(self, pos_label=None):
         """returns percentile rank of model predictions"""
@@ -1008,6 +1341,7 @@ class BaseExplainer(ABC):
             ).astype(self.precision)
         return self._pred_percentiles
 
+    @timed("_perm_imps")
     @insert_pos_label
     def permutation_importances(self, pos_label=None):
         """Permutation importances"""
@@ -1055,8 +1389,11 @@ class BaseExplainer(ABC):
         return importance_df[importance_df.Importance >= cutoff].head(topx)
 
     @property
+    @timed("_shap_explainer")
     def shap_explainer(self):
         """ """
+        import shap
+
         if not hasattr(self, "_shap_explainer"):
             X_str = ", X_background" if self.X_background is not None else "X"
             NoX_str = ", X_background" if self.X_background is not None else ""
@@ -1073,13 +1410,22 @@ class BaseExplainer(ABC):
                         "contra X_background, mas o parâmetro " # Traduzido
                         "X_background=None, a usar X em vez disso" # Traduzido
                     )
-                print(
-                    f"A gerar self.shap_explainer = shap.LinearExplainer(model{X_str})..." # Traduzido
-                )
-                self._shap_explainer = shap.LinearExplainer(
-                    self.model,
-                    self.X_background if self.X_background is not None else self.X,
-                )
+                if linear_shap_supported(self.model):
+                    print(
+                        f"A gerar self.shap_explainer = LinearShapExplainer(model{X_str})..." # Traduzido
+                    )
+                    self._shap_explainer = LinearShapExplainer(
+                        self.model,
+                        self.X_background if self.X_background is not None else self.X,
+                    )
+                else:
+                    print(
+                        f"A gerar self.shap_explainer = shap.LinearExplainer(model{X_str})..." # Traduzido
+                    )
+                    self._shap_explainer = shap.LinearExplainer(
+                        self.model,
+                        self.X_background if self.X_background is not None else self.X,
+                    )
             elif self.shap == "deep":
                 print(
                     "A gerar self.shap_explainer = " # Traduzido
@@ -1115,7 +1461,10 @@ class BaseExplainer(ABC):
                     else torch.tensor(shap.sample(self.X, 5).values),
                 )
             elif self.shap == "kernel":
-                if self.X_background is None:
+                if (
+                    self.X_background is None
+                    and getattr(self, "kernel_background_k", None) is None
+                ):
                     print(
                         "Aviso: valores SHAP para shap.KernelExplainer são calculados " # Traduzido
                         "contra X_background, mas o parâmetro " # Traduzido
@@ -1125,20 +1474,55 @@ class BaseExplainer(ABC):
                     "A gerar self.shap_explainer = " # Traduzido
                     f"shap.KernelExplainer(model, {X_str})..." # Traduzido
                 )
-
-                def model_predict(data_asarray):
-                    data_asframe = pd.DataFrame(data_asarray, columns=self.columns)
-                    preds = self.model.predict(data_asframe)
-                    return preds.reshape(len(preds))
-
                 self._shap_explainer = shap.KernelExplainer(
-                    model_predict,
-                    self.X_background
-                    if self.X_background is not None
-                    else shap.sample(self.X, 50),
+                    self._kernel_model_predict("predict"), self._kernel_background()
                 )
         return self._shap_explainer
 
+    def _kernel_background(self):
+        """background data for shap.KernelExplainer: X_background (or a sample
+        of 50 rows of X), or its weighted k-means summary when kernel_background_k
+        has been set"""
+        import shap
+
+        k = getattr(self, "kernel_background_k", None)
+        if k is None:
+            return (
+                self.X_background
+                if self.X_background is not None
+                else shap.sample(self.X, 50)
+            )
+        background = self.X_background if self.X_background is not None else self.X
+        if not all(is_numeric_dtype(dtype) for dtype in background.dtypes):
+            raise ValueError(
+                "kernel_background_k requer características numéricas, passe "
+                "um X_background já resumido em vez disso!"
+            )
+        if k >= len(background):
+            return background
+        print(
+            f"A resumir o background com shap.kmeans(X_background, {k})...",
+            flush=True,
+        )
+        return shap.kmeans(background, k)
+
+    def _kernel_model_predict(self, method: str = "predict"):
+        """returns a picklable prediction function for shap.KernelExplainer,
+        that skips building a pd.DataFrame per call if the model accepts arrays"""
+        return KernelModelPredict(
+            self.model,
+            self.columns,
+            method,
+            as_frame=not model_accepts_arrays(self.model, self.X.head(20), method),
+        )
+
+    def _kernel_shap_kwargs(self) -> dict:
+        """shap_kwargs for shap.KernelExplainer.shap_values(), including nsamples"""
+        return dict(
+            dict(nsamples=getattr(self, "kernel_nsamples", "auto")), **self.shap_kwargs
+        )
+
+    @timed("_shap_base_value")
     @insert_pos_label
     def shap_base_value(self, pos_label=None):
         """the intercept for the shap values.
@@ -1155,6 +1539,7 @@ class BaseExplainer(ABC):
                 self._shap_base_value = self._shap_base_value.item()
         return self._shap_base_value
 
+    @timed("_shap_values_df")
     @insert_pos_label
     def get_shap_values_df(self, pos_label=None):
         """SHAP values calculated using the shap library"""
@@ -1169,6 +1554,16 @@ class BaseExplainer(ABC):
                     ),
                     columns=self.columns,
                 )
+            elif self.shap == "kernel":
+                self._shap_values_df = pd.DataFrame(
+                    kernel_shap_values(
+                        self.shap_explainer,
+                        self.X,
+                        n_jobs=self.n_jobs,
+                        **self._kernel_shap_kwargs(),
+                    ),
+                    columns=self.columns,
+                )
             else:
                 self._shap_values_df = pd.DataFrame(
                     self.shap_explainer.shap_values(self.X, **self.shap_kwargs),
@@ -1192,12 +1587,118 @@ class BaseExplainer(ABC):
             shap_values (np.ndarray]): Generated by e.g.
                 shap_values = shap.TreeExplainer(model).shap_values(X_test)
         """
+        self._clear_shap_summaries()
         self._shap_base_value = base_value
         self._shap_values_df = pd.DataFrame(shap_values, columns=self.columns)
         self._shap_values_df = merge_categorical_shap_values(
             self._shap_values_df, self.onehot_dict, self.merged_cols
         ).astype(self.precision)
 
+    def set_shap_row_batching(
+        self,
+        window_ms: float = 10,
+        max_batch_size: int = 64,
+        cache_size: int = 256,
+        cache_backend=None,
+        enable: bool = True,
+    ):
+        """Batch and cache the shap values calculated on the fly by get_shap_row()
+        for X_row inputs and external indexes (see set_X_row_func).
+
+        Normally each such request does its own single row shap_explainer.shap_values()
+        call, and concurrent requests wait for each other on the explainer lock.
+        With batching enabled, requests that arrive within window_ms of each
+        other are calculated together in a single call, and the shap values
+        of the last cache_size unique rows are cached by row content.
+
+        Args:
+            window_ms (float): milliseconds to wait for other requests to
+                join a batch. Defaults to 10.
+            max_batch_size (int): maximum number of rows per shap_values call.
+                Defaults to 64.
+            cache_size (int): number of rows to cache. Pass 0 to disable
+                the cache. Defaults to 256.
+            cache_backend (CacheBackend, str): cache the shap values in a
+                backend that is shared between processes (e.g. all gunicorn
+                workers) instead, or the url or path to create one from, e.g.
+                "sqlite:///cache.db" (see cache_backends). Defaults to None.
+            enable (bool): pass enable=False to switch batching off again.
+                Defaults to True.
+        """
+        if enable:
+            cache = None
+            if cache_backend is not None:
+                cache = get_cache_backend(cache_backend).namespace(
+                    f"shap_rows/{self._model_fingerprint()}/", serialize=True
+                )
+            self._shap_row_batcher = ShapRowBatcher(
+                window_ms=window_ms,
+                max_batch_size=max_batch_size,
+                cache_size=cache_size,
+                cache=cache,
+            )
+        else:
+            self._shap_row_batcher = None
+
+    def _model_fingerprint(self) -> str:
+        """returns a hash of the model and shap settings, so that explainers
+        with different models do not share cached shap values. Gets calculated
+        once per explainer."""
+        if not hasattr(self, "_model_hash"):
+            import joblib
+
+            self._model_hash = joblib.hash(
+                [
+                    self.model,
+                    self.shap,
+                    self.shap_kwargs,
+                    self.model_output,
+                    list(self.columns),
+                ]
+            )
+        return self._model_hash
+
+    def _data_fingerprint(self) -> str:
+        """returns a hash of X and y, so that explainers with the same model
+        but different data do not share cached outputs. Gets calculated once
+        per explainer."""
+        if not hasattr(self, "_data_hash"):
+            import joblib
+
+            self._data_hash = joblib.hash([self.X, self.y])
+        return self._data_hash
+
+    def shap_row_batching_stats(self) -> dict:
+        """returns dict with the number of batches, average batch size and
+        cache statistics of get_shap_row batching (see set_shap_row_batching),
+        or None when batching is not enabled."""
+        if getattr(self, "_shap_row_batcher", None) is None:
+            return None
+        return self._shap_row_batcher.stats()
+
+    def _calculate_shap_values_X(self, X):
+        """calculates the raw shap values for the rows in X using self.shap_explainer"""
+        if self.shap == "skorch":
+            import torch
+
+            X = torch.tensor(X.values.astype("float32"))
+        with self.get_lock():
+            shap_kwargs = (
+                dict(self._kernel_shap_kwargs(), silent=True)
+                if self.shap == "kernel"
+                else self.shap_kwargs
+            )
+            return self.shap_explainer.shap_values(X, **shap_kwargs)
+
+    def _get_X_row_shap_values(self, X_row):
+        """raw shap values for a single X_row, batched and cached when
+        set_shap_row_batching() has been enabled."""
+        if getattr(self, "_shap_row_batcher", None) is not None:
+            return self._shap_row_batcher.shap_values(
+                X_row, self._calculate_shap_values_X
+            )
+        return self._calculate_shap_values_X(X_row)
+
     @insert_pos_label
     def get_shap_row(self, index=None, X_row=None, pos_label=None):
         if index is not None:
@@ -1205,42 +1706,20 @@ class BaseExplainer(ABC):
                 shap_row = self.get_shap_values_df().iloc[[self.idxs.get_loc(index)]]
             elif isinstance(index, int) and index >= 0 and index < len(self):
                 shap_row = self.get_shap_values_df().iloc[[index]]
-            elif self._get_X_row_func is not None and self.index_exists(index):
-                X_row = self._get_X_row_func(index)
-                if self.shap == "skorch":
-                    import torch
-
-                    X_row = torch.tensor(X_row.values.astype("float32"))
-                with self.get_lock():
-                    shap_kwargs = (
-                        dict(self.shap_kwargs, silent=True)
-                        if self.shap == "kernel"
-                        else self.shap_kwargs
-                    )
-                    shap_row = pd.DataFrame(
-                        self.shap_explainer.shap_values(X_row, **self.shap_kwargs),
-                        columns=self.columns,
-                    )
+            elif self._external_X_rows_available() and self.index_exists(index):
+                X_row = self._get_external_X_row(index)
+                shap_row = pd.DataFrame(
+                    self._get_X_row_shap_values(X_row), columns=self.columns
+                )
                 shap_row = merge_categorical_shap_values(
                     shap_row, self.onehot_dict, self.merged_cols
                 )
             else:
                 raise IndexNotFoundError(index=index)
         elif X_row is not None:
-            if self.shap == "skorch":
-                import torch
-
-                X_row = torch.tensor(X_row.values.astype("float32"))
-            with self.get_lock():
-                shap_kwargs = (
-                    dict(self.shap_kwargs, silent=True)
-                    if self.shap == "kernel"
-                    else self.shap_kwargs
-                )
-                shap_row = pd.DataFrame(
-                    self.shap_explainer.shap_values(X_row, **self.shap_kwargs),
-                    columns=self.columns,
-                )
+            shap_row = pd.DataFrame(
+                self._get_X_row_shap_values(X_row), columns=self.columns
+            )
             shap_row = merge_categorical_shap_values(
                 shap_row, self.onehot_dict, self.merged_cols
             )
@@ -1248,6 +1727,7 @@ class BaseExplainer(ABC):
             raise ValueError("Deve passar index ou X_row!") # Traduzido
         return shap_row
 
+    @timed("_shap_interaction_values")
     @insert_pos_label
     def shap_interaction_values(self, pos_label=None):
         """SHAP interaction values calculated using shap library"""
@@ -1297,10 +1777,12 @@ class BaseExplainer(ABC):
                 f"({len(self.X)}, {len(self.original_cols)}, {len(self.original_cols)})!" # Traduzido
             )
 
+        self._clear_shap_summaries()
         self._shap_interaction_values = merge_categorical_shap_interaction_values(
             shap_interaction_values, self.columns, self.merged_cols, self.onehot_dict
         ).astype(self.precision)
 
+    @timed("_mean_abs_shap_df")
     @insert_pos_label
     def mean_abs_shap_df(self, pos_label=None):
         """Mean absolute SHAP values per feature."""
@@ -1376,7 +1858,7 @@ class BaseExplainer(ABC):
         if hasattr(self, "_shap_interaction_values"):
             col_idx = self.merged_cols.get_loc(col)
             order = np.argsort(
-                -np.abs(self.shap_interaction_values(pos_label)[:, col_idx, :]).mean(0)
+                -self.mean_abs_shap_interactions(pos_label)[col_idx, :], kind="stable"
             )
             top_interactions = self.merged_cols[order].tolist()
         else:
@@ -1390,6 +1872,38 @@ class BaseExplainer(ABC):
         else:
             return top_interactions[:topx]
 
+    def _mean_abs_shap_interactions_key(self, pos_label):
+        """for binary classifiers the absolute values are the same for both labels"""
+        return pos_label if self.is_classifier and len(self.labels) > 2 else None
+
+    @timed(
+        "_mean_abs_shap_interactions",
+        per_label=lambda self, pos_label: self._mean_abs_shap_interactions_key(
+            pos_label
+        )
+        in self._mean_abs_shap_interactions,
+    )
+    @insert_pos_label
+    def mean_abs_shap_interactions(self, pos_label=None) -> np.ndarray:
+        """(m, m) matrix of mean absolute shap interaction values between
+        all merged_cols. Calculated once per label, after which finding the
+        top interactions of a feature only takes a single row lookup.
+
+        Args:
+          pos_label:  (Default value = None)
+
+        Returns:
+          np.ndarray
+        """
+        if not hasattr(self, "_mean_abs_shap_interactions"):
+            self._mean_abs_shap_interactions = {}
+        key = self._mean_abs_shap_interactions_key(pos_label)
+        if key not in self._mean_abs_shap_interactions:
+            self._mean_abs_shap_interactions[key] = get_mean_abs_shap_interactions(
+                self.shap_interaction_values(pos_label)
+            )
+        return self._mean_abs_shap_interactions[key]
+
     @insert_pos_label
     def shap_interaction_values_for_col(self, col, interact_col=None, pos_label=None):
         """returns the shap interaction values[np.array(N,N)] for feature col
@@ -1440,48 +1954,20 @@ class BaseExplainer(ABC):
         if self.onehot_cols:
             _ = self.X_cats
         if self.interactions_should_work and include_interactions:
-            _ = self.shap_interaction_values
+            _ = self.mean_abs_shap_interactions()
 
     def memory_usage(self, cutoff=0):
         """returns a pd.DataFrame witht the memory usage of each attribute of
         this explainer object"""
-
-        def get_size(obj):
-            def get_inner_size(obj):
-                if isinstance(obj, pd.DataFrame):
-                    return obj.memory_usage().sum()
-                elif isinstance(obj, pd.Series):
-                    return obj.memory_usage()
-                elif isinstance(obj, pd.Index):
-                    return obj.memory_usage()
-                elif isinstance(obj, np.ndarray):
-                    return obj.nbytes
-                else:
-                    return sys.getsizeof(obj)
-
-            if isinstance(obj, list):
-                return sum([get_inner_size(o) for o in obj])
-            elif isinstance(obj, dict):
-                return sum([get_inner_size(o) for o in obj.values()])
-            else:
-                return get_inner_size(obj)
-
-        def size_to_string(num, suffix="B"):
-            for unit in ["", "Ki", "Mi", "Gi", "Ti", "Pi", "Ei", "Zi"]:
-                if np.abs(num) < 1024.0:
-                    return "%3.1f%s%s" % (num, unit, suffix)
-                num /= 1024.0
-            return "%.1f%s%s" % (num, "Yi", suffix)
-
         memory_df = pd.DataFrame(columns=["property", "type", "bytes", "size"])
-        for k, v in self.__dict__.items():
+        for k, v in list(self.__dict__.items()):
             memory_df = append_dict_to_df(
                 memory_df,
                 dict(
                     property=f"self.{k}",
                     type=v.__class__.__name__,
-                    bytes=get_size(v),
-                    size=size_to_string(get_size(v)),
+                    bytes=get_object_size(v),
+                    size=size_to_string(get_object_size(v)),
                 ),
             )
 
@@ -1496,6 +1982,29 @@ class BaseExplainer(ABC):
             .reset_index(drop=True)
         )
 
+    def timings(self) -> pd.DataFrame:
+        """returns a pd.DataFrame with a row for each lazily calculated property
+        that has been calculated, in order of completion: the wall time and cpu
+        time in seconds, the shape of X, the size of the result in bytes and the
+        error if it failed. Properties that got calculated as part of another
+        property have that property as parent (and their time is included in
+        the time of the parent). Register a callback with
+        explainerdashboard.explainer_methods.add_timing_callback() to receive
+        these timings as they happen."""
+        return pd.DataFrame(
+            getattr(self, "_timings", []),
+            columns=[
+                "name",
+                "parent",
+                "n_rows",
+                "n_cols",
+                "wall_time",
+                "cpu_time",
+                "result_bytes",
+                "error",
+            ],
+        )
+
     def random_index(
         self,
         y_min=None,
@@ -1519,37 +2028,30 @@ class BaseExplainer(ABC):
           if y_values is given select an index for which y in y_values
           if return_str return str index from self.idxs
         """
-
-        if pred_min is None:
-            pred_min = self.preds.min()
-        if pred_max is None:
-            pred_max = self.preds.max()
-
+        constraints = [
+            (self._sorted_range_index("preds", self.preds), [(pred_min, pred_max)])
+        ]
         if not self.y_missing:
-            if y_min is None:
-                y_min = self.y.min()
-            if y_max is None:
-                y_max = self.y.max()
-
-            potential_idxs = self.y[
-                (self.y >= y_min)
-                & (self.y <= y_max)
-                & (self.preds >= pred_min)
-                & (self.preds <= pred_max)
-            ].index
-        else:
-            potential_idxs = self.y[
-                (self.preds >= pred_min) & (self.preds <= pred_max)
-            ].index
+            constraints.append(
+                (self._sorted_range_index("y", self.y), [(y_min, y_max)])
+            )
 
-        if len(potential_idxs) > 0:
-            idx = np.random.choice(potential_idxs)
-        else:
+        idx = random_row_in_ranges(constraints)
+        if idx is None:
             return None
         if return_str:
             return self.idxs[idx]
         return idx
 
+    def _sorted_range_index(self, name, values):
+        """SortedRangeIndex of values, stored under name, so that random_index()
+        can resolve range constraints with a binary search"""
+        if not hasattr(self, "_sorted_range_indexes"):
+            self._sorted_range_indexes = {}
+        if name not in self._sorted_range_indexes:
+            self._sorted_range_indexes[name] = SortedRangeIndex(values)
+        return self._sorted_range_indexes[name]
+
     def metrics(self, *args, **kwargs):
         """returns a dict of metrics.
 
@@ -1935,6 +2437,7 @@ class BaseExplainer(ABC):
             title=title,
             na_fill=self.na_fill,
             max_cat_colors=max_cat_colors,
+            **self._plot_aggregation_kwargs(),
         )
 
     @insert_pos_label
@@ -1997,42 +2500,131 @@ class BaseExplainer(ABC):
             units=self.units,
         )
 
+    def set_plot_aggregation(
+        self, max_points: int = 100_000, nbins: int = 100, enable: bool = True
+    ):
+        """Above max_points points, the scatter plots (importances detailed,
+        dependence, interaction, and the regression plots) get rendered as
+        server-side binned heatmaps (or box plots with precomputed quartiles)
+        instead of sending every point to the browser. A highlighted index
+        is still displayed as an exact point. Enabled by default for plots
+        of more than 100,000 points.
+
+        Args:
+            max_points (int): aggregate plots with more than max_points points.
+                Defaults to 100_000.
+            nbins (int): number of bins along each axis. Defaults to 100.
+            enable (bool): pass enable=False to always plot all individual
+                points. Defaults to True.
+        """
+        if enable:
+            self._plot_aggregation = dict(max_points=max_points, nbins=nbins)
+        else:
+            self._plot_aggregation = {}
+
+    def _plot_aggregation_kwargs(self) -> dict:
+        return getattr(self, "_plot_aggregation", {})
+
+    def _plot_sample_strata(self) -> np.ndarray:
+        """stratum of each row for the plot sample: deciles of the predictions"""
+        return (
+            pd.qcut(pd.Series(self.preds).rank(method="first"), 10, labels=False)
+            .fillna(-1)
+            .values
+        )
+
+    def plot_sample_order(self, seed: int = 0) -> np.ndarray:
+        """returns a (cached) seeded ordering of all rows such that the first
+        k rows form a stratified sample of size k (stratified on prediction
+        deciles, and for classifiers also on the label). Used by get_idx_sample()
+        so that plots with the same plot_sample always show the same points."""
+        if not hasattr(self, "_plot_sample_orders"):
+            self._plot_sample_orders = {}
+        if seed not in self._plot_sample_orders:
+            self._plot_sample_orders[seed] = stratified_sample_order(
+                self._plot_sample_strata(), seed=seed
+            )
+        return self._plot_sample_orders[seed]
+
+    def outlier_bounds(self, col: str, within: str = None):
+        """returns (cached) (lower, upper) bounds of feature col beyond which
+        values are more than 1.5*IQR outside of the interquartile range.
+        Missing values (na_fill) count as values, so that rows with missing
+        values are only outliers when na_fill is far outside the range of col.
+
+        Args:
+            col (str): feature to calculate the bounds for
+            within (str, optional): only use the rows that are within the
+                outlier_bounds() of this feature. Defaults to None.
+        """
+        if not hasattr(self, "_outlier_bounds"):
+            self._outlier_bounds = {}
+        if (col, within) not in self._outlier_bounds:
+            values = self.get_col(col).values
+            if within is not None:
+                lb, ub = self.outlier_bounds(within)
+                within_values = self.get_col(within).values
+                values = values[(within_values >= lb) & (within_values <= ub)]
+            self._outlier_bounds[(col, within)] = get_iqr_bounds(values)
+        return self._outlier_bounds[(col, within)]
+
     def get_idx_sample(
         self,
         sample_size=None,
         include_index=None,
         outlier_array1=None,
         outlier_array2=None,
+        seed=0,
     ):
-        """returns a random sample of integer indexes, making sure that
+        """returns a sample of integer indexes, making sure that
         include_index is included. Outlier indexes can be excluded.
 
+        The sample is deterministic: it consists of the first sample_size
+        (non-outlier) rows of plot_sample_order(seed), so that repeated calls
+        return the same stratified sample and samples of the same size
+        are shared between plots.
+
         Args:
-            sample_size: Number of (random) samples to return
-            include_index: index that has to be included, independent of random draw
-            outlier_array1: array to exclude all indexes with values <> 1.5*IQR from.
-            outlier_array2: array to exclude all indexes with values <> 1.5*IQR from.
+            sample_size: Number of samples to return
+            include_index: index that has to be included, independent of the sample
+            outlier_array1: feature name (using cached bounds) or array to exclude
+                all indexes with values <> 1.5*IQR from.
+            outlier_array2: feature name (using cached bounds) or array to exclude
+                all indexes with values <> 1.5*IQR from.
+            seed: seed of the sample. Defaults to 0.
         """
-
         idx_sample = np.arange(0, len(self))
         if sample_size is None and outlier_array1 is None and outlier_array2 is None:
             return idx_sample
         else:
-            if outlier_array1 is not None:
-                q1, q3 = np.nanpercentile(outlier_array1, [25, 75])
-                lb, ub = q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
-                idx_sample = idx_sample[(outlier_array1 >= lb) & (outlier_array1 <= ub)]
-            if outlier_array2 is not None:
-                q1, q3 = np.nanpercentile(outlier_array2[idx_sample], [25, 75])
-                lb, ub = q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
+            idx_sample = self.plot_sample_order(seed)
+            # the bounds of outlier_array2 get calculated over the rows that
+            # remain after removing the outliers of outlier_array1:
+            filtered, filtered_col = False, None
+            for outlier_array in [outlier_array1, outlier_array2]:
+                if outlier_array is None:
+                    continue
+                if isinstance(outlier_array, str) and (
+                    not filtered or filtered_col is not None
+                ):
+                    lb, ub = self.outlier_bounds(outlier_array, within=filtered_col)
+                    filtered_col = outlier_array
+                    outlier_array = self.get_col(outlier_array).values
+                else:
+                    if isinstance(outlier_array, str):
+                        outlier_array = self.get_col(outlier_array).values
+                    lb, ub = get_iqr_bounds(outlier_array[idx_sample])
+                    filtered_col = None
+                filtered = True
                 idx_sample = idx_sample[
-                    (outlier_array2[idx_sample] >= lb)
-                    & (outlier_array2[idx_sample] <= ub)
+                    (outlier_array[idx_sample] >= lb)
+                    & (outlier_array[idx_sample] <= ub)
                 ]
 
             if sample_size is not None and sample_size < len(idx_sample):
                 assert sample_size >= 0, "sample_size deve ser um inteiro positivo!" # Traduzido
-                idx_sample = np.random.choice(idx_sample, sample_size, replace=False)
+                idx_sample = idx_sample[:sample_size]
+            idx_sample = np.sort(idx_sample)
 
             if include_index is not None:
                 if isinstance(include_index, str):
@@ -2090,10 +2682,8 @@ class BaseExplainer(ABC):
         plot_idxs = self.get_idx_sample(
             plot_sample,
             highlight_index,
-            self.get_col(col).values
-            if remove_outliers and col not in self.cat_cols
-            else None,
-            self.get_col(color_col).values
+            col if remove_outliers and col not in self.cat_cols else None,
+            color_col
             if remove_outliers
             and color_col is not None
             and color_col not in self.cat_cols
@@ -2127,6 +2717,7 @@ class BaseExplainer(ABC):
                 highlight_index=highlight_index,
                 idxs=self.idxs[plot_idxs],
                 round=round,
+                **self._plot_aggregation_kwargs(),
             )
 
     @insert_pos_label
@@ -2166,10 +2757,8 @@ class BaseExplainer(ABC):
         plot_idxs = self.get_idx_sample(
             plot_sample,
             highlight_index,
-            self.get_col(col).values
-            if remove_outliers and col not in self.cat_cols
-            else None,
-            self.get_col(interact_col).values
+            col if remove_outliers and col not in self.cat_cols else None,
+            interact_col
             if remove_outliers and interact_col not in self.cat_cols
             else None,
         )
@@ -2200,6 +2789,7 @@ class BaseExplainer(ABC):
                 units=self.units,
                 highlight_index=highlight_index,
                 idxs=self.idxs[plot_idxs],
+                **self._plot_aggregation_kwargs(),
             )
 
     @insert_pos_label
@@ -2267,6 +2857,7 @@ class BaseExplainer(ABC):
             highlight_index=highlight_index,
             na_fill=self.na_fill,
             max_cat_colors=max_cat_colors,
+            **self._plot_aggregation_kwargs(),
         )
 
     @insert_pos_label
@@ -2382,6 +2973,8 @@ class ClassifierExplainer(BaseExplainer):
         shap_kwargs: Dict = None,
         labels: List = None,
         pos_label: int = 1,
+        kernel_background_k: int = None,
+        kernel_nsamples: Union[int, str] = "auto",
     ):
         """
         Explainer for classification models. Defines the shap values for
@@ -2425,8 +3018,9 @@ class ClassifierExplainer(BaseExplainer):
             target: name of the predicted target, e.g. "Survival",
                 "Ticket price", etc. Defaults to y.name.
             n_jobs (int): for jobs that can be parallelized using joblib,
-                how many processes to split the job in. For now only used
-                for calculating permutation importances. Defaults to None.
+                how many processes to split the job in. Used for calculating
+                permutation importances and shap='kernel' shap values.
+                Defaults to None.
             permutation_cv (int): Deprecated! Use parameter cv instead!
                 (now also works for calculating metrics)
             cv (int): If not None then permutation importances and metrics
@@ -2441,6 +3035,13 @@ class ClassifierExplainer(BaseExplainer):
                         defaults to e.g. ['0', '1'] for a binary classification
             pos_label: class that should be used as the positive class,
                         defaults to 1
+            kernel_background_k (int): with shap='kernel', summarize X_background
+                (or X if not given) with weighted k-means (shap.kmeans) into this
+                many centroids, instead of using a random sample of 50 rows of X.
+                Requires numeric features. Defaults to None.
+            kernel_nsamples ({int, str}): with shap='kernel', the number of times
+                the model gets evaluated to explain each row. Lower is faster but
+                more approximate. Defaults to 'auto' (2 * n_features + 2048).
         """
         super().__init__(
             model,
@@ -2462,6 +3063,8 @@ class ClassifierExplainer(BaseExplainer):
             na_fill,
             precision,
             shap_kwargs,
+            kernel_background_k,
+            kernel_nsamples,
         )
 
         assert hasattr(model, "predict_proba"), (
@@ -2576,6 +3179,7 @@ class ClassifierExplainer(BaseExplainer):
         return self._y_binaries[pos_label]
 
     @property
+    @timed("_pred_probas")
     def pred_probas_raw(self):
         """returns pred_probas with probability for each class"""
         if not hasattr(self, "_pred_probas"):
@@ -2596,6 +3200,7 @@ class ClassifierExplainer(BaseExplainer):
         return self._pred_probas
 
     @property
+    @timed("_pred_percentiles_raw")
     def pred_percentiles_raw(self):
         """ """
         if not hasattr(self, "_pred_percentiles_raw"):
@@ -2618,6 +3223,15 @@ class ClassifierExplainer(BaseExplainer):
         """returns ranks for pos_label class"""
         return self.pred_percentiles_raw[:, pos_label]
 
+    def _plot_sample_strata(self) -> np.ndarray:
+        """stratum of each row for the plot sample: deciles of the predicted
+        probability of the positive class, combined with the observed label"""
+        deciles = np.minimum((self.pred_percentiles() * 10).astype(int), 9)
+        if self.y_missing:
+            return deciles
+        return deciles * len(self.labels) + self.y.values.astype(int)
+
+    @timed("_perm_imps", per_label=True)
     @insert_pos_label
     def permutation_importances(self, pos_label=None):
         """Permutation importances"""
@@ -2644,11 +3258,14 @@ class ClassifierExplainer(BaseExplainer):
         return self._perm_imps[pos_label]
 
     @property
+    @timed("_shap_explainer")
     def shap_explainer(self):
         """Initialize SHAP explainer.
 
         Taking into account model type and model_output
         """
+        import shap
+
         if not hasattr(self, "_shap_explainer"):
             model_str = (
                 str(type(self.model))
@@ -2726,15 +3343,24 @@ class ClassifierExplainer(BaseExplainer):
                         "Nota: valores SHAP para shap='linear' são calculados contra " # Traduzido
                         "X_background, mas o parâmetro X_background=None, a usar X em vez disso..." # Traduzido
                     )
-                print(
-                    "A gerar self.shap_explainer = shap.LinearExplainer(model, " # Traduzido
-                    f"{'X_background' if self.X_background is not None else 'X'})..." # Traduzido
-                )
-
-                self._shap_explainer = shap.LinearExplainer(
-                    self.model,
-                    self.X_background if self.X_background is not None else self.X,
-                )
+                if linear_shap_supported(self.model):
+                    print(
+                        "A gerar self.shap_explainer = LinearShapExplainer(model, " # Traduzido
+                        f"{'X_background' if self.X_background is not None else 'X'})..." # Traduzido
+                    )
+                    self._shap_explainer = LinearShapExplainer(
+                        self.model,
+                        self.X_background if self.X_background is not None else self.X,
+                    )
+                else:
+                    print(
+                        "A gerar self.shap_explainer = shap.LinearExplainer(model, " # Traduzido
+                        f"{'X_background' if self.X_background is not None else 'X'})..." # Traduzido
+                    )
+                    self._shap_explainer = shap.LinearExplainer(
+                        self.model,
+                        self.X_background if self.X_background is not None else self.X,
+                    )
             elif self.shap == "deep":
                 print(
                     "A gerar self.shap_explainer = " # Traduzido
@@ -2772,7 +3398,10 @@ class ClassifierExplainer(BaseExplainer):
                     ),
                 )
             elif self.shap == "kernel":
-                if self.X_background is None:
+                if (
+                    self.X_background is None
+                    and getattr(self, "kernel_background_k", None) is None
+                ):
                     print(
                         "Nota: valores SHAP para shap='kernel' normalmente são calculados contra " # Traduzido
                         "X_background, mas o parâmetro X_background=None, a definir " # Traduzido
@@ -2789,19 +3418,14 @@ class ClassifierExplainer(BaseExplainer):
                     ", link='identity')" # Traduzido
                 )
 
-                def model_predict(data_asarray):
-                    data_asframe = pd.DataFrame(data_asarray, columns=self.columns)
-                    return self.model.predict_proba(data_asframe)
-
                 self._shap_explainer = shap.KernelExplainer(
-                    model_predict,
-                    self.X_background
-                    if self.X_background is not None
-                    else shap.sample(self.X, 50),
+                    self._kernel_model_predict("predict_proba"),
+                    self._kernel_background(),
                     link="identity",
                 )
         return self._shap_explainer
 
+    @timed("_shap_base_value", per_label=True)
     @insert_pos_label
     def shap_base_value(self, pos_label=None):
         """SHAP base value: average outcome of population"""
@@ -2840,6 +3464,7 @@ class ClassifierExplainer(BaseExplainer):
                     )
         return self._shap_base_value[pos_label]
 
+    @timed("_shap_values_df")
     @insert_pos_label
     def get_shap_values_df(self, pos_label=None):
         """SHAP Values"""
@@ -2851,6 +3476,13 @@ class ClassifierExplainer(BaseExplainer):
                 _shap_values = self.shap_explainer.shap_values(
                     torch.tensor(self.X.values.astype("float32")), **self.shap_kwargs
                 )
+            elif self.shap == "kernel":
+                _shap_values = kernel_shap_values(
+                    self.shap_explainer,
+                    self.X.values,
+                    n_jobs=self.n_jobs,
+                    **self._kernel_shap_kwargs(),
+                )
             else:
                 _shap_values = self.shap_explainer.shap_values(
                     self.X.values, **self.shap_kwargs
@@ -2971,6 +3603,7 @@ class ClassifierExplainer(BaseExplainer):
                 "base value deve ser uma lista com um valor esperado " # Traduzido
                 f"para cada classe, portanto deve ter comprimento {len(self.labels)}" # Traduzido
             )
+        self._clear_shap_summaries()
         self._shap_base_value = base_value
 
         self._shap_values_df = []
@@ -3005,17 +3638,7 @@ class ClassifierExplainer(BaseExplainer):
     @insert_pos_label
     def get_shap_row(self, index=None, X_row=None, pos_label=None):
         def X_row_to_shap_row(X_row):
-            if self.shap == "skorch":
-                import torch
-
-                X_row = torch.tensor(X_row.values.astype("float32"))
-            with self.get_lock():
-                shap_kwargs = (
-                    dict(self.shap_kwargs, silent=True)
-                    if self.shap == "kernel"
-                    else self.shap_kwargs
-                )
-                sv = self.shap_explainer.shap_values(X_row, **shap_kwargs)
+            sv = self._get_X_row_shap_values(X_row)
             if isinstance(sv, np.ndarray) and len(sv.shape) > 2:
                 shap_row = pd.DataFrame(sv[:, :, pos_label], columns=self.columns)
             elif isinstance(sv, list) and len(sv) > 1:
@@ -3049,8 +3672,8 @@ class ClassifierExplainer(BaseExplainer):
                 ]
             elif isinstance(index, int) and index >= 0 and index < len(self):
                 shap_row = self.get_shap_values_df(pos_label=pos_label).iloc[[index]]
-            elif self._get_X_row_func is not None and self.index_exists(index):
-                return X_row_to_shap_row(self._get_X_row_func(index))
+            elif self._external_X_rows_available() and self.index_exists(index):
+                return X_row_to_shap_row(self._get_external_X_row(index))
             else:
                 raise IndexNotFoundError(index=index)
         elif X_row is not None:
@@ -3059,6 +3682,7 @@ class ClassifierExplainer(BaseExplainer):
             raise ValueError("Deve passar index ou X_row!") # Traduzido
         return shap_row
 
+    @timed("_shap_interaction_values")
     @insert_pos_label
     def shap_interaction_values(self, pos_label=None):
         """SHAP interaction values"""
@@ -3155,6 +3779,7 @@ class ClassifierExplainer(BaseExplainer):
             shap_interaction_values (np.ndarray): shap interactions values of shape (n, m, m)
 
         """
+        self._clear_shap_summaries()
         self._shap_interaction_values = []
         if not isinstance(shap_interaction_values, list):
             raise ValueError(
@@ -3185,6 +3810,7 @@ class ClassifierExplainer(BaseExplainer):
         if len(self.labels) == 2:
             self._shap_interaction_values = self._shap_interaction_values[1]
 
+    @timed("_mean_abs_shap_df", per_label=True)
     @insert_pos_label
     def mean_abs_shap_df(self, pos_label=None):
         """mean absolute SHAP values"""
@@ -3216,6 +3842,7 @@ class ClassifierExplainer(BaseExplainer):
             self._shap_values_df = self.get_shap_values_df(pos_label)
         if hasattr(self, "_shap_interaction_values"):
             self._shap_interaction_values = self.shap_interaction_values(pos_label)
+        self._clear_shap_summaries()
 
     @insert_pos_label
     def cutoff_from_percentile(self, percentile, pos_label=None):
@@ -3258,6 +3885,7 @@ class ClassifierExplainer(BaseExplainer):
             return None
         return 1 - (self.pred_probas(pos_label) < cutoff).mean()
 
+    @timed("_metrics", per_label=True)
     @insert_pos_label
     def metrics(
         self,
@@ -3494,52 +4122,44 @@ class ClassifierExplainer(BaseExplainer):
             and pred_percentile_min is None
             and pred_percentile_max is None
         ):
-            potential_idxs = self.idxs.values
+            idx = np.random.randint(len(self.idxs))
         else:
-            pred_probas = self.pred_probas(pos_label)
-            pred_percentiles = self.pred_percentiles(pos_label)
-            if pred_proba_min is None:
-                pred_proba_min = pred_probas.min()
-            if pred_proba_max is None:
-                pred_proba_max = pred_probas.max()
+            pos_label = self.pos_label if pos_label is None else pos_label
+            pos_label = self.pos_label_index(pos_label)
             if pred_percentile_min is None:
                 pred_percentile_min = 0.0
-            if pred_percentile_max is None:
-                pred_percentile_max = 1.0
-
-            if not self.y_missing:
-                if y_values is None:
-                    y_values = self.y.unique().astype(str).tolist()
+            constraints = [
+                (
+                    self._sorted_range_index(
+                        ("pred_probas", pos_label), self.pred_probas(pos_label)
+                    ),
+                    [(pred_proba_min, pred_proba_max)],
+                ),
+                (
+                    self._sorted_range_index(
+                        ("pred_percentiles", pos_label),
+                        self.pred_percentiles(pos_label),
+                    ),
+                    [(pred_percentile_min, pred_percentile_max, False)],
+                ),
+            ]
+            if not self.y_missing and y_values is not None:
                 if not isinstance(y_values, list):
                     y_values = [y_values]
                 y_values = [
                     y if isinstance(y, int) else self.labels.index(str(y))
                     for y in y_values
                 ]
+                constraints.append(
+                    (self._sorted_range_index("y", self.y), [(y, y) for y in y_values])
+                )
+            idx = random_row_in_ranges(constraints)
 
-                potential_idxs = self.idxs[
-                    (self.y.isin(y_values))
-                    & (pred_probas >= pred_proba_min)
-                    & (pred_probas <= pred_proba_max)
-                    & (pred_percentiles > pred_percentile_min)
-                    & (pred_percentiles <= pred_percentile_max)
-                ].values
-
-            else:
-                potential_idxs = self.idxs[
-                    (pred_probas >= pred_proba_min)
-                    & (pred_probas <= pred_proba_max)
-                    & (pred_percentiles > pred_percentile_min)
-                    & (pred_percentiles <= pred_percentile_max)
-                ].values
-
-        if len(potential_idxs) > 0:
-            idx = np.random.choice(potential_idxs)
-        else:
+        if idx is None:
             return None
         if return_str:
-            return idx
-        return self.idxs.get_loc(idx)
+            return self.idxs[idx]
+        return idx
 
     def prediction_result_df(
         self, index=None, X_row=None, add_star=True, logodds=False, round=3
@@ -3623,6 +4243,7 @@ class ClassifierExplainer(BaseExplainer):
                 round=round,
             )
 
+    @timed("_liftcurve_dfs", per_label=True)
     @insert_pos_label
     def get_liftcurve_df(self, pos_label=None):
         """returns a pd.DataFrame with data needed to build a lift curve
@@ -3641,6 +4262,7 @@ class ClassifierExplainer(BaseExplainer):
             ]
         return self._liftcurve_dfs[pos_label]
 
+    @timed("_classification_dfs", per_label=True)
     @insert_pos_label
     def get_classification_df(self, cutoff=0.5, pos_label=None):
         """Returns a dataframe with number of observations in each class above
@@ -3683,6 +4305,7 @@ class ClassifierExplainer(BaseExplainer):
         else:
             return get_clas_df(cutoff, pos_label)
 
+    @timed("_roc_auc_curves", per_label=True)
     @insert_pos_label
     def roc_auc_curve(self, pos_label=None):
         """Returns a dict with output from sklearn.metrics.roc_curve() for pos_label:
@@ -3699,6 +4322,7 @@ class ClassifierExplainer(BaseExplainer):
                 )
         return self._roc_auc_curves[pos_label]
 
+    @timed("_pr_auc_curves", per_label=True)
     @insert_pos_label
     def pr_auc_curve(self, pos_label=None):
         """Returns a dict with output from sklearn.metrics.precision_recall_curve() for pos_label:
@@ -3722,6 +4346,11 @@ class ClassifierExplainer(BaseExplainer):
                 )
         return self._pr_auc_curves[pos_label]
 
+    @timed(
+        "_confusion_matrices",
+        per_label=lambda self, pos_label: pos_label
+        in self._confusion_matrices["binary"],
+    )
     @insert_pos_label
     def confusion_matrix(self, cutoff=0.5, binary=True, pos_label=None):
         def get_binary_cm(y, pred_probas, cutoff, pos_label):
@@ -4025,6 +4654,8 @@ class RegressionExplainer(BaseExplainer):
         precision: str = "float64",
         shap_kwargs: Dict = None,
         units: str = "",
+        kernel_background_k: int = None,
+        kernel_nsamples: Union[int, str] = "auto",
     ):
         """Explainer for regression models.
 
@@ -4064,8 +4695,9 @@ class RegressionExplainer(BaseExplainer):
             target: name of the predicted target, e.g. "Survival",
                 "Ticket price", etc. Defaults to y.name.
             n_jobs (int): for jobs that can be parallelized using joblib,
-                how many processes to split the job in. For now only used
-                for calculating permutation importances. Defaults to None.
+                how many processes to split the job in. Used for calculating
+                permutation importances and shap='kernel' shap values.
+                Defaults to None.
             permutation_cv (int): Deprecated! Use parameter cv instead!
                 (now also works for calculating metrics)
             cv (int): If not None then permutation importances and metrics
@@ -4077,6 +4709,13 @@ class RegressionExplainer(BaseExplainer):
             shap_kwargs(dict): dictionary of keyword arguments to be passed to the shap explainer.
                 most typically used to supress an additivity check e.g. `shap_kwargs=dict(check_additivity=False)`
             units(str): units to display for regression quantity
+            kernel_background_k (int): with shap='kernel', summarize X_background
+                (or X if not given) with weighted k-means (shap.kmeans) into this
+                many centroids, instead of using a random sample of 50 rows of X.
+                Requires numeric features. Defaults to None.
+            kernel_nsamples ({int, str}): with shap='kernel', the number of times
+                the model gets evaluated to explain each row. Lower is faster but
+                more approximate. Defaults to 'auto' (2 * n_features + 2048).
         """
         super().__init__(
             model,
@@ -4098,6 +4737,8 @@ class RegressionExplainer(BaseExplainer):
             na_fill,
             precision,
             shap_kwargs,
+            kernel_background_k,
+            kernel_nsamples,
         )
 
         self._params_dict = {**self._params_dict, **dict(units=units)}
@@ -4116,6 +4757,7 @@ class RegressionExplainer(BaseExplainer):
         _ = self.shap_explainer
 
     @property
+    @timed("_residuals")
     def residuals(self):
         """residuals: y-preds"""
         if not hasattr(self, "_residuals"):
@@ -4124,6 +4766,7 @@ class RegressionExplainer(BaseExplainer):
         return self._residuals
 
     @property
+    @timed("_abs_residuals")
     def abs_residuals(self):
         """absolute residuals"""
         if not hasattr(self, "_abs_residuals"):
@@ -4162,50 +4805,30 @@ class RegressionExplainer(BaseExplainer):
           a random index that fits the exclusion criteria
 
         """
-        if self.y_missing:
-            if pred_min is None:
-                pred_min = self.preds.min()
-            if pred_max is None:
-                pred_max = self.preds.max()
-            potential_idxs = self.idxs[
-                (self.preds >= pred_min) & (self.preds <= pred_max)
-            ].values
-        else:
-            if y_min is None:
-                y_min = self.y.min()
-            if y_max is None:
-                y_max = self.y.max()
-            if pred_min is None:
-                pred_min = self.preds.min()
-            if pred_max is None:
-                pred_max = self.preds.max()
-            if residuals_min is None:
-                residuals_min = self.residuals.min()
-            if residuals_max is None:
-                residuals_max = self.residuals.max()
-            if abs_residuals_min is None:
-                abs_residuals_min = self.abs_residuals.min()
-            if abs_residuals_max is None:
-                abs_residuals_max = self.abs_residuals.max()
-
-            potential_idxs = self.idxs[
-                (self.y >= y_min)
-                & (self.y <= y_max)
-                & (self.preds >= pred_min)
-                & (self.preds <= pred_max)
-                & (self.residuals >= residuals_min)
-                & (self.residuals <= residuals_max)
-                & (self.abs_residuals >= abs_residuals_min)
-                & (self.abs_residuals <= abs_residuals_max)
-            ].values
-
-        if len(potential_idxs) > 0:
-            idx = np.random.choice(potential_idxs)
-        else:
+        constraints = [
+            (self._sorted_range_index("preds", self.preds), [(pred_min, pred_max)])
+        ]
+        if not self.y_missing:
+            constraints.extend(
+                [
+                    (self._sorted_range_index("y", self.y), [(y_min, y_max)]),
+                    (
+                        self._sorted_range_index("residuals", self.residuals),
+                        [(residuals_min, residuals_max)],
+                    ),
+                    (
+                        self._sorted_range_index("abs_residuals", self.abs_residuals),
+                        [(abs_residuals_min, abs_residuals_max)],
+                    ),
+                ]
+            )
+
+        idx = random_row_in_ranges(constraints)
+        if idx is None:
             return None
         if return_str:
-            return idx
-        return self.idxs.get_loc(idx)
+            return self.idxs[idx]
+        return idx
 
     def prediction_result_df(self, index=None, X_row=None, round=3):
         """prediction result in dataframe format
@@ -4413,6 +5036,7 @@ class RegressionExplainer(BaseExplainer):
             log_y=log_y,
             round=round,
             index_name=self.index_name,
+            **self._plot_aggregation_kwargs(),
         )
 
     def plot_residuals(
@@ -4447,6 +5071,7 @@ class RegressionExplainer(BaseExplainer):
             residuals=residuals,
             round=round,
             index_name=self.index_name,
+            **self._plot_aggregation_kwargs(),
         )
 
     def plot_residuals_vs_feature(
@@ -4500,6 +5125,7 @@ class RegressionExplainer(BaseExplainer):
                 winsor=winsor,
                 index_name=self.index_name,
                 cats_order=self.ordered_cats(col, topx, sort),
+                **self._plot_aggregation_kwargs(),
             )
         else:
             return plotly_residuals_vs_col(
@@ -4512,6 +5138,7 @@ class RegressionExplainer(BaseExplainer):
                 round=round,
                 winsor=winsor,
                 index_name=self.index_name,
+                **self._plot_aggregation_kwargs(),
             )
 
     def plot_y_vs_feature(
@@ -4566,6 +5193,7 @@ class RegressionExplainer(BaseExplainer):
                 target=self.target,
                 index_name=self.index_name,
                 cats_order=self.ordered_cats(col, topx, sort),
+                **self._plot_aggregation_kwargs(),
             )
         else:
             return plotly_actual_vs_col(
@@ -4579,6 +5207,7 @@ class RegressionExplainer(BaseExplainer):
                 units=self.units,
                 target=self.target,
                 index_name=self.index_name,
+                **self._plot_aggregation_kwargs(),
             )
 
     def plot_preds_vs_feature(
@@ -4629,6 +5258,7 @@ class RegressionExplainer(BaseExplainer):
                 target=self.target,
                 index_name=self.index_name,
                 cats_order=self.ordered_cats(col, topx, sort),
+                **self._plot_aggregation_kwargs(),
             )
         else:
             return plotly_preds_vs_col(
@@ -4642,6 +5272,7 @@ class RegressionExplainer(BaseExplainer):
                 units=self.units,
                 target=self.target,
                 index_name=self.index_name,
+                **self._plot_aggregation_kwargs(),
             )
 
 
@@ -4744,6 +5375,8 @@ class TreeExplainer(BaseExplainer):
           DTreeVizRender
 
         """
+        from dtreeviz import DTreeVizAPI
+
         if not self.graphviz_available:
             print("Executável 'dot' do graphviz não disponível!") # Traduzido
             return None
@@ -4843,8 +5476,11 @@ class RandomForestExplainer(TreeExplainer):
         return len(self.model.estimators_)
 
     @property
+    @timed("_shadow_trees")
     def shadow_trees(self):
         """a list of ShadowDecTree objects"""
+        from dtreeviz.models.shadow_decision_tree import ShadowDecTree
+
         if not hasattr(self, "_shadow_trees"):
             print(
                 "A calcular ShadowDecTree para cada árvore de decisão individual...", # Traduzido
@@ -4920,6 +5556,7 @@ class XGBExplainer(TreeExplainer):
     """
 
     @property
+    @timed("_model_dump_list")
     def model_dump_list(self):
         if not hasattr(self, "_model_dump_list"):
             print("A gerar dump do modelo xgboost...", flush=True) # Traduzido
@@ -4936,8 +5573,11 @@ class XGBExplainer(TreeExplainer):
         return len(self.model_dump_list)
 
     @property
+    @timed("_shadow_trees")
     def shadow_trees(self):
         """a list of ShadowDecTree objects"""
+        from dtreeviz.models.shadow_decision_tree import ShadowDecTree
+
         if not hasattr(self, "_shadow_trees"):
             print(
                 "A calcular ShadowDecTree para cada árvore de decisão individual...", # Traduzido
@@ -5015,6 +5655,8 @@ class XGBExplainer(TreeExplainer):
           the path where the .svg file is stored.
 
         """
+        from dtreeviz import DTreeVizAPI
+
         if not self.graphviz_available:
             print("Executável 'dot' do graphviz não disponível!") # Traduzido
             return None
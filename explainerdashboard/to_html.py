@@ -2,6 +2,7 @@
 
 __all__ = [
     "add_header",
+    "share_plotlyjs",
     "row",
     "rows",
     "fig",
@@ -18,6 +19,8 @@ __all__ = [
     "jumbotron",
 ]
 
+import re
+
 
 def add_header(html: str, title="explainerdashboard", resize=True) -> str:
     """Turns a html snippet into a full html layout by adding <html>, <head> and <body> tags.
@@ -56,7 +59,32 @@ window.dispatchEvent(new Event('resize'));
     full_html += """
 </html>
     """
-    return full_html
+    return share_plotlyjs(full_html)
+
+
+_plotlyjs_script = re.compile(
+    r'<script[^>]*src="([^"]*plotly[^"/]*\.js)"[^>]*></script>\s*'
+)
+
+
+def share_plotlyjs(html: str, src: str = None) -> str:
+    """Every plotly fig rendered with include_plotlyjs='cdn' adds its own <script>
+    tag to load plotly.js. This replaces those tags with a single one in the
+    <head> of the page (or at the start of the snippet if there is no <head>).
+
+    Args:
+        html (str): html containing plotly figs
+        src (str, optional): where to load plotly.js from, e.g. a 'plotly.min.js'
+            file stored next to the html file. Defaults to the url used by the figs.
+    """
+    match = _plotlyjs_script.search(html)
+    if match is None:
+        return html
+    script = f'<script charset="utf-8" src="{src or match.group(1)}"></script>\n'
+    html = _plotlyjs_script.sub("", html)
+    if "</head>" in html:
+        return html.replace("</head>", script + "</head>", 1)
+    return script + html
 
 
 def row(*cols) -> str:
@@ -1,16 +1,19 @@
-from explainerdashboard import  ExplainerHub
+import zipfile
+
+from explainerdashboard import ExplainerDashboard, ExplainerHub
+
 
-        
 def test_hub_users(explainer_hub):
     assert len(explainer_hub.users) > 0
-    assert ("db2" in explainer_hub.dashboards_with_users)
+    assert "db2" in explainer_hub.dashboards_with_users
     explainer_hub.add_user("user3", "password")
     explainer_hub.add_user_to_dashboard("db2", "user3")
-    assert ("user3" in explainer_hub.dashboard_users['db2'])
+    assert "user3" in explainer_hub.dashboard_users["db2"]
     explainer_hub.add_user("user4", "password", add_to_users_file=True)
     explainer_hub.add_user_to_dashboard("db2", "user4", add_to_users_file=True)
-    assert ("user4" in explainer_hub.dashboard_users['db2'])
-    assert ("user4" in explainer_hub.get_dashboard_users("db2"))
+    assert "user4" in explainer_hub.dashboard_users["db2"]
+    assert "user4" in explainer_hub.get_dashboard_users("db2")
+
 
 def test_load_from_config(explainer_hub, tmp_path_factory):
     tmp_path = tmp_path_factory.mktemp("tmp_hub")
@@ -18,19 +21,116 @@ def test_load_from_config(explainer_hub, tmp_path_factory):
     explainer_hub2 = ExplainerHub.from_config(tmp_path / "hub.yaml")
     assert isinstance(explainer_hub2, ExplainerHub)
 
+
 def test_hub_to_html(explainer_hub):
     html = explainer_hub.to_html()
     assert isinstance(html, str)
-    
+
+
 def test_hub_save_html(explainer_hub, tmp_path_factory):
     tmp_path = tmp_path_factory.mktemp("tmp_hub")
     explainer_hub.save_html(tmp_path / "hub.html", save_dashboards=True)
     with open(tmp_path / "hub.html") as html:
         assert isinstance(html.read(), str)
 
+
 def test_hub_to_zip(explainer_hub, tmp_path_factory):
     tmp_path = tmp_path_factory.mktemp("tmp_hub")
     explainer_hub.to_zip(tmp_path / "hub.zip")
     assert (tmp_path / "hub.zip").exists()
 
-    
+
+def test_hub_to_zip_parallel(explainer_hub, tmp_path):
+    explainer_hub.to_zip(tmp_path / "hub.zip", n_jobs=2)
+    with zipfile.ZipFile(tmp_path / "hub.zip") as zf:
+        assert "/explainerhub/plotly.min.js" in zf.namelist()
+        html = zf.read("/explainerhub/db2.html").decode()
+    assert html.count("plotly.min.js") == 1
+    assert "cdn.plot.ly" not in html
+
+
+def test_lazy_hub(explainer_hub_dump_folder):
+    hub = ExplainerHub.from_config(
+        explainer_hub_dump_folder / "hub.yaml", lazy_load=True, max_loaded_dashboards=1
+    )
+    assert hub.loaded_dashboards == []
+    db1, db2 = hub.dashboard_names
+    hub.get_dashboard(db1)
+    assert hub.loaded_dashboards == [db1]
+    hub.get_dashboard(db2)
+    assert hub.loaded_dashboards == [db2]
+
+    client = hub.app.test_client()
+    response = client.get(f"/dashboards/{db2}/_dash-layout")
+    assert response.status_code == 302  # hub has logins
+
+
+def test_hub_shares_explainers(precalculated_rf_regression_explainer, tmp_path):
+    precalculated_rf_regression_explainer.dump(tmp_path / "explainer1.joblib")
+    precalculated_rf_regression_explainer.dump(tmp_path / "explainer2.joblib")
+    for i in [1, 2]:
+        db = ExplainerDashboard(precalculated_rf_regression_explainer, name=f"db{i}")
+        db.to_yaml(
+            tmp_path / f"db{i}.yaml",
+            explainerfile=str(tmp_path / f"explainer{i}.joblib"),
+        )
+
+    hub = ExplainerHub(
+        [tmp_path / "db1.yaml", tmp_path / "db2.yaml"],
+        lazy_load=True,
+        users_file=str(tmp_path / "users.yaml"),
+    )
+    assert hub.memory_report().empty
+    assert hub.get_dashboard("db1").explainer is hub.get_dashboard("db2").explainer
+
+    report = hub.memory_report()
+    assert len(report) == 1
+    assert report.dashboards[0] == ["db1", "db2"]
+    assert report.file_hash[0] is not None
+
+
+def test_hub_static_html_pages_parallel_lazy(
+    precalculated_rf_regression_explainer, tmp_path
+):
+    precalculated_rf_regression_explainer.dump(tmp_path / "explainer.joblib")
+    for i in [1, 2]:
+        ExplainerDashboard(
+            precalculated_rf_regression_explainer, ["importances"], name=f"db{i}"
+        ).to_yaml(
+            tmp_path / f"db{i}.yaml", explainerfile=str(tmp_path / "explainer.joblib")
+        )
+
+    hub = ExplainerHub(
+        [tmp_path / "db1.yaml"], lazy_load=True, users_file=str(tmp_path / "users.yaml")
+    )
+    hub.add_dashboard(tmp_path / "db2.yaml", title="Hub kwargs title")
+    pages = dict(hub.static_html_pages(n_jobs=2))
+    assert hub.loaded_dashboards == []
+    assert "Hub kwargs title" in pages["db2"]
+    assert "Hub kwargs title" in dict(hub.static_html_pages())["db2"]
+
+
+def test_lazy_hub_to_yaml(precalculated_rf_regression_explainer, tmp_path):
+    precalculated_rf_regression_explainer.dump(tmp_path / "explainer.joblib")
+    for i in [1, 2]:
+        ExplainerDashboard(
+            precalculated_rf_regression_explainer, name=f"db{i}"
+        ).to_yaml(
+            tmp_path / f"db{i}.yaml", explainerfile=str(tmp_path / "explainer.joblib")
+        )
+
+    hub = ExplainerHub(
+        [tmp_path / "db1.yaml"], lazy_load=True, users_file=str(tmp_path / "users.yaml")
+    )
+    hub.add_dashboard(tmp_path / "db2.yaml", title="Hub kwargs title")
+    config = hub.to_yaml(tmp_path / "hub" / "hub.yaml", return_dict=True)
+    assert config["explainerhub"]["dashboards"][1]["dashboard"]["params"]["title"] == (
+        "Hub kwargs title"
+    )
+
+    hub.to_yaml(tmp_path / "hub" / "hub.yaml")
+    assert hub.loaded_dashboards == []
+    assert (tmp_path / "hub" / "db2_explainer.joblib").exists()
+
+    hub2 = ExplainerHub.from_config(tmp_path / "hub" / "hub.yaml", lazy_load=True)
+    assert hub2.get_dashboard("db2").title == "Hub kwargs title"
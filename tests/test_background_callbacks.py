@@ -0,0 +1,95 @@
+import tempfile
+
+import pytest
+
+import dash
+from dash import html, Input, Output
+
+from explainerdashboard.dashboard_methods import (
+    BackgroundCallbacks,
+    CallbackCache,
+    ExplainerComponent,
+)
+from explainerdashboard.explainer_methods import report_progress, progress_reporting
+
+
+class SlowComponent(ExplainerComponent):
+    _background_callbacks = dict(update_slow=True)
+
+    def layout(self):
+        return html.Div(
+            [
+                html.Div(id="input-" + self.name),
+                self.background_progress(),
+                html.Div(id="slow-" + self.name),
+                html.Div(id="fast-" + self.name),
+            ]
+        )
+
+    def component_callbacks(self, app):
+        @app.callback(
+            Output("slow-" + self.name, "children"),
+            Input("input-" + self.name, "children"),
+        )
+        def update_slow(value):
+            report_progress(0.5)
+            return value
+
+        @app.callback(
+            Output("fast-" + self.name, "children"),
+            Input("input-" + self.name, "children"),
+        )
+        def update_fast(value):
+            return value
+
+
+def test_background_callbacks_from_param():
+    assert BackgroundCallbacks.from_param(None) is None
+    assert BackgroundCallbacks.from_param(False) is None
+    assert BackgroundCallbacks.from_param(True).memoize
+    assert BackgroundCallbacks.from_param(dict(expire=60)).expire == 60
+    background_callbacks = BackgroundCallbacks(components={"SlowComponent": False})
+    assert BackgroundCallbacks.from_param(background_callbacks) is background_callbacks
+    assert not background_callbacks.is_background(SlowComponent(None), "update_slow")
+    assert BackgroundCallbacks().is_background(SlowComponent(None), "update_slow")
+    assert not BackgroundCallbacks().is_background(SlowComponent(None), "update_fast")
+
+
+def test_progress_reporting():
+    reported = []
+    report_progress(0.1)
+    with progress_reporting(reported.append):
+        report_progress(0.5)
+        report_progress(2)
+    report_progress(0.9)
+    assert reported == [0.5, 1.0]
+
+
+def test_background_callbacks_registered(tmp_path):
+    pytest.importorskip("diskcache")
+    pytest.importorskip("multiprocess")
+    app = dash.Dash(__name__)
+    background_callbacks = BackgroundCallbacks(cache_dir=tmp_path)
+    component = SlowComponent(None, name="slow")
+    component.register_callbacks(CallbackCache().app(background_callbacks.app(app)))
+    slow = app.callback_map["slow-slow.children"]
+    assert slow["background"]["manager"] is background_callbacks.manager
+    assert slow["background"]["progress"][0].component_id == "background-progress-slow"
+    assert not app.callback_map["fast-slow.children"].get("background")
+
+
+def test_background_callbacks_cache_dir(tmp_path, monkeypatch):
+    pytest.importorskip("diskcache")
+    pytest.importorskip("multiprocess")
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path / "tmp"))
+    directories = []
+    for namespace in ["model_a", "model_b"]:
+        background_callbacks = BackgroundCallbacks()
+        background_callbacks.namespace = namespace
+        directories.append(background_callbacks.manager.handle.directory)
+        assert background_callbacks.manager.cache_by[0]() == namespace
+    assert directories[0] != directories[1]
+    assert BackgroundCallbacks.from_param(True).to_param()["cache_dir"] is None
+
+    background_callbacks = BackgroundCallbacks(cache_dir=tmp_path / "jobs")
+    assert background_callbacks.manager.handle.directory == str(tmp_path / "jobs")
@@ -0,0 +1,93 @@
+import time
+import pickle
+from multiprocessing import Pool
+
+import pytest
+
+from explainerdashboard.cache_backends import (
+    FileSystemCache,
+    SQLiteCache,
+    get_cache_backend,
+)
+from explainerdashboard.dashboard_methods import CallbackCache
+
+
+@pytest.fixture(params=["filesystem", "sqlite"])
+def cache_backend(request, tmp_path):
+    if request.param == "filesystem":
+        return FileSystemCache(tmp_path / "cache", max_bytes=10_000)
+    return SQLiteCache(tmp_path / "cache.db", max_bytes=10_000)
+
+
+def _set_in_other_process(args):
+    url, key, value = args
+    get_cache_backend(url).set(key, value)
+
+
+def test_cache_backend_get_set(cache_backend):
+    assert cache_backend.get("a") is None
+    cache_backend.set("a", b"value")
+    assert cache_backend.get("a") == b"value"
+    assert "a" in cache_backend
+    cache_backend.delete("a")
+    assert "a" not in cache_backend
+
+    stats = cache_backend.stats()
+    assert stats["hits"] == 2
+    assert stats["size"] == 0
+
+
+def test_cache_backend_ttl(cache_backend):
+    cache_backend.set("a", b"value", ttl=0.01)
+    time.sleep(0.02)
+    assert cache_backend.get("a") is None
+
+
+def test_cache_backend_clear_prefix(cache_backend):
+    cache_backend.set("x/a", b"1")
+    cache_backend.set("y/a", b"2")
+    cache_backend.clear("x/")
+    assert cache_backend.get("x/a") is None
+    assert cache_backend.get("y/a") == b"2"
+
+
+def test_cache_backend_eviction(cache_backend):
+    for i in range(20):
+        cache_backend.set(str(i), bytes(1000))
+        time.sleep(0.001)
+    cache_backend.get("19")
+    assert cache_backend.stats()["bytes"] <= 10_000
+    assert cache_backend.stats()["evictions"] > 0
+    assert cache_backend.get("0") is None
+    assert cache_backend.get("19") is not None
+
+
+def test_cache_backend_shared_between_processes(cache_backend):
+    with Pool(2) as pool:
+        pool.map(
+            _set_in_other_process,
+            [(cache_backend.url, str(i), str(i).encode()) for i in range(4)],
+        )
+    assert [cache_backend.get(str(i)) for i in range(4)] == [b"0", b"1", b"2", b"3"]
+    assert get_cache_backend(cache_backend.url).get("0") == b"0"
+
+
+def test_cache_namespace(cache_backend):
+    namespace = cache_backend.namespace("ns/", serialize=True)
+    namespace.set("a", dict(value=1))
+    assert namespace.get("a") == dict(value=1)
+    assert cache_backend.get("ns/a") == pickle.dumps(
+        dict(value=1), protocol=pickle.HIGHEST_PROTOCOL
+    )
+    namespace.clear()
+    assert namespace.get("a") is None
+    assert namespace.stats()["misses"] == 1
+
+
+def test_callback_cache_backend(tmp_path):
+    callback_cache = CallbackCache.from_param(
+        dict(ttl=60, backend=f"sqlite:///{tmp_path / 'callbacks.db'}")
+    )
+    assert isinstance(callback_cache.backend, SQLiteCache)
+    assert callback_cache.to_param()["backend"].startswith("sqlite:///")
+    assert isinstance(pickle.loads(pickle.dumps(callback_cache.backend)), SQLiteCache)
@@ -0,0 +1,117 @@
+import dash
+from dash import html, Input, Output
+
+from sklearn.linear_model import LinearRegression
+
+from explainerdashboard import ExplainerDashboard, RegressionExplainer
+from explainerdashboard.dashboard_methods import CallbackCache, ExplainerComponent
+
+
+class CountingComponent(ExplainerComponent):
+    def __init__(self, explainer, name=None):
+        super().__init__(explainer, name=name)
+        self.calls = []
+
+    def layout(self):
+        return html.Div(
+            [html.Div(id="input-" + self.name), html.Div(id="output-" + self.name)]
+        )
+
+    def component_callbacks(self, app):
+        @app.callback(
+            Output("output-" + self.name, "children"),
+            Input("input-" + self.name, "children"),
+        )
+        def update_output(value):
+            self.calls.append(value)
+            return dict(value=value)
+
+
+def test_callback_cache_from_param():
+    assert CallbackCache.from_param(None) is None
+    assert CallbackCache.from_param(False) is None
+    assert CallbackCache.from_param(True).maxsize == 128
+    assert CallbackCache.from_param(10).maxsize == 10
+    assert CallbackCache.from_param(dict(ttl=60)).ttl == 60
+
+
+def test_callback_cache_memoizes_component_callbacks():
+    app = dash.Dash(__name__)
+    callback_cache = CallbackCache(maxsize=2, components={"excluded": False})
+    component = CountingComponent(None, name="counting")
+    component.register_callbacks(callback_cache.app(app))
+
+    update_output = app.callback_map["output-counting.children"]["callback"].__wrapped__
+    assert update_output(1) == dict(value=1)
+    assert update_output(1) == dict(value=1)
+    assert update_output(2) == dict(value=2)
+    assert component.calls == [1, 2]
+
+    stats = callback_cache.stats()["counting"]
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+
+    excluded = CountingComponent(None, name="excluded")
+    excluded.register_callbacks(callback_cache.app(app))
+    update_output = app.callback_map["output-excluded.children"]["callback"].__wrapped__
+    update_output(1)
+    update_output(1)
+    assert excluded.calls == [1, 1]
+    assert "excluded" not in callback_cache.stats()
+
+
+def test_dashboard_cache(precalculated_rf_classifier_explainer):
+    db = ExplainerDashboard(
+        precalculated_rf_classifier_explainer, cache=dict(maxsize=16, ttl=600)
+    )
+    assert isinstance(db.callback_cache, CallbackCache)
+    assert isinstance(db.callback_cache_stats(), dict)
+    assert isinstance(db.to_yaml(), str)
+
+
+class PredComponent(ExplainerComponent):
+    def __init__(self, explainer, name=None):
+        super().__init__(explainer, name=name)
+
+    def layout(self):
+        return html.Div(
+            [html.Div(id="input-" + self.name), html.Div(id="output-" + self.name)]
+        )
+
+    def component_callbacks(self, app):
+        @app.callback(
+            Output("output-" + self.name, "children"),
+            Input("input-" + self.name, "children"),
+        )
+        def update_output(index):
+            return float(self.explainer.preds[index])
+
+
+def test_dashboard_cache_backend_per_model(tmp_path, regression_data):
+    X_train, y_train, X_test, y_test = regression_data
+    outputs = []
+    for target in [y_train, 2 * y_train]:
+        model = LinearRegression().fit(X_train, target)
+        explainer = RegressionExplainer(model, X_test, y_test)
+        db = ExplainerDashboard(
+            explainer,
+            PredComponent(explainer, name="preds"),
+            name="db",
+            cache=dict(backend=f"sqlite:///{tmp_path / 'callbacks.db'}"),
+        )
+        update_output = db.app.callback_map["output-preds.children"]["callback"]
+        outputs.append(update_output.__wrapped__(0))
+        assert outputs[-1] == float(explainer.preds[0])
+    assert outputs[0] != outputs[1]
+
+
+def test_dashboard_cache_in_memory_no_fingerprint(regression_data):
+    X_train, y_train, X_test, y_test = regression_data
+    model = LinearRegression().fit(X_train, y_train)
+    explainer = RegressionExplainer(model, X_test, y_test)
+    db = ExplainerDashboard(
+        explainer, PredComponent(explainer, name="preds"), cache=True
+    )
+    # an in-memory cache is not shared, so X, y and the model do not get hashed:
+    assert db.callback_cache.fingerprint is None
+    assert not hasattr(explainer, "_data_hash")
@@ -0,0 +1,118 @@
+import numpy as np
+
+import dash
+from dash import html, Input, Output
+
+from explainerdashboard import ExplainerDashboard
+from explainerdashboard.dashboard_methods import CallbackMetrics, ExplainerComponent
+
+
+class EchoComponent(ExplainerComponent):
+    def layout(self):
+        return html.Div(
+            [html.Div(id="input-" + self.name), html.Div(id="output-" + self.name)]
+        )
+
+    def component_callbacks(self, app):
+        @app.callback(
+            Output("output-" + self.name, "children"),
+            Input("input-" + self.name, "children"),
+        )
+        def update_output(value):
+            if value == "error":
+                raise ValueError(value)
+            return value * 1000
+
+
+def post_callback(client, name, value):
+    return client.post(
+        "/_dash-update-component",
+        json=dict(
+            output=f"output-{name}.children",
+            outputs=dict(id="output-" + name, property="children"),
+            inputs=[dict(id="input-" + name, property="children", value=value)],
+            changedPropIds=[f"input-{name}.children"],
+        ),
+    )
+
+
+def test_callback_metrics_from_param():
+    assert CallbackMetrics.from_param(None) is None
+    assert CallbackMetrics.from_param(False) is None
+    assert CallbackMetrics.from_param(True).route == "/metrics"
+    metrics = CallbackMetrics.from_param(dict(latency_buckets=[1, 0.1]))
+    assert metrics.latency_buckets == [0.1, 1]
+    assert CallbackMetrics.from_param(metrics) is metrics
+    assert CallbackMetrics(**metrics.to_param()).to_param() == metrics.to_param()
+
+
+def test_callback_metrics_endpoint():
+    app = dash.Dash(__name__)
+    component = EchoComponent(None, name="echo")
+    app.layout = component.layout()
+
+    class Dashboard:
+        name = "test"
+        explainer = None
+
+    dashboard = Dashboard()
+    dashboard.app = app
+    metrics = CallbackMetrics(latency_buckets=[60], size_buckets=[1000, 10_000])
+    metrics = metrics.register_dashboard(dashboard)
+    component.register_callbacks(metrics.app(app, "test"))
+
+    client = app.server.test_client()
+    assert post_callback(client, "echo", "a").status_code == 200
+    assert post_callback(client, "echo", "b").status_code == 200
+    assert post_callback(client, "echo", "error").status_code == 500
+
+    stats = metrics.stats()[("test", "EchoComponent", "output-echo.children")]
+    assert stats["count"] == 3
+    assert stats["errors"] == 1
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.content_type.startswith("text/plain")
+    text = response.data.decode()
+    labels = (
+        'dashboard="test",component="EchoComponent",callback="output-echo.children"'
+    )
+    assert (
+        f'explainerdashboard_callback_duration_seconds_bucket{{{labels},le="60"}} 3'
+        in text
+    )
+    assert f"explainerdashboard_callback_duration_seconds_count{{{labels}}} 3" in text
+    assert (
+        f'explainerdashboard_callback_response_bytes_bucket{{{labels},le="1000"}} 1'
+        in text
+    )
+    assert (
+        f'explainerdashboard_callback_response_bytes_bucket{{{labels},le="+Inf"}} 3'
+        in text
+    )
+    assert f"explainerdashboard_callback_errors_total{{{labels}}} 1" in text
+
+
+def test_dashboard_metrics(precalculated_rf_classifier_explainer):
+    db = ExplainerDashboard(
+        precalculated_rf_classifier_explainer, metrics=True, cache=True
+    )
+    assert isinstance(db.callback_metrics, CallbackMetrics)
+    text = db.app.server.test_client().get("/metrics").data.decode()
+    assert "explainerdashboard_explainer_memory_bytes{" in text
+    assert isinstance(db.to_yaml(), str)
+
+
+def test_callback_metrics_explainer_memory(precalculated_rf_regression_explainer):
+    explainer = precalculated_rf_regression_explainer
+    metrics = CallbackMetrics(memory_interval=60)
+    memory = metrics.explainer_memory(explainer)
+    assert memory > 0
+    explainer._test_memory = np.zeros(100_000)
+    try:
+        # reused between scrapes within memory_interval:
+        assert metrics.explainer_memory(explainer) == memory
+        metrics.memory_interval = 0
+        assert metrics.explainer_memory(explainer) >= memory + 800_000
+    finally:
+        del explainer._test_memory
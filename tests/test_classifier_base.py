@@ -8,7 +8,7 @@ from pandas.api.types import is_numeric_dtype
 import plotly.graph_objects as go
 
 from explainerdashboard import ClassifierExplainer, ExplainerDashboard
-from explainerdashboard.explainer_methods import IndexNotFoundError
+from explainerdashboard.explainer_methods import IndexNotFoundError, IndexSearch
 
 
 def test_explainer_with_dataframe_y(fitted_rf_classifier_model, classifier_data):
@@ -67,6 +67,18 @@ def test_random_index(precalculated_rf_classifier_explainer):
     )
 
 
+def test_random_index_constraints(precalculated_rf_classifier_explainer):
+    explainer = precalculated_rf_classifier_explainer
+    pred_probas = explainer.pred_probas(1)
+    for _ in range(20):
+        idx = explainer.random_index(
+            y_values=[1], pred_proba_min=0.2, pred_proba_max=0.8, pos_label=1
+        )
+        assert explainer.y[idx] == 1
+        assert 0.2 <= pred_probas[idx] <= 0.8
+    assert explainer.random_index(pred_proba_min=1.1) is None
+
+
 def test_index_exists(precalculated_rf_classifier_explainer):
     assert precalculated_rf_classifier_explainer.index_exists(0)
     assert precalculated_rf_classifier_explainer.index_exists(
@@ -169,6 +181,27 @@ def test_top_interactions(precalculated_rf_classifier_explainer):
     )
 
 
+def test_mean_abs_shap_interactions(precalculated_rf_classifier_explainer):
+    explainer = precalculated_rf_classifier_explainer
+    mean_abs = explainer.mean_abs_shap_interactions()
+    n_cols = len(explainer.merged_cols)
+    assert mean_abs.shape == (n_cols, n_cols)
+    np.testing.assert_allclose(
+        mean_abs, np.abs(explainer.shap_interaction_values()).mean(0)
+    )
+    np.testing.assert_allclose(
+        explainer.mean_abs_shap_interactions(pos_label=0), mean_abs
+    )
+
+
+def test_mean_abs_shap_per_category(precalculated_rf_classifier_explainer):
+    explainer = precalculated_rf_classifier_explainer
+    per_category = explainer.mean_abs_shap_per_category("Deck")
+    assert isinstance(per_category, pd.Series)
+    assert per_category.is_monotonic_decreasing
+    assert explainer.ordered_cats("Deck", sort="shap") == per_category.index.tolist()
+
+
 def test_permutation_importances_df(precalculated_rf_classifier_explainer):
     assert isinstance(
         precalculated_rf_classifier_explainer.get_permutation_importances_df(),
@@ -425,6 +458,39 @@ def test_plot_dependence(precalculated_rf_classifier_explainer):
     assert isinstance(fig, go.Figure)
 
 
+def test_get_idx_sample(precalculated_rf_classifier_explainer):
+    explainer = precalculated_rf_classifier_explainer
+    idx_sample = explainer.get_idx_sample(50, include_index=3)
+    assert len(idx_sample) == 51
+    assert 3 in idx_sample
+    np.testing.assert_array_equal(
+        idx_sample, explainer.get_idx_sample(50, include_index=3)
+    )
+    assert set(explainer.get_idx_sample(20)) <= set(explainer.get_idx_sample(40))
+    assert len(explainer.get_idx_sample(outlier_array1="Age")) <= len(explainer)
+
+    fig1 = explainer.plot_dependence("Age", plot_sample=40, remove_outliers=True)
+    fig2 = explainer.plot_dependence("Age", plot_sample=40, remove_outliers=True)
+    assert fig1.to_json() == fig2.to_json()
+
+
+def test_plot_aggregation(precalculated_rf_classifier_explainer):
+    explainer = precalculated_rf_classifier_explainer
+    explainer.set_plot_aggregation(max_points=10, nbins=20)
+
+    fig = explainer.plot_dependence("Age", "Fare", highlight_index=0)
+    assert fig.data[0].type == "heatmap"
+    assert fig.data[-1].x[0] == explainer.get_col("Age").iloc[0]
+
+    fig = explainer.plot_importances_detailed(highlight_index=0)
+    assert "heatmap" in {trace.type for trace in fig.data}
+
+    explainer.set_plot_aggregation(enable=False)
+    fig = explainer.plot_dependence("Age", "Fare")
+    assert fig.data[0].type != "heatmap"
+    explainer.set_plot_aggregation()
+
+
 def test_plot_interaction(precalculated_rf_classifier_explainer):
     fig = precalculated_rf_classifier_explainer.plot_interaction("Gender", "Age")
     assert isinstance(fig, go.Figure)
@@ -462,3 +528,26 @@ def test_yaml(precalculated_rf_classifier_explainer):
 def test_yaml_return_dict(precalculated_rf_classifier_explainer):
     return_dict = precalculated_rf_classifier_explainer.to_yaml(return_dict=True)
     assert isinstance(return_dict, dict)
+
+
+def test_search_index(precalculated_rf_classifier_explainer, test_names):
+    results = precalculated_rf_classifier_explainer.search_index(test_names[0][:5], max_results=5)
+    assert test_names[0] in results or len(results) == 5
+    assert all(test_names[0][:5] in idx for idx in results)
+    assert all(
+        idx in precalculated_rf_classifier_explainer.search_index("an")
+        for idx in test_names if "an" in idx
+    )
+    assert precalculated_rf_classifier_explainer.search_index("no such passenger") == []
+
+
+def test_index_search_contains(test_names):
+    index_list = list(test_names) + ["", "a", "ééé", "x中文y", "aaaa"]
+    index_search = IndexSearch(index_list, chunk_size=7)
+    for substring in ["an", "son", "ééé", "中文", "aaa", "no such passenger"]:
+        assert index_search.contains(substring) == [
+            idx for idx in index_list if substring in idx
+        ]
+    assert index_search.contains("son", max_results=2) == [
+        idx for idx in index_list if "son" in idx
+    ][:2]
@@ -1,11 +1,25 @@
 import pytest
+import pickle
 from pathlib import Path
 
-from sklearn.ensemble import RandomForestClassifier
+import pandas as pd
 
-from explainerdashboard import ClassifierExplainer, ExplainerDashboard
-from explainerdashboard.datasets import titanic_survive
+from sklearn.ensemble import RandomForestClassifier
+from lightgbm import LGBMRegressor
+
+from explainerdashboard import (
+    ClassifierExplainer,
+    ExplainerDashboard,
+    RegressionExplainer,
+)
+from explainerdashboard.datasets import titanic_survive, titanic_fare
 from explainerdashboard.custom import ShapDependenceComposite
+from explainerdashboard.cli import (
+    collect_build_targets,
+    build_explainers,
+    build_explainer,
+    load_data,
+)
 
 pytestmark = pytest.mark.cli
 
@@ -76,4 +90,107 @@ def test_explainerdashboard_cli_build_explainer_dashboard(generate_assets, scrip
     ret = script_runner.run(['explainerdashboard', ' build explainer.yaml dashboard.yaml'], 
                 cwd=str(Path().cwd() / "tests" / "test_assets"))
     assert ret.success
-    assert ret.stderr == ''
\ No newline at end of file
+    assert ret.stderr == ''
+
+
+def test_build_explainers_incremental(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    X_train, y_train, X_test, y_test = titanic_survive()
+    model = RandomForestClassifier(n_estimators=5, max_depth=2).fit(X_train, y_train)
+    pickle.dump(model, open("model.pkl", "wb"))
+    X_test.assign(Survival=y_test.values).rename_axis("Name").reset_index().to_csv(
+        "data.csv", index=False
+    )
+    explainer = ClassifierExplainer(model, X_test, y_test)
+    for i in range(2):
+        explainer.to_yaml(
+            f"explainer{i}.yaml",
+            explainerfile=f"explainer{i}.joblib",
+            target_col="Survival",
+            index_col="Name",
+            dashboard_yaml="no_dashboard.yaml",
+        )
+    filepaths = ["explainer0.yaml", "explainer1.yaml"]
+
+    results = build_explainers(collect_build_targets(filepaths))
+    assert [result["status"] for result in results] == [
+        "built",
+        "reused explainer0.joblib",
+    ]
+    assert Path("explainer1.joblib").exists()
+    assert Path("explainer0.joblib.fingerprint").exists()
+
+    results = build_explainers(collect_build_targets(filepaths))
+    assert [result["status"] for result in results] == ["skipped", "skipped"]
+
+    results = build_explainers(collect_build_targets(filepaths), force=True)
+    assert results[0]["status"] == "built"
+
+
+def test_load_data_compacts_dtypes(tmp_path):
+    df = pd.DataFrame(
+        dict(
+            num=range(250),
+            frac=[0.5, 1.5] * 125,
+            precise=[0.1] * 250,
+            cat=["a", "b", "c", "d", "e"] * 50,
+            unused=["x"] * 250,
+        )
+    )
+    df.to_csv(tmp_path / "data.csv", index=False)
+
+    loaded = load_data(
+        tmp_path / "data.csv",
+        columns=["num", "frac", "precise", "cat"],
+        nrows=200,
+        compact=True,
+        chunksize=60,
+    )
+    assert list(loaded.columns) == ["num", "frac", "precise", "cat"]
+    assert len(loaded) == 200
+    assert loaded.num.dtype == "int16"
+    assert loaded.frac.dtype == "float32"
+    assert loaded.precise.dtype == "float64"
+    assert isinstance(loaded.cat.dtype, pd.CategoricalDtype)
+    assert (loaded.cat.astype(str) == df.cat.iloc[:200]).all()
+
+    assert len(load_data(tmp_path / "data.csv", sample=0.5)) < 250
+    assert len(load_data(tmp_path / "data.csv", sample=10)) == 10
+
+
+def test_build_explainer_projects_model_columns(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    X_train, y_train, X_test, y_test = titanic_survive()
+    model = RandomForestClassifier(n_estimators=5, max_depth=2).fit(X_train, y_train)
+    pickle.dump(model, open("model.pkl", "wb"))
+    X_test.assign(Survival=y_test.values, Unused=1).rename_axis(
+        "Name"
+    ).reset_index().to_csv("data.csv", index=False)
+    explainer = ClassifierExplainer(model, X_test, y_test)
+    config = explainer.to_yaml(
+        target_col="Survival", index_col="Name", return_dict=True
+    )
+    config["explainer"]["data_compact"] = True
+
+    explainer = build_explainer(config)
+    assert list(explainer.X.columns) == list(X_test.columns)
+    assert len(explainer.X) == len(X_test)
+
+
+def test_build_explainer_array_fitted_model(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    X_train, y_train, X_test, y_test = titanic_fare()
+    # fitted on arrays, so the model has feature_name_ Column_0, Column_1, ...:
+    model = LGBMRegressor(n_estimators=5, verbose=-1).fit(
+        X_train.values, y_train.values
+    )
+    pickle.dump(model, open("model.pkl", "wb"))
+    X_test.assign(Fare=y_test.values).rename_axis("Name").reset_index().to_csv(
+        "data.csv", index=False
+    )
+    explainer = RegressionExplainer(model, X_test, y_test)
+    config = explainer.to_yaml(target_col="Fare", index_col="Name", return_dict=True)
+
+    explainer = build_explainer(config)
+    assert list(explainer.X.columns) == list(X_test.columns)
+    assert len(explainer.X) == len(X_test)
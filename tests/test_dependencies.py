@@ -0,0 +1,70 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import pandas as pd
+
+from explainerdashboard import RegressionExplainer
+from explainerdashboard.dashboard_methods import (
+    plan_dependencies,
+    calculate_dependencies,
+)
+
+
+def test_plan_dependencies(rf_regression_explainer):
+    stages = plan_dependencies(
+        rf_regression_explainer,
+        ["shap_interaction_values", "residuals", "preds", "shap_values_df", "preds"],
+    )
+    assert stages == [
+        ["preds", "shap_values_df"],
+        ["residuals", "shap_interaction_values"],
+    ]
+
+
+def test_plan_dependencies_adds_prerequisites(rf_classifier_explainer):
+    assert plan_dependencies(rf_classifier_explainer, ["pred_percentiles"]) == [
+        ["pred_probas"],
+        ["pred_percentiles"],
+    ]
+
+
+def test_calculate_dependencies(rf_regression_explainer):
+    report = calculate_dependencies(
+        rf_regression_explainer, ["residuals", "shap_values_df", "preds"]
+    )
+    assert isinstance(report, pd.DataFrame)
+    assert set(report.dependency) == {"residuals", "shap_values_df", "preds"}
+    assert report.error.isnull().all()
+    assert (report.result_bytes > 0).all()
+
+
+def test_calculate_dependencies_raises(rf_regression_explainer):
+    with pytest.raises(ValueError):
+        calculate_dependencies(
+            rf_regression_explainer, ["no_such_property"], raise_errors=True
+        )
+    report = calculate_dependencies(rf_regression_explainer, ["no_such_property"])
+    assert report.error.notnull().all()
+
+
+def test_lazy_property_calculated_once(regression_data, fitted_rf_regression_model):
+    X_train, y_train, X_test, y_test = regression_data
+    explainer = RegressionExplainer(fitted_rf_regression_model, X_test, y_test)
+    calls = []
+    predict = explainer.model.predict
+
+    def slow_predict(X):
+        calls.append(len(X))
+        time.sleep(0.1)
+        return predict(X)
+
+    explainer.model.predict = slow_predict
+    try:
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            preds = list(pool.map(lambda _: explainer.preds, range(2)))
+    finally:
+        del explainer.model.predict
+    assert len(calls) == 1
+    assert preds[0] is preds[1]
@@ -0,0 +1,86 @@
+import time
+from threading import Event
+
+from explainerdashboard.dashboard_methods import DownloadJobs
+
+
+def wait_for(download_jobs, key, timeout=10):
+    start = time.time()
+    status = download_jobs.status(key)
+    while status["state"] == "running":
+        assert time.time() - start < timeout
+        time.sleep(0.01)
+        status = download_jobs.status(key)
+    return status
+
+
+def test_download_jobs_from_param():
+    assert DownloadJobs.from_param(None) is None
+    assert DownloadJobs.from_param(False) is None
+    assert DownloadJobs.from_param(True).max_workers == 2
+    assert DownloadJobs.from_param(dict(max_workers=1)).max_workers == 1
+    download_jobs = DownloadJobs(max_pending=3)
+    assert DownloadJobs.from_param(download_jobs) is download_jobs
+    assert DownloadJobs(**download_jobs.to_param()).max_pending == 3
+
+
+def test_download_jobs_progress_and_cache():
+    download_jobs = DownloadJobs(max_workers=1)
+    release, calls = Event(), []
+
+    def render(progress):
+        calls.append(1)
+        progress(0.5)
+        release.wait(10)
+        return "<html></html>"
+
+    key = DownloadJobs.job_key("db", "download-button-all", [["id", "value", 1]])
+    assert download_jobs.submit(key, render)
+    assert download_jobs.submit(key, render)
+    release.set()
+    assert wait_for(download_jobs, key)["state"] == "done"
+    assert download_jobs.result(key) == "<html></html>"
+    assert download_jobs.submit(key, render)
+    assert len(calls) == 1
+    assert download_jobs.status("other")["state"] == "unknown"
+
+
+def test_download_jobs_limits_pending_jobs():
+    download_jobs = DownloadJobs(max_workers=1, max_pending=1)
+    release = Event()
+    assert download_jobs.submit("a", lambda progress: release.wait(10))
+    assert not download_jobs.submit("b", lambda progress: "b")
+    release.set()
+    wait_for(download_jobs, "a")
+    assert download_jobs.submit("b", lambda progress: "b")
+
+
+def test_download_jobs_reports_errors():
+    download_jobs = DownloadJobs()
+
+    def render(progress):
+        raise ValueError("kapot")
+
+    download_jobs.submit("a", render)
+    status = wait_for(download_jobs, "a")
+    assert status["state"] == "error" and "kapot" in status["error"]
+    assert download_jobs.status("a")["state"] == "unknown"
+
+
+def test_download_jobs_failed_jobs_are_not_pending():
+    download_jobs = DownloadJobs(max_workers=1, max_pending=2)
+
+    def render(progress):
+        raise ValueError("kapot")
+
+    assert download_jobs.submit("a", render)
+    assert download_jobs.submit("b", render)
+    start = time.time()
+    while download_jobs.n_pending() > 0:
+        assert time.time() - start < 10
+        time.sleep(0.01)
+    # nobody polled the failed jobs, but new downloads still get accepted:
+    assert download_jobs.submit("c", lambda progress: "c")
+    assert wait_for(download_jobs, "c")["state"] == "done"
+    assert download_jobs.status("a")["state"] == "error"
+    assert download_jobs.status("a")["state"] == "unknown"
@@ -214,3 +214,60 @@ def test_reg_externalsource_index_exists(regression_explainer_with_external_data
     assert (not regression_explainer_with_external_data.index_exists("wrong index"))
 
 
+
+
+@pytest.fixture(scope='session')
+def classifier_explainer_with_batched_external_data(fitted_rf_classifier_model):
+    _, _, X_test, y_test = titanic_survive()
+    X_test.reset_index(drop=True, inplace=True)
+    X_test.index = X_test.index.astype(str)
+
+    X_test1, y_test1 = X_test.iloc[:100], y_test.iloc[:100]
+    X_test2, y_test2 = X_test.iloc[100:], y_test.iloc[100:]
+
+    explainer = ClassifierExplainer(fitted_rf_classifier_model, X_test1, y_test1, cats=['Sex', 'Deck'])
+
+    calls = []
+
+    def index_list_func():
+        return list(X_test2.index)
+
+    def X_rows_func(indexes):
+        calls.append(list(indexes))
+        return X_test2.loc[indexes]
+
+    def y_batch_func(indexes):
+        return y_test2.iloc[[X_test2.index.get_loc(index) for index in indexes]]
+
+    explainer.set_index_list_func(index_list_func)
+    explainer.set_X_rows_func(X_rows_func)
+    explainer.set_y_batch_func(y_batch_func)
+    explainer.set_row_cache(maxsize=100, read_ahead=5)
+    explainer.external_calls = calls
+    return explainer
+
+def test_clas_externalsource_batched_get_X_row(classifier_explainer_with_batched_external_data):
+    explainer = classifier_explainer_with_batched_external_data
+    assert isinstance(explainer.get_X_row("120"), pd.DataFrame)
+    assert explainer.external_calls[-1] == ["120", "121", "122", "123", "124", "125"]
+    n_calls = len(explainer.external_calls)
+    assert isinstance(explainer.get_X_row("123"), pd.DataFrame)
+    assert isinstance(explainer.get_shap_row("120"), pd.DataFrame)
+    assert len(explainer.external_calls) == n_calls
+    assert explainer.row_cache_stats()['X']['hits'] >= 2
+
+def test_clas_externalsource_batched_get_y(classifier_explainer_with_batched_external_data):
+    assert isinstance(classifier_explainer_with_batched_external_data.get_y("150"), int)
+    assert isinstance(classifier_explainer_with_batched_external_data.get_y("151"), int)
+    assert classifier_explainer_with_batched_external_data.row_cache_stats()['y']['hits'] >= 1
+
+def test_clas_externalsource_batched_reset_index_list(classifier_explainer_with_batched_external_data):
+    classifier_explainer_with_batched_external_data.reset_index_list()
+    assert classifier_explainer_with_batched_external_data.row_cache_stats()['X']['size'] == 0
+
+def test_clas_externalsource_search_index(classifier_explainer_with_external_data):
+    assert classifier_explainer_with_external_data.search_index("14") == [
+        '140', '141', '142', '143', '144', '145', '146', '147', '148', '149', '114']
+    classifier_explainer_with_external_data.reset_index_list()
+    assert classifier_explainer_with_external_data.search_index("14", max_results=3) == ['140', '141', '142']
+    assert classifier_explainer_with_external_data.search_index("160") == []
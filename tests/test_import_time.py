@@ -0,0 +1,57 @@
+import sys
+import subprocess
+
+HEAVY_MODULES = [
+    "shap",
+    "dtreeviz",
+    "dash",
+    "jupyter_dash",
+    "dash_auth",
+    "flask_simplelogin",
+]
+
+
+def run_in_subprocess(code):
+    """runs code in a fresh interpreter and returns the last line it printed"""
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    return output.strip().splitlines()[-1]
+
+
+def imported_modules(statement):
+    return set(
+        run_in_subprocess(
+            f"import sys; {statement}; print(','.join(sorted(sys.modules)))"
+        ).split(",")
+    )
+
+
+def test_import_package_does_not_import_heavy_modules():
+    assert not set(HEAVY_MODULES) & imported_modules("import explainerdashboard")
+
+
+def test_import_explainers_does_not_import_dashboards():
+    modules = imported_modules("from explainerdashboard import ClassifierExplainer")
+    assert "explainerdashboard.explainers" in modules
+    assert not set(HEAVY_MODULES) & modules
+
+
+def test_datasets_loaded_on_demand():
+    assert (
+        run_in_subprocess(
+            "from explainerdashboard import datasets; "
+            "print(datasets._load_titanic.cache_info().currsize)"
+        )
+        == "0"
+    )
+    assert not set(HEAVY_MODULES) & imported_modules(
+        "from explainerdashboard.datasets import titanic_survive; titanic_survive()"
+    )
+
+
+def test_lazy_attributes():
+    import explainerdashboard
+
+    assert "ExplainerDashboard" in dir(explainerdashboard)
+    assert explainerdashboard.RegressionExplainer.__name__ == "RegressionExplainer"
@@ -0,0 +1,91 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from sklearn.linear_model import LinearRegression
+
+from explainerdashboard import RegressionExplainer
+from explainerdashboard.explainer_methods import (
+    KernelModelPredict,
+    model_accepts_arrays,
+    kernel_shap_values,
+)
+
+
+@pytest.fixture(scope="module")
+def kernel_explainer(regression_data):
+    X_train, y_train, X_test, y_test = regression_data
+    model = LinearRegression().fit(X_train, y_train)
+    return RegressionExplainer(
+        model,
+        X_test.iloc[:20],
+        y_test.iloc[:20],
+        shap="kernel",
+        kernel_background_k=5,
+        kernel_nsamples=100,
+    )
+
+
+def test_model_accepts_arrays(regression_data):
+    X_train, y_train, X_test, y_test = regression_data
+    model = LinearRegression().fit(X_train, y_train)
+    assert model_accepts_arrays(model, X_test.head())
+    assert not model_accepts_arrays(model, X_test.head().astype(str))
+
+
+def test_kernel_model_predict(regression_data):
+    X_train, y_train, X_test, y_test = regression_data
+    model = LinearRegression().fit(X_train, y_train)
+    for as_frame in [True, False]:
+        model_predict = KernelModelPredict(model, X_test.columns, as_frame=as_frame)
+        np.testing.assert_allclose(
+            pickle.loads(pickle.dumps(model_predict))(X_test.values[:5]),
+            model.predict(X_test.head()),
+        )
+
+
+def test_kernel_background_k(kernel_explainer):
+    assert kernel_explainer.shap_explainer.data.data.shape[0] == 5
+    assert not kernel_explainer.shap_explainer.model.f.as_frame
+    shap_df = kernel_explainer.get_shap_values_df()
+    assert shap_df.shape == (20, len(kernel_explainer.merged_cols))
+    np.testing.assert_allclose(
+        shap_df.sum(axis=1) + kernel_explainer.shap_base_value(),
+        kernel_explainer.preds,
+    )
+
+
+def test_kernel_shap_values_n_jobs(kernel_explainer):
+    shap_values = kernel_shap_values(
+        kernel_explainer.shap_explainer, kernel_explainer.X, n_jobs=2, nsamples=100
+    )
+    assert shap_values.shape == kernel_explainer.X.shape
+    np.testing.assert_allclose(
+        shap_values.sum(axis=1) + kernel_explainer.shap_base_value(),
+        kernel_explainer.preds,
+    )
+
+
+def test_kernel_shap_values_random_state(kernel_explainer):
+    random_state = np.random.get_state()
+    shap_values = [
+        kernel_shap_values(
+            kernel_explainer.shap_explainer,
+            kernel_explainer.X,
+            n_jobs=n_jobs,
+            nsamples=20,
+        )
+        for n_jobs in [None, None, 2, 2]
+    ]
+    np.testing.assert_array_equal(shap_values[0], shap_values[1])
+    np.testing.assert_array_equal(shap_values[2], shap_values[3])
+    assert np.array_equal(np.random.get_state()[1], random_state[1])
+
+
+def test_kernel_explainer_dump(kernel_explainer, tmp_path):
+    kernel_explainer.get_shap_row(X_row=kernel_explainer.X.iloc[[0]])
+    kernel_explainer.dump(tmp_path / "explainer.joblib")
+    explainer = RegressionExplainer.from_file(tmp_path / "explainer.joblib")
+    assert isinstance(explainer.get_shap_row(X_row=explainer.X.iloc[[0]]), pd.DataFrame)
@@ -0,0 +1,19 @@
+import dash
+
+from explainerdashboard import ExplainerDashboard
+
+
+def test_lazy_tabs(precalculated_rf_regression_explainer):
+    db = ExplainerDashboard(precalculated_rf_regression_explainer, lazy_tabs=True)
+    tabs = db.explainer_layout.tabs
+    assert list(db.explainer_layout._tab_layouts) == [tabs[0].name]
+
+    callback = [
+        v["callback"] for k, v in db.app.callback_map.items() if "lazy-tab-" in k
+    ][0].__wrapped__
+    outputs = callback(tabs[1].name, [tabs[0].name])
+    assert outputs[1] is not dash.no_update
+    assert outputs[0] is dash.no_update
+    assert outputs[-1] == [tabs[0].name, tabs[1].name]
+    assert tabs[1].name in db.explainer_layout._tab_layouts
+    assert db.to_yaml(return_dict=True)["dashboard"]["params"]["lazy_tabs"]
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+import shap
+from sklearn.linear_model import LinearRegression, Ridge, Lasso, LogisticRegression
+from sklearn.ensemble import RandomForestRegressor
+
+from explainerdashboard import ClassifierExplainer, RegressionExplainer
+from explainerdashboard.explainer_methods import (
+    LinearShapExplainer,
+    linear_shap_supported,
+)
+
+
+@pytest.mark.parametrize("model", [LinearRegression(), Ridge(), Lasso(alpha=0.1)])
+def test_linear_shap_regression(regression_data, model):
+    X_train, y_train, X_test, y_test = regression_data
+    model.fit(X_train, y_train)
+    assert linear_shap_supported(model)
+
+    shap_explainer = shap.LinearExplainer(model, X_train)
+    linear_explainer = LinearShapExplainer(model, X_train, chunk_size=50)
+    np.testing.assert_allclose(
+        linear_explainer.expected_value, shap_explainer.expected_value
+    )
+    np.testing.assert_allclose(
+        linear_explainer.shap_values(X_test), shap_explainer.shap_values(X_test)
+    )
+
+
+@pytest.mark.parametrize("data", ["classifier_data", "multiclass_data"])
+def test_linear_shap_classifier(request, data):
+    X_train, y_train, X_test, y_test = request.getfixturevalue(data)
+    model = LogisticRegression(max_iter=500).fit(X_train, y_train)
+
+    shap_explainer = shap.LinearExplainer(model, X_train)
+    linear_explainer = LinearShapExplainer(model, X_train, chunk_size=50)
+    np.testing.assert_allclose(
+        linear_explainer.expected_value, shap_explainer.expected_value
+    )
+    np.testing.assert_allclose(
+        linear_explainer.shap_values(X_test), shap_explainer.shap_values(X_test)
+    )
+
+
+def test_linear_shap_supported(regression_data):
+    X_train, y_train, X_test, y_test = regression_data
+    assert not linear_shap_supported(LinearRegression())
+    assert not linear_shap_supported(
+        RandomForestRegressor(n_estimators=2).fit(X_train, y_train)
+    )
+
+
+def test_linear_shap_explainers(
+    fitted_linear_regression_model, regression_data, multiclass_data
+):
+    X_train, y_train, X_test, y_test = regression_data
+    explainer = RegressionExplainer(
+        fitted_linear_regression_model, X_test, y_test, shap="linear"
+    )
+    assert isinstance(explainer.shap_explainer, LinearShapExplainer)
+    np.testing.assert_allclose(
+        explainer.get_shap_values_df().sum(axis=1) + explainer.shap_base_value(),
+        explainer.preds,
+    )
+
+    X_train, y_train, X_test, y_test = multiclass_data
+    model = LogisticRegression(max_iter=500).fit(X_train, y_train)
+    explainer = ClassifierExplainer(model, X_test, y_test, shap="linear")
+    assert isinstance(explainer.shap_explainer, LinearShapExplainer)
+    for pos_label, logodds in enumerate(model.decision_function(X_test).T):
+        np.testing.assert_allclose(
+            explainer.get_shap_values_df(pos_label).sum(axis=1)
+            + explainer.shap_base_value(pos_label),
+            logodds,
+        )
@@ -1,9 +1,15 @@
+import pickle
+
 import pandas as pd
 import numpy as np
 from pandas.api.types import is_numeric_dtype
 
 import plotly.graph_objects as go
 
+from sklearn.linear_model import LinearRegression
+
+from explainerdashboard import RegressionExplainer
+
 
 def test_explainer_len(precalculated_rf_regression_explainer, testlen):
     assert len(precalculated_rf_regression_explainer) == testlen
@@ -20,6 +26,15 @@ def test_random_index(precalculated_rf_regression_explainer):
     )
 
 
+def test_random_index_constraints(precalculated_rf_regression_explainer):
+    explainer = precalculated_rf_regression_explainer
+    for _ in range(20):
+        idx = explainer.random_index(y_min=10, y_max=100, abs_residuals_max=20)
+        assert 10 <= explainer.y[idx] <= 100
+        assert explainer.abs_residuals[idx] <= 20
+    assert explainer.random_index(y_min=1e9) is None
+
+
 def test_index_exists(precalculated_rf_regression_explainer):
     assert precalculated_rf_regression_explainer.index_exists(0)
     assert precalculated_rf_regression_explainer.index_exists(
@@ -236,6 +251,11 @@ def test_memory_usage(precalculated_rf_regression_explainer):
     assert isinstance(
         precalculated_rf_regression_explainer.memory_usage(cutoff=1000), pd.DataFrame
     )
+    memory_df = precalculated_rf_regression_explainer.memory_usage()
+    model_bytes = memory_df.set_index("property").loc["self.model", "bytes"]
+    assert model_bytes == len(
+        pickle.dumps(precalculated_rf_regression_explainer.model, protocol=-1)
+    )
 
 
 def test_calculate_properties(precalculated_rf_regression_explainer):
@@ -356,6 +376,25 @@ def test_plot_dependence(precalculated_rf_regression_explainer):
     assert isinstance(fig, go.Figure)
 
 
+def test_plot_aggregation(precalculated_rf_regression_explainer):
+    explainer = precalculated_rf_regression_explainer
+    explainer.set_plot_aggregation(max_points=10, nbins=20)
+
+    fig = explainer.plot_predicted_vs_actual()
+    assert fig.data[0].type == "heatmap"
+    assert fig.data[0].customdata.sum() == len(explainer)
+
+    fig = explainer.plot_residuals(vs_actual=True)
+    assert fig.data[0].type == "heatmap"
+
+    fig = explainer.plot_residuals_vs_feature("Gender")
+    assert {trace.type for trace in fig.data} == {"box"}
+
+    fig = explainer.plot_y_vs_feature("Age")
+    assert fig.data[0].type == "heatmap"
+    explainer.set_plot_aggregation()
+
+
 def test_plot_contributions(precalculated_rf_regression_explainer):
     fig = precalculated_rf_regression_explainer.plot_contributions(0)
     assert isinstance(fig, go.Figure)
@@ -420,3 +459,31 @@ def test_plot_pdp(precalculated_rf_regression_explainer):
 def test_yaml(precalculated_rf_regression_explainer):
     yaml = precalculated_rf_regression_explainer.to_yaml()
     assert isinstance(yaml, str)
+
+
+def test_get_idx_sample_outliers_na_fill(regression_data):
+    X_train, y_train, X_test, y_test = regression_data
+    X_test = X_test.copy()
+    # missing ages (na_fill=-999) in 40% of the rows, so within the IQR bounds:
+    X_test.loc[X_test.index[: int(0.4 * len(X_test))], "Age"] = -999
+    model = LinearRegression().fit(X_train, y_train)
+    explainer = RegressionExplainer(model, X_test, y_test)
+
+    age = explainer.get_col("Age").values
+    siblings = explainer.get_col("No_of_siblings_plus_spouses_on_board").values
+    idx_sample = explainer.get_idx_sample(
+        outlier_array1="Age", outlier_array2="No_of_siblings_plus_spouses_on_board"
+    )
+    assert (age[idx_sample] == -999).sum() > 0
+    # same as with arrays: bounds of outlier_array2 over the remaining rows
+    np.testing.assert_array_equal(
+        idx_sample,
+        explainer.get_idx_sample(outlier_array1=age, outlier_array2=siblings),
+    )
+    lb, ub = explainer.outlier_bounds("Age")
+    rows = np.flatnonzero((age >= lb) & (age <= ub))
+    q1, q3 = np.percentile(siblings[rows], [25, 75])
+    lb, ub = q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
+    np.testing.assert_array_equal(
+        idx_sample, rows[(siblings[rows] >= lb) & (siblings[rows] <= ub)]
+    )
@@ -0,0 +1,83 @@
+from threading import Thread
+
+import numpy as np
+import pandas as pd
+
+from explainerdashboard import ClassifierExplainer, RegressionExplainer
+from explainerdashboard.explainer_methods import LRUCache, get_row_hash
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert "b" not in cache
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 3
+
+
+def test_lru_cache_ttl():
+    cache = LRUCache(maxsize=2, ttl=0)
+    cache.set("a", 1)
+    assert cache.get("a") is None
+
+
+def test_get_row_hash(classifier_data):
+    _, _, X_test, _ = classifier_data
+    assert get_row_hash(X_test.iloc[[0]]) == get_row_hash(
+        X_test.iloc[[0]].reset_index(drop=True)
+    )
+    assert get_row_hash(X_test.iloc[[0]]) != get_row_hash(X_test.iloc[[1]])
+
+
+def test_clas_shap_row_batching(fitted_rf_classifier_model, classifier_data):
+    _, _, X_test, y_test = classifier_data
+    explainer = ClassifierExplainer(
+        fitted_rf_classifier_model, X_test, y_test, cats=["Sex", "Deck"]
+    )
+    expected = [
+        explainer.get_shap_row(X_row=X_test.iloc[[i]], pos_label=0) for i in range(10)
+    ]
+    explainer.set_shap_row_batching(window_ms=20)
+
+    shap_rows = [None] * 10
+
+    def get_shap_row(i):
+        shap_rows[i] = explainer.get_shap_row(X_row=X_test.iloc[[i]], pos_label=0)
+
+    threads = [Thread(target=get_shap_row, args=(i,)) for i in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for shap_row, expected_row in zip(shap_rows, expected):
+        assert isinstance(shap_row, pd.DataFrame)
+        np.testing.assert_allclose(shap_row.values, expected_row.values)
+
+    assert explainer.shap_row_batching_stats()["batches"] < 10
+    _ = explainer.get_shap_row(X_row=X_test.iloc[[0]], pos_label=1)
+    assert explainer.shap_row_batching_stats()["cache"]["hits"] == 1
+
+    explainer.set_shap_row_batching(enable=False)
+    assert explainer.shap_row_batching_stats() is None
+
+
+def test_reg_shap_row_batching(fitted_rf_regression_model, regression_data):
+    _, _, X_test, y_test = regression_data
+    explainer = RegressionExplainer(
+        fitted_rf_regression_model, X_test, y_test, cats=["Sex", "Deck"]
+    )
+    expected = explainer.get_shap_row(X_row=X_test.iloc[[0]])
+    explainer.set_shap_row_batching(window_ms=5, cache_size=10)
+    np.testing.assert_allclose(
+        explainer.get_shap_row(X_row=X_test.iloc[[0]]).values, expected.values
+    )
+    np.testing.assert_allclose(
+        explainer.get_shap_row(X_row=X_test.iloc[[0]]).values, expected.values
+    )
+    assert explainer.shap_row_batching_stats()["cache"]["hits"] == 1
@@ -0,0 +1,75 @@
+import sqlite3
+
+import pytest
+
+import pandas as pd
+
+from explainerdashboard.explainers import ClassifierExplainer
+from explainerdashboard.datasources import SQLDataSource
+from explainerdashboard.datasets import titanic_survive
+
+
+@pytest.fixture(scope='session')
+def sqlite_datafile(tmp_path_factory):
+    _, _, X_test, y_test = titanic_survive()
+    df = X_test.reset_index(drop=True)
+    df['Survival'] = y_test.values
+    df.index.name = 'passenger_id'
+    datafile = tmp_path_factory.mktemp("sql_datasource") / "data.db"
+    with sqlite3.connect(datafile) as conn:
+        df.iloc[100:].to_sql("passengers", conn)
+    return datafile
+
+
+@pytest.fixture(scope='session')
+def sql_datasource(sqlite_datafile):
+    return SQLDataSource(sqlite_datafile, table="passengers", index_col="passenger_id",
+                            target_col="Survival", index_dtype=int, page_size=50, batch_size=16)
+
+
+@pytest.fixture(scope='session')
+def classifier_explainer_with_sql_datasource(fitted_rf_classifier_model, sqlite_datafile):
+    _, _, X_test, y_test = titanic_survive()
+    X_test.reset_index(drop=True, inplace=True)
+    X_test.index = X_test.index.astype(str)
+
+    explainer = ClassifierExplainer(fitted_rf_classifier_model,
+                    X_test.iloc[:100], y_test.iloc[:100], cats=['Sex', 'Deck'])
+    explainer.set_data_source(SQLDataSource(sqlite_datafile, table="passengers",
+                        index_col="passenger_id", target_col="Survival", index_dtype=int))
+    return explainer
+
+
+def test_sql_datasource_index_list(sql_datasource):
+    index_list = sql_datasource.get_index_list()
+    assert len(index_list) == 100
+    assert index_list[0] == '100'
+    assert '199' in index_list
+
+def test_sql_datasource_index_exists(sql_datasource):
+    assert sql_datasource.index_exists('120')
+    assert not sql_datasource.index_exists('20')
+    assert not sql_datasource.index_exists('wrong index')
+
+def test_sql_datasource_get_X_rows(sql_datasource):
+    sql_datasource.columns = ['Fare', 'Age']
+    X = sql_datasource.get_X_rows(['150', '101', '120'])
+    assert X.index.tolist() == ['150', '101', '120']
+    assert X.columns.tolist() == ['Fare', 'Age']
+    assert len(sql_datasource.get_X_rows([str(i) for i in range(100, 150)])) == 50
+    sql_datasource.columns = None
+
+def test_sql_datasource_get_y(sql_datasource):
+    y = sql_datasource.get_y(['150', '101'])
+    assert isinstance(y, pd.Series)
+    assert len(y) == 2
+
+def test_sql_datasource_explainer(classifier_explainer_with_sql_datasource):
+    explainer = classifier_explainer_with_sql_datasource
+    assert '150' in explainer.get_index_list()
+    assert explainer.index_exists('150')
+    assert not explainer.index_exists('250')
+    assert isinstance(explainer.get_X_row('150'), pd.DataFrame)
+    assert isinstance(explainer.get_shap_row('150'), pd.DataFrame)
+    assert isinstance(explainer.get_y('150'), int)
+    assert isinstance(explainer.get_X_row(0), pd.DataFrame)
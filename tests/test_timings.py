@@ -0,0 +1,61 @@
+from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+
+from explainerdashboard import ClassifierExplainer, RegressionExplainer
+from explainerdashboard.explainer_methods import (
+    add_timing_callback,
+    remove_timing_callback,
+)
+
+
+def test_explainer_timings(regression_data):
+    X_train, y_train, X_test, y_test = regression_data
+    model = RandomForestRegressor(n_estimators=5, max_depth=2).fit(X_train, y_train)
+    explainer = RegressionExplainer(model, X_test, y_test)
+    assert list(explainer.timings().name) == ["shap_explainer"]
+
+    events = []
+    callback = add_timing_callback(events.append)
+    try:
+        _ = explainer.residuals
+        _ = explainer.residuals
+    finally:
+        remove_timing_callback(callback)
+    _ = explainer.get_shap_values_df()
+
+    timings = explainer.timings()
+    assert list(timings.name) == [
+        "shap_explainer",
+        "preds",
+        "residuals",
+        "get_shap_values_df",
+    ]
+    assert timings.set_index("name").parent["preds"] == "residuals"
+    assert (timings.n_rows == len(X_test)).all()
+    assert (timings.wall_time >= 0).all() and (timings.result_bytes > 0).all()
+    assert timings.error.isnull().all()
+
+    assert [(e["event"], e["name"]) for e in events] == [
+        ("start", "residuals"),
+        ("start", "preds"),
+        ("end", "preds"),
+        ("end", "residuals"),
+    ]
+
+
+def test_explainer_timings_per_label(multiclass_data):
+    X_train, y_train, X_test, y_test = multiclass_data
+    model = RandomForestClassifier(n_estimators=5, max_depth=2).fit(X_train, y_train)
+    explainer = ClassifierExplainer(model, X_test, y_test)
+
+    for pos_label in [0, 1, 0]:
+        _ = explainer.mean_abs_shap_interactions(pos_label)
+        _ = explainer.roc_auc_curve(pos_label)
+        _ = explainer.shap_base_value(pos_label)
+        _ = explainer.mean_abs_shap_df(pos_label)
+
+    names = explainer.timings().name.value_counts()
+    # interactions get calculated per label, roc auc curves for all labels at once:
+    assert names["mean_abs_shap_interactions"] == 2
+    assert names["roc_auc_curve"] == 1
+    assert names["shap_base_value"] == 1
+    assert names["mean_abs_shap_df"] == 1